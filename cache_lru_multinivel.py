@@ -141,6 +141,11 @@ class CacheL1Memoria:
                 return valor, metadata
             return None
     
+    def peek(self, clave: str) -> Optional[Any]:
+        """Obtener valor de L1 sin promoverlo en el LRU ni tocar sus metadatos"""
+        with self.lock:
+            return self.datos.get(clave)
+    
     def put(self, clave: str, valor: Any, metadata: MetadataCache):
         """Almacenar elemento en cache L1"""
         with self.lock:
@@ -157,6 +162,15 @@ class CacheL1Memoria:
             self.metadatos[clave] = metadata
             self.tamano_actual += metadata.tamano_bytes
     
+    def eliminar(self, clave: str) -> bool:
+        """Eliminar un elemento concreto de L1"""
+        with self.lock:
+            if clave not in self.datos:
+                return False
+            del self.datos[clave]
+            self.tamano_actual -= self.metadatos.pop(clave).tamano_bytes
+            return True
+    
     def _evict_lru(self) -> Optional[str]:
         """Evitar elemento menos usado"""
         if not self.datos:
@@ -186,6 +200,72 @@ class CacheL1Memoria:
             }
 
 
+class CacheL1Particionado:
+    """Cache L1 particionado en shards LRU independientes con lock propio"""
+    
+    def __init__(self, capacidad_mb: float = 512, num_particiones: int = None):
+        self.num_particiones = max(1, num_particiones or 2 * (os.cpu_count() or 1))
+        self.capacidad_bytes = int(capacidad_mb * 1024 * 1024)
+        self.capacidad_particion_bytes = self.capacidad_bytes // self.num_particiones
+        self.particiones = [
+            CacheL1Memoria(capacidad_mb / self.num_particiones)
+            for _ in range(self.num_particiones)
+        ]
+    
+    def _particion(self, clave: str) -> CacheL1Memoria:
+        """Seleccionar shard por hash de la clave"""
+        return self.particiones[hash(clave) % self.num_particiones]
+    
+    def get(self, clave: str) -> Optional[Tuple[Any, MetadataCache]]:
+        """Obtener elemento tomando solo el lock de su shard"""
+        return self._particion(clave).get(clave)
+    
+    def peek(self, clave: str) -> Optional[Any]:
+        """Obtener valor sin promoverlo, tomando solo el lock de su shard"""
+        return self._particion(clave).peek(clave)
+    
+    def put(self, clave: str, valor: Any, metadata: MetadataCache):
+        """Almacenar elemento tomando solo el lock de su shard"""
+        self._particion(clave).put(clave, valor, metadata)
+    
+    def eliminar(self, clave: str) -> bool:
+        """Eliminar elemento tomando solo el lock de su shard"""
+        return self._particion(clave).eliminar(clave)
+    
+    def admite(self, tamano_bytes: int, fraccion: float = 0.1) -> bool:
+        """Verificar si un elemento cabe en L1 sin vaciar su shard"""
+        return tamano_bytes <= min(self.capacidad_bytes * fraccion, self.capacidad_particion_bytes)
+    
+    def evict_lru(self) -> Optional[str]:
+        """Evitar el elemento LRU del shard más ocupado"""
+        particion = max(self.particiones, key=lambda p: p.tamano_actual)
+        with particion.lock:
+            return particion._evict_lru()
+    
+    def __len__(self) -> int:
+        return sum(len(p.datos) for p in self.particiones)
+    
+    @property
+    def tamano_actual(self) -> int:
+        return sum(p.tamano_actual for p in self.particiones)
+    
+    def clear(self):
+        """Limpiar todos los shards"""
+        for particion in self.particiones:
+            particion.clear()
+    
+    def get_info(self) -> Dict[str, Any]:
+        """Información agregada del cache L1"""
+        tamano = self.tamano_actual
+        return {
+            "nivel": "L1_memoria",
+            "elementos": len(self),
+            "particiones": self.num_particiones,
+            "tamano_mb": tamano / (1024 * 1024),
+            "utilizacion_percent": (tamano / self.capacidad_bytes) * 100
+        }
+
+
 class CacheL2Disco:
     """Cache L2 en disco con persistencia"""
     
@@ -361,7 +441,8 @@ class CacheMultinivel:
         }
         
         # Componentes del sistema
-        self.cache_l1 = CacheL1Memoria(self.config["l1_capacidad_mb"])
+        self.cache_l1 = CacheL1Particionado(self.config["l1_capacidad_mb"],
+                                            self.config.get("l1_particiones"))
         self.cache_l2 = CacheL2Disco(self.ruta_cache, self.config["l2_capacidad_mb"])
         self.compresor = CompresorInteligente()
         self.monitor_memoria = MonitorMemoria()
@@ -399,7 +480,7 @@ class CacheMultinivel:
             )
             
             # L1 para objetos pequeños
-            if tamano_original <= self.cache_l1.capacidad_bytes * 0.1:
+            if self.cache_l1.admite(tamano_original):
                 self.cache_l1.put(clave, valor, metadata)
                 self.estadisticas.bytes_almacenados += tamano_original
                 return True
@@ -446,7 +527,7 @@ class CacheMultinivel:
                     valor = pickle.loads(datos_descomprimidos)
                 
                 # Promover a L1 si es pequeño y frecuente
-                if (metadata.tamano_bytes <= self.cache_l1.capacidad_bytes * 0.05 and 
+                if (self.cache_l1.admite(metadata.tamano_bytes, 0.05) and 
                     metadata.frecuencia_acceso >= 3):
                     self.cache_l1.put(clave, valor, metadata)
                 
@@ -462,6 +543,35 @@ class CacheMultinivel:
             self.estadisticas.misses += 1
             return None
     
+    def peek(self, clave: str) -> Optional[Any]:
+        """Obtener sin coste de promoción LRU en L1 (los aciertos en L2 siguen la ruta de get)"""
+        valor = self.cache_l1.peek(clave)
+        if valor is not None:
+            self.estadisticas.hits_l1 += 1
+            return valor
+        return self.get(clave)
+    
+    def get_many(self, claves: List[str]) -> Dict[str, Any]:
+        """Obtener varias claves del cache (solo se incluyen las encontradas)"""
+        encontrados = {}
+        for clave in claves:
+            valor = self.get(clave)
+            if valor is not None:
+                encontrados[clave] = valor
+        return encontrados
+    
+    def eliminar(self, clave: str) -> bool:
+        """Invalidar una clave en ambos niveles del cache"""
+        eliminado = self.cache_l1.eliminar(clave)
+        with self.cache_l2.lock:
+            if clave in self.cache_l2.metadatos:
+                self.cache_l2._eliminar_archivo(clave)
+                self.cache_l2._guardar_metadatos()
+                eliminado = True
+        if eliminado:
+            self.estadisticas.evictions += 1
+        return eliminado
+    
     def _actualizar_tiempo_promedio(self, tiempo_acceso: float):
         """Actualizar tiempo promedio"""
         total = self.estadisticas.total_hits + self.estadisticas.misses
@@ -492,10 +602,9 @@ class CacheMultinivel:
         """Limpieza automática inteligente"""
         try:
             # Limpiar 25% del L1
-            elementos_a_limpiar = len(self.cache_l1.datos) // 4
+            elementos_a_limpiar = len(self.cache_l1) // 4
             for _ in range(elementos_a_limpiar):
-                if self.cache_l1.datos:
-                    self.cache_l1._evict_lru()
+                if self.cache_l1.evict_lru() is not None:
                     self.estadisticas.evictions += 1
             
             gc.collect()
@@ -124,11 +124,14 @@ class AlertaConfig:
 class LoggerEstructurado:
     """Logger estructurado ultra-avanzado"""
     
-    def __init__(self, nombre: str, ruta_logs: Path):
+    def __init__(self, nombre: str, ruta_logs: Path, nivel_minimo: NivelSeveridad = NivelSeveridad.TRACE):
         self.nombre = nombre
         self.ruta_logs = ruta_logs
         self.ruta_logs.mkdir(parents=True, exist_ok=True)
         
+        # Nivel mínimo y flag cacheado para evitar construir mensajes DEBUG descartados
+        self.establecer_nivel(nivel_minimo)
+        
         # Base de datos para logs estructurados
         self.db_path = ruta_logs / "logs.db"
         self._inicializar_db()
@@ -176,8 +179,20 @@ class LoggerEstructurado:
                 CREATE INDEX IF NOT EXISTS idx_nivel ON logs(nivel)
             """)
     
+    def establecer_nivel(self, nivel_minimo: NivelSeveridad):
+        """Establecer nivel mínimo de logging y refrescar flags cacheados"""
+        self.nivel_minimo = nivel_minimo
+        self.debug_enabled = self.is_enabled_for(NivelSeveridad.DEBUG)
+    
+    def is_enabled_for(self, nivel: NivelSeveridad) -> bool:
+        """Verificar si un nivel será registrado (equivalente a logging.Logger.isEnabledFor)"""
+        return nivel.value >= self.nivel_minimo.value
+    
     def log(self, nivel: NivelSeveridad, mensaje: str, **contexto):
         """Método principal de logging"""
+        if nivel.value < self.nivel_minimo.value:
+            return
+        
         evento = EventoLog(
             timestamp=datetime.now(),
             nivel=nivel,
@@ -18,12 +18,13 @@ import queue
 import asyncio
 import concurrent.futures
 from typing import Dict, List, Optional, Tuple, Any, Callable, Union
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 from datetime import datetime, timedelta
 from pathlib import Path
 from enum import Enum
 import psutil
-import statistics
+from collections import deque
+from itertools import islice
 
 from sistema_logging_monitoreo import obtener_sistema_logging, NivelSeveridad
 from cache_lru_multinivel import obtener_cache_multinivel, TipoDato
@@ -121,6 +122,23 @@ class ConfiguracionParalelizacion:
     habilitar_autoscaling: bool
 
 
+# Prefijo/sufijo de las claves de cache de resultados (el cache exige claves str)
+_PREFIJO_CACHE_TAREA = "tarea_"
+_SUFIJO_CACHE_TAREA = "_resultado"
+
+
+def _calcular_metricas_derivadas(historial: deque, tareas_completadas: int,
+                                 tiempo_actividad: float, ventana: int = 100) -> Tuple[Optional[float], float]:
+    """Calcular tiempo de respuesta promedio (últimas `ventana` tareas) y throughput"""
+    tiempo_respuesta = None
+    n = min(ventana, len(historial))
+    if n:
+        tiempo_respuesta = sum(islice(reversed(historial), n)) / n
+    
+    throughput = tareas_completadas / tiempo_actividad if tiempo_actividad > 0 else 0.0
+    return tiempo_respuesta, throughput
+
+
 class QueueInteligente:
     """Queue inteligente con priorización y planificación avanzada"""
     
@@ -135,6 +153,31 @@ class QueueInteligente:
         }
         self.lock = threading.RLock()
         self.logger = obtener_sistema_logging().obtener_sistema_logger()
+        
+        # Contadores por estado, actualizados en cada transición bajo self.lock
+        self._conteo_estados: Dict[EstadoTarea, int] = {estado: 0 for estado in EstadoTarea}
+    
+    def _cambiar_estado(self, tarea: TareaParalelizacion, nuevo_estado: EstadoTarea):
+        """Cambiar estado de una tarea registrada manteniendo los contadores (requiere self.lock)"""
+        self._conteo_estados[tarea.estado] -= 1
+        tarea.estado = nuevo_estado
+        self._conteo_estados[nuevo_estado] += 1
+    
+    def actualizar_estado_tarea(self, tarea: TareaParalelizacion, nuevo_estado: EstadoTarea):
+        """Cambiar estado de una tarea desde fuera de la cola"""
+        with self.lock:
+            if self.tareas.get(tarea.id) is tarea:
+                self._cambiar_estado(tarea, nuevo_estado)
+            else:
+                tarea.estado = nuevo_estado
+    
+    def contar(self, estado: EstadoTarea) -> int:
+        """Número de tareas en un estado (lectura directa del contador, sin lock)"""
+        return self._conteo_estados[estado]
+    
+    @property
+    def total_tareas(self) -> int:
+        return len(self.tareas)
     
     def agregar_tarea(self, tarea: TareaParalelizacion) -> bool:
         """Agregar tarea a la queue"""
@@ -145,14 +188,18 @@ class QueueInteligente:
                                   f"Cola llena, no se puede agregar tarea {tarea.id}")
                     return False
                 
-                # Agregar a diccionario de tareas
+                # Agregar a diccionario de tareas (una re-encolada deja de contar en su estado previo)
+                previa = self.tareas.get(tarea.id)
+                if previa is not None:
+                    self._conteo_estados[previa.estado] -= 1
                 self.tareas[tarea.id] = tarea
+                self._conteo_estados[tarea.estado] += 1
                 
                 # Agregar a cola de prioridad (usando timestamp negativo para FIFO dentro de prioridad)
                 timestamp_negativo = -tarea.timestamp_creacion.timestamp()
                 self.cola_prioridad[tarea.prioridad].put((timestamp_negativo, tarea.id))
                 
-                tarea.estado = EstadoTarea.EN_COLA
+                self._cambiar_estado(tarea, EstadoTarea.EN_COLA)
                 self.logger.log(NivelSeveridad.DEBUG, 
                               f"Tarea agregada a cola: {tarea.id} (prioridad: {tarea.prioridad.value})")
                 
@@ -173,7 +220,7 @@ class QueueInteligente:
                         _, tarea_id = self.cola_prioridad[prioridad].get()
                         if tarea_id in self.tareas:
                             tarea = self.tareas[tarea_id]
-                            tarea.estado = EstadoTarea.EN_PROCESO
+                            self._cambiar_estado(tarea, EstadoTarea.EN_PROCESO)
                             tarea.timestamp_inicio = datetime.now()
                             return tarea
                 
@@ -188,7 +235,7 @@ class QueueInteligente:
         with self.lock:
             if tarea_id in self.tareas:
                 tarea = self.tareas[tarea_id]
-                tarea.estado = EstadoTarea.CANCELADA
+                self._cambiar_estado(tarea, EstadoTarea.CANCELADA)
                 tarea.timestamp_finalizacion = datetime.now()
                 self.logger.log(NivelSeveridad.INFO, f"Tarea cancelada: {tarea_id}")
                 return True
@@ -204,16 +251,11 @@ class QueueInteligente:
         with self.lock:
             return {
                 "total_tareas": len(self.tareas),
-                "tareas_pendientes": sum(1 for t in self.tareas.values() 
-                                       if t.estado == EstadoTarea.EN_COLA),
-                "tareas_en_proceso": sum(1 for t in self.tareas.values() 
-                                       if t.estado == EstadoTarea.EN_PROCESO),
-                "tareas_completadas": sum(1 for t in self.tareas.values() 
-                                        if t.estado == EstadoTarea.COMPLETADA),
-                "tareas_fallidas": sum(1 for t in self.tareas.values() 
-                                     if t.estado == EstadoTarea.FALLIDA),
-                "tareas_canceladas": sum(1 for t in self.tareas.values() 
-                                       if t.estado == EstadoTarea.CANCELADA)
+                "tareas_pendientes": self._conteo_estados[EstadoTarea.EN_COLA],
+                "tareas_en_proceso": self._conteo_estados[EstadoTarea.EN_PROCESO],
+                "tareas_completadas": self._conteo_estados[EstadoTarea.COMPLETADA],
+                "tareas_fallidas": self._conteo_estados[EstadoTarea.FALLIDA],
+                "tareas_canceladas": self._conteo_estados[EstadoTarea.CANCELADA]
             }
 
 
@@ -233,6 +275,9 @@ class WorkerPoolDinamico:
         self.lock = threading.RLock()
         self.logger = obtener_sistema_logging().obtener_sistema_logger()
         
+        # Total de workers disponibles, mantenido incrementalmente bajo self.lock
+        self._disponibles_count = 0
+        
         # Inicializar workers mínimos
         self._inicializar_workers_minimos()
     
@@ -251,6 +296,7 @@ class WorkerPoolDinamico:
                 
                 self.workers[worker_id] = worker_info
                 self.workers_disponibles[TipoWorker.GENERAL].append(worker_id)
+                self._disponibles_count += 1
                 
                 # Crear métricas iniciales
                 self.metricas_workers[worker_id] = MetricasWorker(
@@ -273,18 +319,31 @@ class WorkerPoolDinamico:
         with self.lock:
             # Primero buscar workers del tipo específico
             if self.workers_disponibles[tipo_requerido]:
+                self._disponibles_count -= 1
                 return self.workers_disponibles[tipo_requerido].pop(0)
             
             # Si no hay, buscar workers generales
             if self.workers_disponibles[TipoWorker.GENERAL]:
+                self._disponibles_count -= 1
                 return self.workers_disponibles[TipoWorker.GENERAL].pop(0)
             
             # Si no hay workers disponibles, crear nuevo si posible
             if len(self.workers) < self.config.max_workers:
-                return self._crear_nuevo_worker(tipo_requerido)
+                worker_id = self._crear_nuevo_worker(tipo_requerido)
+                if worker_id and self.reservar_worker(worker_id, tipo_requerido):
+                    return worker_id
             
             return None
     
+    def reservar_worker(self, worker_id: str, tipo: TipoWorker) -> bool:
+        """Retirar un worker específico de la lista de disponibles"""
+        with self.lock:
+            if worker_id in self.workers_disponibles[tipo]:
+                self.workers_disponibles[tipo].remove(worker_id)
+                self._disponibles_count -= 1
+                return True
+            return False
+    
     def _crear_nuevo_worker(self, tipo: TipoWorker) -> Optional[str]:
         """Crear un nuevo worker"""
         with self.lock:
@@ -302,6 +361,7 @@ class WorkerPoolDinamico:
             
             self.workers[worker_id] = worker_info
             self.workers_disponibles[tipo].append(worker_id)
+            self._disponibles_count += 1
             
             # Crear métricas
             self.metricas_workers[worker_id] = MetricasWorker(
@@ -322,43 +382,61 @@ class WorkerPoolDinamico:
     def liberar_worker(self, worker_id: str, tipo: TipoWorker):
         """Liberar worker para que esté disponible"""
         with self.lock:
-            if worker_id in self.workers:
-                self.workers_disponibles[tipo].append(worker_id)
-                self.logger.log(NivelSeveridad.DEBUG, f"Worker liberado: {worker_id}")
+            self._liberar_worker(worker_id, tipo)
     
     def actualizar_metricas_worker(self, worker_id: str, tiempo_ejecucion: float, 
                                  exito: bool, recursos_sistema: Dict[str, float]):
         """Actualizar métricas de un worker"""
         with self.lock:
-            if worker_id in self.metricas_workers:
-                metricas = self.metricas_workers[worker_id]
-                
-                # Actualizar contadores
-                if exito:
-                    metricas.tareas_procesadas += 1
-                else:
-                    metricas.tareas_fallidas += 1
-                
-                # Actualizar tiempo promedio
-                total_tareas = metricas.tareas_procesadas + metricas.tareas_fallidas
-                if total_tareas > 0:
-                    metricas.tiempo_promedio_ejecucion = (
-                        (metricas.tiempo_promedio_ejecucion * (total_tareas - 1) + tiempo_ejecucion) / 
-                        total_tareas
-                    )
-                
-                # Actualizar recursos del sistema
-                metricas.cpu_utilizacion = recursos_sistema.get('cpu', 0.0)
-                metricas.memoria_utilizacion = recursos_sistema.get('memoria', 0.0)
-                metricas.ultima_actividad = datetime.now()
-                
-                # Actualizar estado de salud
-                if metricas.cpu_utilizacion > 90 or metricas.memoria_utilizacion > 90:
-                    metricas.estado_salud = "critico"
-                elif metricas.cpu_utilizacion > 70 or metricas.memoria_utilizacion > 70:
-                    metricas.estado_salud = "degradado"
-                else:
-                    metricas.estado_salud = "saludable"
+            self._actualizar_metricas_worker(worker_id, tiempo_ejecucion, exito, recursos_sistema)
+    
+    def finalizar_tarea_worker(self, worker_id: str, tipo: TipoWorker, tiempo_ejecucion: float,
+                               exito: bool, recursos_sistema: Dict[str, float]):
+        """Actualizar métricas y liberar worker en una única sección crítica"""
+        with self.lock:
+            self._actualizar_metricas_worker(worker_id, tiempo_ejecucion, exito, recursos_sistema)
+            self._liberar_worker(worker_id, tipo)
+    
+    def _liberar_worker(self, worker_id: str, tipo: TipoWorker):
+        """Liberar worker (requiere self.lock)"""
+        if worker_id in self.workers:
+            self.workers_disponibles[tipo].append(worker_id)
+            self._disponibles_count += 1
+            if self.logger.debug_enabled:
+                self.logger.log(NivelSeveridad.DEBUG, f"Worker liberado: {worker_id}")
+    
+    def _actualizar_metricas_worker(self, worker_id: str, tiempo_ejecucion: float, 
+                                    exito: bool, recursos_sistema: Dict[str, float]):
+        """Actualizar métricas de un worker (requiere self.lock)"""
+        if worker_id in self.metricas_workers:
+            metricas = self.metricas_workers[worker_id]
+            
+            # Actualizar contadores
+            if exito:
+                metricas.tareas_procesadas += 1
+            else:
+                metricas.tareas_fallidas += 1
+            
+            # Actualizar tiempo promedio
+            total_tareas = metricas.tareas_procesadas + metricas.tareas_fallidas
+            if total_tareas > 0:
+                metricas.tiempo_promedio_ejecucion = (
+                    (metricas.tiempo_promedio_ejecucion * (total_tareas - 1) + tiempo_ejecucion) / 
+                    total_tareas
+                )
+            
+            # Actualizar recursos del sistema
+            metricas.cpu_utilizacion = recursos_sistema.get('cpu', 0.0)
+            metricas.memoria_utilizacion = recursos_sistema.get('memoria', 0.0)
+            metricas.ultima_actividad = datetime.now()
+            
+            # Actualizar estado de salud
+            if metricas.cpu_utilizacion > 90 or metricas.memoria_utilizacion > 90:
+                metricas.estado_salud = "critico"
+            elif metricas.cpu_utilizacion > 70 or metricas.memoria_utilizacion > 70:
+                metricas.estado_salud = "degradado"
+            else:
+                metricas.estado_salud = "saludable"
     
     def obtener_metricas_workers(self) -> Dict[str, MetricasWorker]:
         """Obtener métricas de todos los workers"""
@@ -443,8 +521,7 @@ class BalanceadorCarga:
             if mejor_worker:
                 # Remover worker de disponibles (será asignado)
                 worker_tipo = metricas_workers[mejor_worker].tipo
-                if mejor_worker in self.worker_pool.workers_disponibles[worker_tipo]:
-                    self.worker_pool.workers_disponibles[worker_tipo].remove(mejor_worker)
+                self.worker_pool.reservar_worker(mejor_worker, worker_tipo)
                 return mejor_worker
             else:
                 # Usar worker disponible por defecto
@@ -512,8 +589,8 @@ class SistemaParalelizacionUltraAvanzado:
         self.worker_pool = WorkerPoolDinamico(self.config)
         self.balanceador = BalanceadorCarga(self.worker_pool)
         
-        # Estado del sistema
-        self.activo = True
+        # Estado del sistema (señal cooperativa de cierre para el thread de monitoreo)
+        self._shutdown = threading.Event()
         self.metricas_sistema = MetricasSistema(
             tareas_totales=0,
             tareas_pendientes=0,
@@ -531,7 +608,16 @@ class SistemaParalelizacionUltraAvanzado:
         
         # Monitoreo
         self.tiempo_inicio = datetime.now()
-        self.tareas_procesadas_historial = []
+        self.tareas_procesadas_historial: deque = deque(maxlen=1000)  # Últimas 1000 tareas
+        
+        # Snapshot de recursos publicado por el thread de monitoreo (lectura sin syscalls)
+        self._recursos_snapshot: Dict[str, float] = {'cpu': 0.0, 'memoria': 0.0}
+        
+        # Campos de MetricasWorker para volcarlas a dicts sin asdict
+        self._campos_metricas_worker = tuple(f.name for f in fields(MetricasWorker))
+        
+        # Evento para despertar al monitor cuando llegan tareas nuevas
+        self._evento_trabajo = threading.Event()
         
         # Thread de monitoreo
         self.thread_monitoreo = threading.Thread(target=self._monitorear_sistema, daemon=True)
@@ -596,7 +682,7 @@ class SistemaParalelizacionUltraAvanzado:
             )
             
             # Verificar cache primero
-            cache_key = f"tarea_{tarea_id}_resultado"
+            cache_key = _PREFIJO_CACHE_TAREA + tarea_id + _SUFIJO_CACHE_TAREA
             resultado_cached = self.cache.get(cache_key)
             if resultado_cached is not None:
                 tarea.estado = EstadoTarea.COMPLETADA
@@ -609,6 +695,7 @@ class SistemaParalelizacionUltraAvanzado:
             if self.queue_inteligente.agregar_tarea(tarea):
                 self.metricas_sistema.tareas_totales += 1
                 self.metricas_sistema.tareas_pendientes += 1
+                self._evento_trabajo.set()
                 self.logger.log(NivelSeveridad.INFO, 
                               f"Tarea enviada: {tarea_id} (prioridad: {prioridad_enum.value})")
                 return tarea_id
@@ -649,7 +736,7 @@ class SistemaParalelizacionUltraAvanzado:
     
     def _monitorear_sistema(self):
         """Thread de monitoreo continuo del sistema"""
-        while self.activo:
+        while not self._shutdown.is_set():
             try:
                 # Actualizar métricas del sistema
                 self._actualizar_metricas_sistema()
@@ -663,11 +750,26 @@ class SistemaParalelizacionUltraAvanzado:
                     for obs in decisiones["observaciones"]:
                         self.logger.log(NivelSeveridad.INFO, f"Optimización: {obs}")
                 
-                time.sleep(self.config.intervalo_monitoreo)
+                self._esperar_siguiente_ciclo(self._calcular_intervalo_monitoreo())
                 
             except Exception as e:
                 self.logger.log(NivelSeveridad.ERROR, f"Error en monitoreo del sistema: {e}")
-                time.sleep(self.config.intervalo_monitoreo)
+                self._esperar_siguiente_ciclo(self.config.intervalo_monitoreo)
+    
+    def _calcular_intervalo_monitoreo(self) -> float:
+        """Intervalo adaptativo: más corto cuanto más profunda está la cola"""
+        pendientes = self.metricas_sistema.tareas_pendientes
+        if pendientes <= 0:
+            # Sistema ocioso: intervalo completo, las tareas nuevas despiertan al monitor
+            return self.config.intervalo_monitoreo
+        
+        intervalo = 1.0 / (1 + pendientes / 10)
+        return max(0.05, min(self.config.intervalo_monitoreo, intervalo))
+    
+    def _esperar_siguiente_ciclo(self, intervalo: float):
+        """Esperar hasta el siguiente ciclo o hasta que llegue trabajo nuevo"""
+        self._evento_trabajo.wait(intervalo)
+        self._evento_trabajo.clear()
     
     def _procesar_tareas_pendientes(self):
         """Procesar tareas pendientes en la cola"""
@@ -704,106 +806,88 @@ class SistemaParalelizacionUltraAvanzado:
     
     def _procesar_tarea_en_worker(self, tarea: TareaParalelizacion, worker_id: str):
         """Procesar una tarea específica en un worker"""
+        inicio_ejecucion = time.time()
+        resultado = None
+        error = None
+        exito = False
+        
         try:
-            inicio_ejecucion = time.time()
-            
             # Ejecutar tarea con timeout
             with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
                 future = executor.submit(tarea.funcion, *tarea.args, **tarea.kwargs)
-                
-                try:
-                    resultado = future.result(timeout=tarea.timeout)
-                    exito = True
-                    error = None
-                    
-                    # Guardar resultado en cache
-                    cache_key = f"tarea_{tarea.id}_resultado"
-                    self.cache.put(cache_key, resultado, TipoDato.JSON, 0.1)
-                    
-                except Exception as e:
-                    resultado = None
-                    exito = False
-                    error = str(e)
+                resultado = future.result(timeout=tarea.timeout)
+            exito = True
             
+        except Exception as e:
+            error = str(e)
+        
+        finally:
+            # Contabilidad única, tanto en éxito como en fallo
             tiempo_ejecucion = time.time() - inicio_ejecucion
             
             # Actualizar estado de la tarea
             tarea.timestamp_finalizacion = datetime.now()
             if exito:
-                tarea.estado = EstadoTarea.COMPLETADA
+                # Guardar resultado en cache
+                cache_key = _PREFIJO_CACHE_TAREA + tarea.id + _SUFIJO_CACHE_TAREA
+                self.cache.put(cache_key, resultado, TipoDato.JSON, 0.1)
+                
                 tarea.resultado = resultado
+                self.queue_inteligente.actualizar_estado_tarea(tarea, EstadoTarea.COMPLETADA)
                 self.metricas_sistema.tareas_completadas += 1
             else:
-                tarea.estado = EstadoTarea.FALLIDA
                 tarea.error = error
+                self.queue_inteligente.actualizar_estado_tarea(tarea, EstadoTarea.FALLIDA)
                 self.metricas_sistema.tareas_fallidas += 1
             
             self.metricas_sistema.tareas_pendientes -= 1
             
-            # Actualizar métricas del worker
-            recursos_sistema = self._obtener_recursos_sistema()
-            self.worker_pool.actualizar_metricas_worker(worker_id, tiempo_ejecucion, exito, recursos_sistema)
-            
-            # Liberar worker
-            self.worker_pool.liberar_worker(worker_id, tarea.tipo_worker)
+            # Actualizar métricas del worker con el último snapshot de recursos y liberarlo
+            self.worker_pool.finalizar_tarea_worker(worker_id, tarea.tipo_worker, tiempo_ejecucion,
+                                                    exito, self._recursos_snapshot)
             
             # Registrar en historial
             self.tareas_procesadas_historial.append(tiempo_ejecucion)
-            if len(self.tareas_procesadas_historial) > 1000:  # Mantener solo últimas 1000
-                self.tareas_procesadas_historial.pop(0)
             
-            self.logger.log(NivelSeveridad.DEBUG, 
-                          f"Tarea {tarea.id} procesada en {tiempo_ejecucion:.2f}s - {'Éxito' if exito else 'Fallida'}")
-            
-        except Exception as e:
-            self.logger.log(NivelSeveridad.ERROR, f"Error procesando tarea {tarea.id} en worker {worker_id}: {e}")
-            
-            # Marcar tarea como fallida
-            tarea.estado = EstadoTarea.FALLIDA
-            tarea.error = str(e)
-            tarea.timestamp_finalizacion = datetime.now()
-            self.metricas_sistema.tareas_fallidas += 1
-            self.metricas_sistema.tareas_pendientes -= 1
-            
-            # Liberar worker
-            self.worker_pool.liberar_worker(worker_id, tarea.tipo_worker)
+            if self.logger.debug_enabled:
+                self.logger.log(NivelSeveridad.DEBUG, 
+                              f"Tarea {tarea.id} procesada en {tiempo_ejecucion:.2f}s - {'Éxito' if exito else 'Fallida'}")
     
     def _actualizar_metricas_sistema(self):
         """Actualizar métricas generales del sistema"""
         try:
-            # Obtener estadísticas de la cola
-            stats_cola = self.queue_inteligente.obtener_estadisticas()
+            cola = self.queue_inteligente
             
             # Obtener métricas de workers
             metricas_workers = self.worker_pool.obtener_metricas_workers()
             
             # Calcular métricas del sistema
-            self.metricas_sistema.tareas_pendientes = stats_cola["tareas_pendientes"]
-            self.metricas_sistema.tareas_en_proceso = stats_cola["tareas_en_proceso"]
-            self.metricas_sistema.tareas_completadas = stats_cola["tareas_completadas"]
-            self.metricas_sistema.tareas_fallidas = stats_cola["tareas_fallidas"]
+            # Lectura directa de los contadores de la cola (sin lock ni dict intermedio)
+            self.metricas_sistema.tareas_pendientes = cola.contar(EstadoTarea.EN_COLA)
+            self.metricas_sistema.tareas_en_proceso = cola.contar(EstadoTarea.EN_PROCESO)
+            self.metricas_sistema.tareas_completadas = cola.contar(EstadoTarea.COMPLETADA)
+            self.metricas_sistema.tareas_fallidas = cola.contar(EstadoTarea.FALLIDA)
             self.metricas_sistema.workers_activos = len(metricas_workers)
             
-            # Calcular workers disponibles
-            workers_disponibles = 0
-            for lista_workers in self.worker_pool.workers_disponibles.values():
-                workers_disponibles += len(lista_workers)
-            self.metricas_sistema.workers_disponibles = workers_disponibles
+            # Workers disponibles (contador mantenido por el pool)
+            self.metricas_sistema.workers_disponibles = self.worker_pool._disponibles_count
             
             # Calcular cola de tareas
-            self.metricas_sistema.cola_tareas = stats_cola["total_tareas"]
-            
-            # Calcular tiempo de respuesta promedio
-            if self.tareas_procesadas_historial:
-                self.metricas_sistema.tiempo_respuesta_promedio = statistics.mean(self.tareas_procesadas_historial[-100:])
+            self.metricas_sistema.cola_tareas = cola.total_tareas
             
-            # Calcular throughput
+            # Calcular tiempo de respuesta promedio y throughput
             tiempo_actividad = (datetime.now() - self.tiempo_inicio).total_seconds()
+            tiempo_respuesta, throughput = _calcular_metricas_derivadas(
+                self.tareas_procesadas_historial, self.metricas_sistema.tareas_completadas, tiempo_actividad
+            )
+            if tiempo_respuesta is not None:
+                self.metricas_sistema.tiempo_respuesta_promedio = tiempo_respuesta
             if tiempo_actividad > 0:
-                self.metricas_sistema.throughput = self.metricas_sistema.tareas_completadas / tiempo_actividad
+                self.metricas_sistema.throughput = throughput
             
-            # Obtener recursos del sistema
+            # Obtener recursos del sistema y publicar snapshot para los workers
             recursos = self._obtener_recursos_sistema()
+            self._recursos_snapshot = recursos
             self.metricas_sistema.cpu_utilizacion_promedio = recursos.get('cpu', 0.0)
             self.metricas_sistema.memoria_utilizacion_promedio = recursos.get('memoria', 0.0)
             
@@ -826,19 +910,30 @@ class SistemaParalelizacionUltraAvanzado:
         """Obtener métricas actuales del sistema"""
         return self.metricas_sistema
     
+    def _metricas_workers_planas(self) -> Dict[str, Dict[str, Any]]:
+        """Métricas de workers como dicts nuevos, sin la copia profunda de asdict (todos los campos son inmutables)"""
+        campos = self._campos_metricas_worker
+        return {wid: {campo: getattr(metricas, campo) for campo in campos}
+                for wid, metricas in self.worker_pool.obtener_metricas_workers().items()}
+    
     def obtener_estadisticas_detalles(self) -> Dict[str, Any]:
         """Obtener estadísticas detalladas del sistema"""
         return {
             "metricas_sistema": asdict(self.metricas_sistema),
-            "metricas_workers": {wid: asdict(m) for wid, m in self.worker_pool.obtener_metricas_workers().items()},
+            "metricas_workers": self._metricas_workers_planas(),
             "estadisticas_cola": self.queue_inteligente.obtener_estadisticas(),
             "tiempo_actividad": (datetime.now() - self.tiempo_inicio).total_seconds(),
             "tareas_historial": len(self.tareas_procesadas_historial)
         }
     
+    @property
+    def activo(self) -> bool:
+        return not self._shutdown.is_set()
+    
     def cerrar(self):
         """Cerrar el sistema de paralelización de manera segura"""
-        self.activo = False
+        self._shutdown.set()
+        self._evento_trabajo.set()  # Despertar al monitor si está esperando
         if self.thread_monitoreo.is_alive():
             self.thread_monitoreo.join(timeout=5)
         
@@ -847,11 +942,15 @@ class SistemaParalelizacionUltraAvanzado:
 
 # Instancia global
 SISTEMA_PARALELIZACION_GLOBAL = None
+_LOCK_SISTEMA_PARALELIZACION = threading.Lock()
 
 def obtener_sistema_paralelizacion(ruta_base: Path = None, 
                                  config: ConfiguracionParalelizacion = None) -> SistemaParalelizacionUltraAvanzado:
     """Obtener instancia global del sistema de paralelización"""
     global SISTEMA_PARALELIZACION_GLOBAL
     if SISTEMA_PARALELIZACION_GLOBAL is None:
-        SISTEMA_PARALELIZACION_GLOBAL = SistemaParalelizacionUltraAvanzado(ruta_base, config)
+        with _LOCK_SISTEMA_PARALELIZACION:
+            # Doble verificación: otro thread pudo crearla mientras esperábamos el lock
+            if SISTEMA_PARALELIZACION_GLOBAL is None:
+                SISTEMA_PARALELIZACION_GLOBAL = SistemaParalelizacionUltraAvanzado(ruta_base, config)
     return SISTEMA_PARALELIZACION_GLOBAL
\ No newline at end of file
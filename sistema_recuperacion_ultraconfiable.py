@@ -13,16 +13,24 @@ Sistema ultra-robusto de recuperación con:
 
 import os
 import time
+import asyncio
 import json
 import hashlib
 import threading
+import queue
 import shutil
-from typing import Dict, List, Optional, Tuple, Any, Callable
+from typing import Dict, List, Optional, Tuple, Any, Callable, Set, Sequence
 from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from enum import Enum
 import tempfile
+import weakref
+import struct
+import zlib
+from bisect import bisect_left, insort
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 
 from sistema_logging_monitoreo import obtener_sistema_logging, NivelSeveridad
 from gestor_estado_avanzado import GestorEstadoAvanzado
@@ -56,29 +64,68 @@ class EstadoRecuperacion(Enum):
     CANCELADO = "cancelado"
 
 
+# Conversión de tipos de checkpoint recibidos como texto
+_TIPO_MAPPING: Dict[str, TipoCheckpoint] = {
+    "configuracion": TipoCheckpoint.CONFIGURACION,
+    "estado_sistema": TipoCheckpoint.ESTADO_SISTEMA,
+    "datos_proceso": TipoCheckpoint.DATOS_PROCESO,
+    "resultado_operacion": TipoCheckpoint.RESULTADO_OPERACION,
+    "punto_restauracion": TipoCheckpoint.PUNTO_RESTAURACION,
+    "test_pipeline": TipoCheckpoint.DATOS_PROCESO,  # Default for test
+    "prueba_integracion": TipoCheckpoint.DATOS_PROCESO  # Default for test
+}
+
+
 @dataclass
 class Checkpoint:
     """Punto de control granular"""
     id: str
     tipo: TipoCheckpoint
-    timestamp: datetime
+    timestamp_us: int  # microsegundos desde epoch
     datos: Dict[str, Any]
     checksum: str
     metadata: Dict[str, Any]
     valido: bool = True
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Fecha de creación como datetime local"""
+        return datetime.fromtimestamp(self.timestamp_us / 1_000_000)
+    
+    @classmethod
+    def diferido(cls, payload: bytes, **campos) -> 'Checkpoint':
+        """Crear un checkpoint cuyos datos se decodifican en el primer acceso"""
+        checkpoint = cls(datos=None, **campos)
+        del checkpoint.datos
+        checkpoint._payload = payload
+        return checkpoint
+    
+    def __getattr__(self, nombre: str) -> Any:
+        # Solo se llega aquí si 'datos' todavía no se ha decodificado
+        payload = self.__dict__.get('_payload')
+        if nombre != 'datos' or payload is None:
+            raise AttributeError(nombre)
+        self.datos = json.loads(payload)
+        self._payload = None
+        return self.datos
 
 
 @dataclass
 class Incidente:
     """Registro de incidente del sistema"""
     id: str
-    timestamp: datetime
+    timestamp_us: int  # microsegundos desde epoch
     nivel_gravedad: NivelGravedad
     componente: str
     descripcion: str
     datos_contexto: Dict[str, Any]
     checkpoint_asociado: Optional[str]
     resuelto: bool = False
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Fecha del incidente como datetime local"""
+        return datetime.fromtimestamp(self.timestamp_us / 1_000_000)
 
 
 @dataclass
@@ -106,83 +153,512 @@ class ResultadoRecuperacion:
     recursos_utilizados: Dict[str, Any]
 
 
+_US_POR_HORA = 3600 * 1_000_000
+
+# Cabecera de cada registro del log de checkpoints: longitud, crc32 y flags reservados
+_CABECERA_LOG = struct.Struct('<QII')
+_TAMANO_MAX_SEGMENTO = 256 * 1024 * 1024
+_PREFIJO_SEGMENTO = "checkpoints_"
+_EXTENSION_SEGMENTO = ".log"
+_EXTENSION_BLOB = ".blob"
+
+# Pasos de recuperación independientes entre sí que pueden solaparse cuando son consecutivos
+_PASOS_CONCURRENTES = frozenset({"reiniciar_servicios_esenciales", "validar_integridad_sistema"})
+
+# Escritor de incidentes: tamaño máximo de lote y separación mínima entre fsync
+_MAX_LOTE_INCIDENTES = 256
+_INTERVALO_FSYNC_INCIDENTES = 0.05
+
+# Tiempo máximo de espera por los callbacks de recuperación (segundos)
+_TIMEOUT_CALLBACKS = 5.0
+
+# Segundos durante los que se reutiliza la lectura de espacio libre en disco
+_TTL_ESPACIO_DISCO = 10.0
+
+# Separadores sin espacios para los archivos en disco (el checksum usa el formato canónico)
+_SEPARADORES_COMPACTOS = (',', ':')
+
+# Tamaño de lote a partir del cual la validación de checksums se reparte entre hilos
+_MIN_LOTE_HASH_PARALELO = 64
+
+# Número de archivos a partir del cual las lecturas y borrados se hacen en paralelo
+_MIN_LOTE_LECTURA_PARALELA = 16
+
+# Líneas del archivo de flags a partir de las cuales se compacta al cargar
+_MAX_LINEAS_FLAGS = 10000
+
+
+def _serializar_canonico(datos: Dict[str, Any]) -> bytes:
+    """Serializar datos en el formato canónico usado para el checksum"""
+    return json.dumps(datos, sort_keys=True, ensure_ascii=False).encode('utf-8')
+
+
+def _ahora_us() -> int:
+    """Marca de tiempo actual en microsegundos desde epoch"""
+    return time.time_ns() // 1000
+
+
+def _leer_timestamp_us(registro: Dict[str, Any]) -> int:
+    """Obtener la marca de tiempo de un registro en disco, aceptando el formato ISO anterior"""
+    if 'timestamp_us' in registro:
+        return registro['timestamp_us']
+    return round(datetime.fromisoformat(registro['timestamp']).timestamp() * 1_000_000)
+
+
+def _separar_archivo_checkpoint(contenido: bytes) -> Tuple[Dict[str, Any], bytes]:
+    """Separar un archivo .checkpoint en cabecera y bytes canónicos de datos"""
+    cabecera_bytes, separador, payload = contenido.partition(b"\n")
+    if separador:
+        try:
+            cabecera = json.loads(cabecera_bytes)
+            if isinstance(cabecera, dict) and 'datos' not in cabecera:
+                return cabecera, payload
+        except ValueError:
+            pass
+    
+    # Formato anterior: un único documento JSON con los datos embebidos
+    cabecera = json.loads(contenido)
+    return cabecera, _serializar_canonico(cabecera['datos'])
+
+
+def _sha256_digest(buffer: bytes) -> bytes:
+    """Calcular el digest SHA-256 binario de un buffer"""
+    return hashlib.sha256(buffer).digest()
+
+
+def _sha256_lote(buffers: List[bytes]) -> List[bytes]:
+    """Calcular el digest SHA-256 de varios buffers, en paralelo si el lote es grande"""
+    if len(buffers) < _MIN_LOTE_HASH_PARALELO:
+        return [_sha256_digest(b) for b in buffers]
+    
+    # hashlib libera el GIL con buffers grandes, así que los hilos sí solapan trabajo
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+        return list(executor.map(_sha256_digest, buffers))
+
+
+def _digest_desde_hex(checksum: str) -> Optional[bytes]:
+    """Convertir un checksum hexadecimal a bytes, o None si está mal formado"""
+    try:
+        return bytes.fromhex(checksum)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parsear_checkpoint(contenido: bytes,
+                        resolver_blob: Optional[Callable[[str], bytes]] = None) -> Tuple[Checkpoint, bytes]:
+    """Construir un Checkpoint desde el contenido de su archivo"""
+    cabecera, payload = _separar_archivo_checkpoint(contenido)
+    return _checkpoint_desde_cabecera(cabecera, payload, resolver_blob)
+
+
+def _checkpoint_desde_cabecera(cabecera: Dict[str, Any], payload: bytes,
+                               resolver_blob: Optional[Callable[[str], bytes]] = None) -> Tuple[Checkpoint, bytes]:
+    """Construir un Checkpoint desde su cabecera ya separada del payload"""
+    if 'datos_ref' in cabecera:
+        # Datos deduplicados: el payload vive en blobs/ con su checksum como nombre
+        payload = resolver_blob(cabecera['datos_ref'])
+    campos = dict(
+        id=cabecera['id'],
+        tipo=TipoCheckpoint(cabecera['tipo']),
+        timestamp_us=_leer_timestamp_us(cabecera),
+        checksum=cabecera['checksum'],
+        metadata=cabecera['metadata'],
+        valido=cabecera.get('valido', True)
+    )
+    
+    # En el formato actual los datos se decodifican solo cuando alguien los pide
+    if 'datos' in cabecera:
+        return Checkpoint(datos=cabecera['datos'], **campos), payload
+    return Checkpoint.diferido(payload, **campos), payload
+
+
+def _parsear_incidente(contenido: bytes) -> Incidente:
+    """Construir un Incidente desde el contenido de su archivo"""
+    datos = json.loads(contenido)
+    
+    return Incidente(
+        id=datos['id'],
+        timestamp_us=_leer_timestamp_us(datos),
+        nivel_gravedad=NivelGravedad(datos['nivel_gravedad']),
+        componente=datos['componente'],
+        descripcion=datos['descripcion'],
+        datos_contexto=datos['datos_contexto'],
+        checkpoint_asociado=datos.get('checkpoint_asociado'),
+        resuelto=datos.get('resuelto', False)
+    )
+
+
+def _leer_archivos_en_paralelo(ruta: Path, extension: str,
+                               parsear: Callable[[bytes], Any]) -> List[Tuple[str, Any, Optional[Exception]]]:
+    """Leer y parsear los archivos de un directorio repartiendo las lecturas entre hilos"""
+    with os.scandir(ruta) as entradas:
+        rutas = [e.path for e in entradas if e.name.endswith(extension)]
+    
+    def _procesar(ruta_archivo: str) -> Tuple[str, Any, Optional[Exception]]:
+        try:
+            with open(ruta_archivo, 'rb') as f:
+                return ruta_archivo, parsear(f.read()), None
+        except Exception as e:
+            return ruta_archivo, None, e
+    
+    if len(rutas) < _MIN_LOTE_LECTURA_PARALELA:
+        return [_procesar(r) for r in rutas]
+    
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        return list(executor.map(_procesar, rutas))
+
+
+def _borrar_archivo(ruta: str) -> Optional[OSError]:
+    """Borrar un archivo ignorando que ya no exista"""
+    try:
+        os.unlink(ruta)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        return e
+    return None
+
+
+def _borrar_archivos(rutas: List[str]) -> List[Tuple[str, OSError]]:
+    """Borrar varios archivos solapando las llamadas a unlink y devolver los fallos"""
+    if len(rutas) < _MIN_LOTE_LECTURA_PARALELA:
+        errores = [_borrar_archivo(r) for r in rutas]
+    else:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            errores = list(executor.map(_borrar_archivo, rutas))
+    return [(ruta, error) for ruta, error in zip(rutas, errores) if error is not None]
+
+
+def _leer_segmento(ruta: str) -> Tuple[List[Tuple[int, bytes]], int, int]:
+    """Recorrer un segmento del log y devolver sus registros, el final válido y el tamaño"""
+    with open(ruta, 'rb') as f:
+        contenido = f.read()
+    vista = memoryview(contenido)
+    registros: List[Tuple[int, bytes]] = []
+    offset = 0
+    
+    while offset + _CABECERA_LOG.size <= len(contenido):
+        longitud, crc, _ = _CABECERA_LOG.unpack_from(contenido, offset)
+        inicio = offset + _CABECERA_LOG.size
+        fin = inicio + longitud
+        # Un registro incompleto o con crc erróneo marca el final útil del segmento
+        if fin > len(contenido) or zlib.crc32(vista[inicio:fin]) != crc:
+            break
+        registros.append((offset, contenido[inicio:fin]))
+        offset = fin
+    
+    return registros, offset, len(contenido)
+
+
+def _anexar_flags(ruta_flags: Path, registros: List[Dict[str, Any]]):
+    """Anexar varios cambios de estado al archivo de flags en una sola escritura"""
+    if not registros:
+        return
+    lineas = "".join(json.dumps(r, ensure_ascii=False, separators=_SEPARADORES_COMPACTOS) + "\n"
+                     for r in registros)
+    with open(ruta_flags, 'a', encoding='utf-8') as f:
+        f.write(lineas)
+
+
+def _anexar_flag(ruta_flags: Path, registro: Dict[str, Any]):
+    """Anexar un cambio de estado al archivo de flags"""
+    _anexar_flags(ruta_flags, [registro])
+
+
+def _cargar_flags(ruta_flags: Path) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    """Leer el archivo de flags y devolver el último estado por id y el número de líneas"""
+    flags: Dict[str, Dict[str, Any]] = {}
+    lineas = 0
+    if not ruta_flags.exists():
+        return flags, lineas
+    with open(ruta_flags, 'r', encoding='utf-8') as f:
+        for linea in f:
+            lineas += 1
+            try:
+                registro = json.loads(linea)
+            except ValueError:
+                # Línea truncada por una escritura interrumpida
+                continue
+            flags.setdefault(registro.pop('id'), {}).update(registro)
+    return flags, lineas
+
+
+def _compactar_flags(ruta_flags: Path, flags: Dict[str, Dict[str, Any]]):
+    """Reescribir el archivo de flags con un único registro por id"""
+    ruta_temporal = ruta_flags.with_suffix('.tmp')
+    with open(ruta_temporal, 'w', encoding='utf-8') as f:
+        for registro_id, campos in flags.items():
+            f.write(json.dumps({'id': registro_id, **campos}, ensure_ascii=False,
+                               separators=_SEPARADORES_COMPACTOS) + "\n")
+    os.replace(ruta_temporal, ruta_flags)
+
+
+class _VistaCheckpointsValidos(Sequence):
+    """Vista de solo lectura sobre el índice de checkpoints válidos (más reciente primero)"""
+    
+    def __init__(self, gestor: "GestorCheckpoints"):
+        self._gestor = gestor
+    
+    def __len__(self) -> int:
+        return len(self._gestor._indice_validos)
+    
+    def __getitem__(self, posicion):
+        indice = self._gestor._indice_validos
+        if isinstance(posicion, slice):
+            return [self._gestor.checkpoints[indice[-1 - i][1]] 
+                    for i in range(*posicion.indices(len(indice)))]
+        if posicion < 0:
+            posicion += len(indice)
+        if not 0 <= posicion < len(indice):
+            raise IndexError("índice de checkpoint válido fuera de rango")
+        return self._gestor.checkpoints[indice[-1 - posicion][1]]
+
+
 class GestorCheckpoints:
     """Gestor de checkpoints granulares"""
     
     def __init__(self, ruta_base: Path):
         self.ruta_base = ruta_base / "checkpoints"
         self.ruta_base.mkdir(parents=True, exist_ok=True)
+        self._flags_path = self.ruta_base / "flags.jsonl"
+        self._lock_flags = threading.Lock()
         self.logger = obtener_sistema_logging().obtener_sistema_logger()
         self.checkpoints: Dict[str, Checkpoint] = {}
+        # Índices para consultas por ventana de tiempo y por tipo
+        self._indice_tiempo: List[Tuple[int, str]] = []
+        self._ids_por_tipo: Dict[TipoCheckpoint, Set[str]] = defaultdict(set)
+        # Checkpoints válidos ordenados por tiempo, para no recorrer todo el diccionario
+        self._indice_validos: List[Tuple[int, str]] = []
+        # Log segmentado: ubicación de cada registro e ids vivos por segmento
+        self._lock_log = threading.Lock()
+        self._ubicaciones: Dict[str, Tuple[str, int, int]] = {}
+        self._ids_por_segmento: Dict[str, Set[str]] = {}
+        self._numero_segmento = 0
+        self._archivo_log = None
+        # Deduplicación por contenido: checkpoints vivos por checksum y blobs en disco
+        self.ruta_blobs = self.ruta_base / "blobs"
+        self.ruta_blobs.mkdir(exist_ok=True)
+        self._usos_checksum: Dict[str, int] = {}
+        self._blobs: Set[str] = set()
         self._cargar_checkpoints_existentes()
     
     def _cargar_checkpoints_existentes(self):
         """Cargar checkpoints existentes desde disco"""
         try:
-            for archivo in self.ruta_base.glob("*.checkpoint"):
-                try:
-                    with open(archivo, 'r', encoding='utf-8') as f:
-                        datos = json.load(f)
-                    
-                    checkpoint = Checkpoint(
-                        id=datos['id'],
-                        tipo=TipoCheckpoint(datos['tipo']),
-                        timestamp=datetime.fromisoformat(datos['timestamp']),
-                        datos=datos['datos'],
-                        checksum=datos['checksum'],
-                        metadata=datos['metadata'],
-                        valido=datos.get('valido', True)
-                    )
-                    
-                    # Validar integridad
-                    if self._validar_integridad(checkpoint):
-                        self.checkpoints[checkpoint.id] = checkpoint
-                    else:
-                        checkpoint.valido = False
-                        self.checkpoints[checkpoint.id] = checkpoint
-                        self.logger.log(NivelSeveridad.WARNING, 
-                                      f"Checkpoint inválido detectado: {checkpoint.id}")
-                        
-                except Exception as e:
+            flags, lineas_flags = _cargar_flags(self._flags_path)
+            cargados: List[Checkpoint] = []
+            payloads: List[bytes] = []
+            
+            # Archivos sueltos del formato anterior
+            for archivo, resultado, error in _leer_archivos_en_paralelo(
+                    self.ruta_base, ".checkpoint", _parsear_checkpoint):
+                if error is not None:
                     self.logger.log(NivelSeveridad.ERROR, 
-                                  f"Error cargando checkpoint {archivo}: {e}")
+                                  f"Error cargando checkpoint {archivo}: {error}")
+                    continue
+                checkpoint, payload = resultado
+                cargados.append(checkpoint)
+                payloads.append(payload)
+            
+            # Segmentos del log, en orden de creación
+            with os.scandir(self.ruta_blobs) as entradas:
+                self._blobs = {e.name[:-len(_EXTENSION_BLOB)] for e in entradas
+                               if e.name.endswith(_EXTENSION_BLOB)}
+            blobs_leidos: Dict[str, bytes] = {}
+            
+            def resolver_blob(checksum: str) -> bytes:
+                if checksum not in blobs_leidos:
+                    blobs_leidos[checksum] = (self.ruta_blobs / f"{checksum}{_EXTENSION_BLOB}").read_bytes()
+                return blobs_leidos[checksum]
+            
+            ids_en_segmentos: Set[str] = set()
+            for segmento in self._listar_segmentos():
+                ruta_segmento = os.path.join(self.ruta_base, segmento)
+                registros, fin_valido, tamano = _leer_segmento(ruta_segmento)
+                if fin_valido < tamano:
+                    # Cola truncada por una escritura interrumpida: se descarta
+                    self.logger.log(NivelSeveridad.WARNING, 
+                                  f"Segmento {segmento} truncado en el byte {fin_valido}")
+                    os.truncate(ruta_segmento, fin_valido)
+                
+                self._ids_por_segmento[segmento] = set()
+                for offset, registro in registros:
+                    try:
+                        cabecera, payload = _separar_archivo_checkpoint(registro)
+                        # La lápida se consulta antes de resolver el blob: el de un eliminado ya no existe
+                        checkpoint_id = cabecera['id']
+                        ids_en_segmentos.add(checkpoint_id)
+                        if flags.get(checkpoint_id, {}).get('eliminado'):
+                            continue
+                        checkpoint, payload = _checkpoint_desde_cabecera(cabecera, payload, resolver_blob)
+                    except Exception as e:
+                        self.logger.log(NivelSeveridad.ERROR, 
+                                      f"Error cargando checkpoint en {segmento}@{offset}: {e}")
+                        continue
+                    self._ubicaciones[checkpoint.id] = (segmento, offset, len(registro))
+                    self._ids_por_segmento[segmento].add(checkpoint.id)
+                    cargados.append(checkpoint)
+                    payloads.append(payload)
+                self._numero_segmento = max(self._numero_segmento, self._numero_de_segmento(segmento))
+            
+            # Validar integridad de todo el lote a la vez (cada blob compartido se hashea una vez)
+            unicos = {id(payload): payload for payload in payloads}
+            digest_por_payload = dict(zip(unicos, _sha256_lote(list(unicos.values()))))
+            for checkpoint, payload in zip(cargados, payloads):
+                # Comparar digests binarios de 32 bytes en lugar de cadenas hexadecimales
+                if digest_por_payload[id(payload)] != _digest_desde_hex(checkpoint.checksum):
+                    checkpoint.valido = False
+                    self.logger.log(NivelSeveridad.WARNING, 
+                                  f"Checkpoint inválido detectado: {checkpoint.id}")
+                campos = flags.get(checkpoint.id, {})
+                if 'valido' in campos:
+                    checkpoint.valido = checkpoint.valido and campos['valido']
+                self._registrar(checkpoint)
+            
+            # Los segmentos y blobs sin registros vivos ya no aportan nada
+            self._borrar_segmentos_vacios()
+            self._borrar_blobs_sin_uso(list(self._blobs))
+            
+            if lineas_flags > _MAX_LINEAS_FLAGS:
+                # Conservar lápidas de registros que siguen presentes en algún segmento
+                vigentes = {k: v for k, v in flags.items()
+                            if k in self.checkpoints or k in ids_en_segmentos}
+                _compactar_flags(self._flags_path, vigentes)
                     
         except Exception as e:
             self.logger.log(NivelSeveridad.ERROR, f"Error cargando checkpoints: {e}")
     
+    def _listar_segmentos(self) -> List[str]:
+        """Listar los segmentos del log ordenados por número"""
+        with os.scandir(self.ruta_base) as entradas:
+            return sorted(e.name for e in entradas
+                          if e.name.startswith(_PREFIJO_SEGMENTO) and e.name.endswith(_EXTENSION_SEGMENTO))
+    
+    @staticmethod
+    def _numero_de_segmento(segmento: str) -> int:
+        """Extraer el número de un nombre de segmento"""
+        return int(segmento[len(_PREFIJO_SEGMENTO):-len(_EXTENSION_SEGMENTO)])
+    
+    def _segmento_activo(self) -> str:
+        """Nombre del segmento en el que se anexan registros"""
+        return f"{_PREFIJO_SEGMENTO}{self._numero_segmento:06d}{_EXTENSION_SEGMENTO}"
+    
+    def _anexar_registro(self, registro: bytes) -> Tuple[str, int]:
+        """Anexar un registro al segmento activo, rotándolo si se llena (requiere _lock_log)"""
+        if self._archivo_log is None:
+            # Continuar el último segmento existente o empezar el primero
+            self._numero_segmento = max(self._numero_segmento, 1)
+            self._abrir_segmento_activo()
+        
+        if self._archivo_log.tell() > 0 and self._archivo_log.tell() + len(registro) > _TAMANO_MAX_SEGMENTO:
+            self._archivo_log.close()
+            self._numero_segmento += 1
+            self._abrir_segmento_activo()
+        
+        offset = self._archivo_log.tell()
+        self._archivo_log.write(_CABECERA_LOG.pack(len(registro), zlib.crc32(registro), 0) + registro)
+        self._archivo_log.flush()
+        return self._segmento_activo(), offset
+    
+    def _abrir_segmento_activo(self):
+        """Abrir en modo anexar el segmento activo (requiere _lock_log)"""
+        self._archivo_log = open(self.ruta_base / self._segmento_activo(), 'ab')
+        self._ids_por_segmento.setdefault(self._segmento_activo(), set())
+    
+    def _borrar_segmentos_vacios(self):
+        """Borrar los segmentos cerrados cuyos registros han sido todos eliminados"""
+        activo = self._segmento_activo() if self._archivo_log is not None else None
+        vacios = [segmento for segmento, ids in self._ids_por_segmento.items()
+                  if not ids and segmento != activo]
+        for segmento in vacios:
+            del self._ids_por_segmento[segmento]
+        
+        rutas = [os.path.join(self.ruta_base, segmento) for segmento in vacios]
+        for ruta, error in _borrar_archivos(rutas):
+            self.logger.log(NivelSeveridad.WARNING, f"No se pudo borrar {ruta}: {error}")
+    
+    def _guardar_blob(self, checksum: str, payload: bytes):
+        """Escribir un blob de datos compartido si aún no existe"""
+        if checksum in self._blobs:
+            return
+        ruta_blob = self.ruta_blobs / f"{checksum}{_EXTENSION_BLOB}"
+        ruta_temporal = ruta_blob.with_suffix('.tmp')
+        ruta_temporal.write_bytes(payload)
+        os.replace(ruta_temporal, ruta_blob)
+        self._blobs.add(checksum)
+    
+    def _borrar_blobs_sin_uso(self, checksums: List[str]):
+        """Borrar los blobs que ya no referencia ningún checkpoint vivo"""
+        sin_uso = [c for c in checksums if c in self._blobs and not self._usos_checksum.get(c)]
+        self._blobs.difference_update(sin_uso)
+        rutas = [os.path.join(self.ruta_blobs, f"{c}{_EXTENSION_BLOB}") for c in sin_uso]
+        for ruta, error in _borrar_archivos(rutas):
+            self.logger.log(NivelSeveridad.WARNING, f"No se pudo borrar {ruta}: {error}")
+    
+    def cerrar(self):
+        """Cerrar el segmento activo del log"""
+        with self._lock_log:
+            if self._archivo_log is not None:
+                self._archivo_log.close()
+                self._archivo_log = None
+    
+    def _registrar(self, checkpoint: Checkpoint):
+        """Añadir un checkpoint al diccionario y a los índices"""
+        self.checkpoints[checkpoint.id] = checkpoint
+        insort(self._indice_tiempo, (checkpoint.timestamp_us, checkpoint.id))
+        self._ids_por_tipo[checkpoint.tipo].add(checkpoint.id)
+        if checkpoint.valido:
+            insort(self._indice_validos, (checkpoint.timestamp_us, checkpoint.id))
+        self._usos_checksum[checkpoint.checksum] = self._usos_checksum.get(checkpoint.checksum, 0) + 1
+    
     def crear_checkpoint(self, tipo: TipoCheckpoint, datos: Dict[str, Any], 
                         metadata: Dict[str, Any] = None) -> str:
         """Crear un nuevo checkpoint"""
         try:
-            checkpoint_id = f"ckpt_{int(time.time() * 1000000)}_{hashlib.md5(str(datos).encode()).hexdigest()[:8]}"
+            # Serializar una sola vez: estos bytes se hashean y se escriben tal cual
+            payload = _serializar_canonico(datos)
+            checksum = hashlib.sha256(payload).hexdigest()
             
-            # Calcular checksum
-            datos_serializados = json.dumps(datos, sort_keys=True, ensure_ascii=False)
-            checksum = hashlib.sha256(datos_serializados.encode('utf-8')).hexdigest()
+            # El sufijo del id reutiliza el checksum en lugar de hashear str(datos)
+            ahora_us = _ahora_us()
+            checkpoint_id = f"ckpt_{ahora_us}_{checksum[:8]}"
             
             checkpoint = Checkpoint(
                 id=checkpoint_id,
                 tipo=tipo,
-                timestamp=datetime.now(),
+                timestamp_us=ahora_us,
                 datos=datos,
                 checksum=checksum,
                 metadata=metadata or {}
             )
             
-            # Guardar a disco
-            archivo_checkpoint = self.ruta_base / f"{checkpoint_id}.checkpoint"
-            with open(archivo_checkpoint, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'id': checkpoint.id,
-                    'tipo': checkpoint.tipo.value,
-                    'timestamp': checkpoint.timestamp.isoformat(),
-                    'datos': checkpoint.datos,
-                    'checksum': checkpoint.checksum,
-                    'metadata': checkpoint.metadata,
-                    'valido': checkpoint.valido
-                }, f, indent=2, ensure_ascii=False)
-            
-            self.checkpoints[checkpoint_id] = checkpoint
+            # Anexar al log de checkpoints
+            cabecera_registro = {
+                'id': checkpoint.id,
+                'tipo': checkpoint.tipo.value,
+                'timestamp_us': checkpoint.timestamp_us,
+                'checksum': checkpoint.checksum,
+                'metadata': checkpoint.metadata,
+                'valido': checkpoint.valido
+            }
+            
+            with self._lock_log:
+                # Si ya hay un checkpoint vivo con los mismos datos, se guardan una sola vez en blobs/
+                if self._usos_checksum.get(checksum):
+                    self._guardar_blob(checksum, payload)
+                    cabecera_registro['datos_ref'] = checksum
+                    contenido = b""
+                else:
+                    contenido = payload
+                
+                cabecera = json.dumps(cabecera_registro, ensure_ascii=False,
+                                      separators=_SEPARADORES_COMPACTOS).encode('utf-8')
+                registro = cabecera + b"\n" + contenido
+                segmento, offset = self._anexar_registro(registro)
+                self._ubicaciones[checkpoint_id] = (segmento, offset, len(registro))
+                self._ids_por_segmento[segmento].add(checkpoint_id)
+                self._registrar(checkpoint)
+            
             self.logger.log(NivelSeveridad.DEBUG, f"Checkpoint creado: {checkpoint_id} ({tipo.value})")
             
             return checkpoint_id
@@ -198,28 +674,27 @@ class GestorCheckpoints:
     def listar_checkpoints(self, tipo: Optional[TipoCheckpoint] = None, 
                           horas: Optional[int] = None) -> List[Checkpoint]:
         """Listar checkpoints con filtros"""
-        checkpoints = list(self.checkpoints.values())
-        
-        # Filtrar por tipo
-        if tipo:
-            checkpoints = [c for c in checkpoints if c.tipo == tipo]
-        
-        # Filtrar por tiempo
+        # Filtrar por tiempo acotando el índice ordenado
+        inicio = 0
         if horas:
-            limite_tiempo = datetime.now() - timedelta(hours=horas)
-            checkpoints = [c for c in checkpoints if c.timestamp >= limite_tiempo]
+            limite_us = _ahora_us() - horas * _US_POR_HORA
+            inicio = bisect_left(self._indice_tiempo, (limite_us, ""))
         
-        # Ordenar por timestamp (más reciente primero)
-        checkpoints.sort(key=lambda x: x.timestamp, reverse=True)
+        # Filtrar por tipo
+        ids_tipo = self._ids_por_tipo.get(tipo, set()) if tipo else None
         
-        return checkpoints
+        # Recorrer del más reciente al más antiguo
+        return [
+            self.checkpoints[checkpoint_id]
+            for _, checkpoint_id in reversed(self._indice_tiempo[inicio:])
+            if ids_tipo is None or checkpoint_id in ids_tipo
+        ]
     
     def _validar_integridad(self, checkpoint: Checkpoint) -> bool:
         """Validar integridad de un checkpoint"""
         try:
-            datos_serializados = json.dumps(checkpoint.datos, sort_keys=True, ensure_ascii=False)
-            checksum_calculado = hashlib.sha256(datos_serializados.encode('utf-8')).hexdigest()
-            return checksum_calculado == checkpoint.checksum
+            digest_calculado = _sha256_digest(_serializar_canonico(checkpoint.datos))
+            return digest_calculado == _digest_desde_hex(checkpoint.checksum)
         except:
             return False
     
@@ -228,17 +703,16 @@ class GestorCheckpoints:
         try:
             if checkpoint_id in self.checkpoints:
                 checkpoint = self.checkpoints[checkpoint_id]
+                if checkpoint.valido:
+                    clave = (checkpoint.timestamp_us, checkpoint_id)
+                    posicion = bisect_left(self._indice_validos, clave)
+                    if posicion < len(self._indice_validos) and self._indice_validos[posicion] == clave:
+                        del self._indice_validos[posicion]
                 checkpoint.valido = False
                 
-                # Actualizar archivo
-                archivo_checkpoint = self.ruta_base / f"{checkpoint_id}.checkpoint"
-                if archivo_checkpoint.exists():
-                    with open(archivo_checkpoint, 'r', encoding='utf-8') as f:
-                        datos = json.load(f)
-                    
-                    datos['valido'] = False
-                    with open(archivo_checkpoint, 'w', encoding='utf-8') as f:
-                        json.dump(datos, f, indent=2, ensure_ascii=False)
+                # Registrar el cambio sin reescribir el checkpoint completo
+                with self._lock_flags:
+                    _anexar_flag(self._flags_path, {'id': checkpoint_id, 'valido': False})
                 
                 self.logger.log(NivelSeveridad.WARNING, f"Checkpoint invalidado: {checkpoint_id}")
                 return True
@@ -250,16 +724,44 @@ class GestorCheckpoints:
     def eliminar_checkpoints_antiguos(self, dias: int = 7) -> int:
         """Eliminar checkpoints más antiguos que N días"""
         try:
-            limite_tiempo = datetime.now() - timedelta(days=dias)
+            limite_us = _ahora_us() - dias * 24 * _US_POR_HORA
             eliminados = 0
             
-            for checkpoint_id, checkpoint in list(self.checkpoints.items()):
-                if checkpoint.timestamp < limite_tiempo:
-                    archivo_checkpoint = self.ruta_base / f"{checkpoint_id}.checkpoint"
-                    if archivo_checkpoint.exists():
-                        archivo_checkpoint.unlink()
-                    del self.checkpoints[checkpoint_id]
+            # Los checkpoints antiguos son un prefijo del índice ordenado
+            corte = bisect_left(self._indice_tiempo, (limite_us, ""))
+            antiguos = self._indice_tiempo[:corte]
+            del self._indice_tiempo[:corte]
+            del self._indice_validos[:bisect_left(self._indice_validos, (limite_us, ""))]
+            
+            lapidas: List[Dict[str, Any]] = []
+            rutas: List[str] = []
+            checksums_liberados: List[str] = []
+            with self._lock_log:
+                for _, checkpoint_id in antiguos:
+                    checkpoint = self.checkpoints.pop(checkpoint_id)
+                    self._ids_por_tipo[checkpoint.tipo].discard(checkpoint_id)
+                    usos = self._usos_checksum.pop(checkpoint.checksum) - 1
+                    if usos:
+                        self._usos_checksum[checkpoint.checksum] = usos
+                    checksums_liberados.append(checkpoint.checksum)
                     eliminados += 1
+                    
+                    ubicacion = self._ubicaciones.pop(checkpoint_id, None)
+                    if ubicacion is None:
+                        # Checkpoint del formato anterior, en su propio archivo
+                        rutas.append(os.path.join(self.ruta_base, f"{checkpoint_id}.checkpoint"))
+                    else:
+                        # El log no se modifica: el borrado queda como lápida en flags.jsonl
+                        self._ids_por_segmento[ubicacion[0]].discard(checkpoint_id)
+                        lapidas.append({'id': checkpoint_id, 'eliminado': True})
+                
+                with self._lock_flags:
+                    _anexar_flags(self._flags_path, lapidas)
+                self._borrar_segmentos_vacios()
+                self._borrar_blobs_sin_uso(checksums_liberados)
+            
+            for ruta, error in _borrar_archivos(rutas):
+                self.logger.log(NivelSeveridad.WARNING, f"No se pudo borrar {ruta}: {error}")
             
             self.logger.log(NivelSeveridad.INFO, f"Eliminados {eliminados} checkpoints antiguos")
             return eliminados
@@ -267,6 +769,15 @@ class GestorCheckpoints:
         except Exception as e:
             self.logger.log(NivelSeveridad.ERROR, f"Error eliminando checkpoints antiguos: {e}")
             return 0
+    
+    @property
+    def valid_checkpoints(self) -> Sequence[Checkpoint]:
+        """Vista de los checkpoints válidos, del más reciente al más antiguo"""
+        return _VistaCheckpointsValidos(self)
+    
+    def contar_por_tipo(self) -> Dict[str, int]:
+        """Número de checkpoints por tipo"""
+        return {tipo.value: len(ids) for tipo, ids in self._ids_por_tipo.items() if ids}
 
 
 class GestorIncidentes:
@@ -275,95 +786,217 @@ class GestorIncidentes:
     def __init__(self, ruta_base: Path):
         self.ruta_base = ruta_base / "incidentes"
         self.ruta_base.mkdir(parents=True, exist_ok=True)
+        self._flags_path = self.ruta_base / "flags.jsonl"
+        self._lock_flags = threading.Lock()
         self.logger = obtener_sistema_logging().obtener_sistema_logger()
         self.incidentes: Dict[str, Incidente] = {}
+        self._lock = threading.Lock()
+        # Índices para consultas frecuentes (dicts como conjuntos ordenados)
+        self._pendientes: Dict[str, None] = {}
+        self._ids_por_componente: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._conteo_por_nivel: Dict[str, int] = {}
+        # Diario de incidentes escrito por un hilo en segundo plano
+        self._diario_path = self.ruta_base / "diario_incidentes.jsonl"
+        self._cola_escritura: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
         self._cargar_incidentes_existentes()
+        self._aplicar_flags()
+        for incidente in self.incidentes.values():
+            self._indexar(incidente)
+        self._hilo_escritor = threading.Thread(target=self._bucle_escritor, daemon=True)
+        self._hilo_escritor.start()
     
     def _cargar_incidentes_existentes(self):
         """Cargar incidentes existentes desde disco"""
         try:
-            for archivo in self.ruta_base.glob("*.incident"):
-                try:
-                    with open(archivo, 'r', encoding='utf-8') as f:
-                        datos = json.load(f)
+            # Archivos sueltos del formato anterior
+            for archivo, incidente, error in _leer_archivos_en_paralelo(
+                    self.ruta_base, ".incident", _parsear_incidente):
+                if error is not None:
+                    self.logger.log(NivelSeveridad.ERROR, 
+                                  f"Error cargando incidente {archivo}: {error}")
+                    continue
+                self.incidentes[incidente.id] = incidente
+            
+            if self._diario_path.exists():
+                with open(self._diario_path, 'rb') as f:
+                    for linea in f:
+                        try:
+                            incidente = _parsear_incidente(linea)
+                        except ValueError:
+                            # Línea truncada por una escritura interrumpida
+                            continue
+                        self.incidentes[incidente.id] = incidente
+                    
+        except Exception as e:
+            self.logger.log(NivelSeveridad.ERROR, f"Error cargando incidentes: {e}")
+    
+    def _bucle_escritor(self):
+        """Escribir en el diario los incidentes encolados, por lotes y con fsync acotado"""
+        try:
+            with open(self._diario_path, 'ab') as f:
+                ultimo_fsync = 0.0
+                fsync_pendiente = False
+                
+                while True:
+                    try:
+                        elemento = self._cola_escritura.get(
+                            timeout=_INTERVALO_FSYNC_INCIDENTES if fsync_pendiente else None)
+                    except queue.Empty:
+                        # Sin más escrituras: consolidar lo pendiente
+                        os.fsync(f.fileno())
+                        fsync_pendiente = False
+                        ultimo_fsync = time.monotonic()
+                        continue
                     
-                    incidente = Incidente(
-                        id=datos['id'],
-                        timestamp=datetime.fromisoformat(datos['timestamp']),
-                        nivel_gravedad=NivelGravedad(datos['nivel_gravedad']),
-                        componente=datos['componente'],
-                        descripcion=datos['descripcion'],
-                        datos_contexto=datos['datos_contexto'],
-                        checkpoint_asociado=datos.get('checkpoint_asociado'),
-                        resuelto=datos.get('resuelto', False)
-                    )
+                    lote = [elemento]
+                    while len(lote) < _MAX_LOTE_INCIDENTES:
+                        try:
+                            lote.append(self._cola_escritura.get_nowait())
+                        except queue.Empty:
+                            break
                     
-                    self.incidentes[incidente.id] = incidente
+                    lineas = [e for e in lote if isinstance(e, bytes)]
+                    if lineas:
+                        f.write(b"".join(lineas))
+                        f.flush()
+                        fsync_pendiente = True
                     
-                except Exception as e:
-                    self.logger.log(NivelSeveridad.ERROR, 
-                                  f"Error cargando incidente {archivo}: {e}")
+                    # Quien espera en flush() o cerrar() necesita los datos ya en disco
+                    esperas = [e for e in lote if not isinstance(e, bytes)]
+                    ahora = time.monotonic()
+                    if fsync_pendiente and (esperas or ahora - ultimo_fsync >= _INTERVALO_FSYNC_INCIDENTES):
+                        os.fsync(f.fileno())
+                        fsync_pendiente = False
+                        ultimo_fsync = ahora
                     
+                    for espera in esperas:
+                        if espera is None:
+                            return
+                        espera.set()
         except Exception as e:
-            self.logger.log(NivelSeveridad.ERROR, f"Error cargando incidentes: {e}")
+            self.logger.log(NivelSeveridad.ERROR, f"Error en escritor de incidentes: {e}")
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Esperar a que los incidentes encolados estén escritos en disco"""
+        if not self._hilo_escritor.is_alive():
+            return False
+        escrito = threading.Event()
+        self._cola_escritura.put(escrito)
+        return escrito.wait(timeout)
+    
+    def cerrar(self, timeout: float = 5.0):
+        """Vaciar la cola de escritura y detener el hilo escritor"""
+        if self._hilo_escritor.is_alive():
+            self._cola_escritura.put(None)
+            self._hilo_escritor.join(timeout)
+    
+    def _indexar(self, incidente: Incidente):
+        """Añadir un incidente a los índices de consulta"""
+        if not incidente.resuelto:
+            self._pendientes[incidente.id] = None
+        self._ids_por_componente[incidente.componente][incidente.id] = None
+        nivel = incidente.nivel_gravedad.value
+        self._conteo_por_nivel[nivel] = self._conteo_por_nivel.get(nivel, 0) + 1
+    
+    def _aplicar_flags(self):
+        """Reaplicar los cambios de estado registrados en flags.jsonl"""
+        try:
+            flags, lineas = _cargar_flags(self._flags_path)
+            for incidente_id, campos in flags.items():
+                incidente = self.incidentes.get(incidente_id)
+                if incidente and 'resuelto' in campos:
+                    incidente.resuelto = incidente.resuelto or campos['resuelto']
+            
+            if lineas > _MAX_LINEAS_FLAGS:
+                vigentes = {k: v for k, v in flags.items() if k in self.incidentes}
+                _compactar_flags(self._flags_path, vigentes)
+        except Exception as e:
+            self.logger.log(NivelSeveridad.ERROR, f"Error aplicando flags de incidentes: {e}")
+    
+    def _crear_incidente(self, nivel_gravedad: NivelGravedad, componente: str,
+                         descripcion: str, datos_contexto: Dict[str, Any] = None,
+                         checkpoint_asociado: Optional[str] = None) -> Incidente:
+        """Construir un incidente nuevo con su id"""
+        ahora_us = _ahora_us()
+        sufijo = hashlib.blake2b(descripcion.encode(), digest_size=4).hexdigest()
+        
+        return Incidente(
+            id=f"inc_{ahora_us}_{sufijo}",
+            timestamp_us=ahora_us,
+            nivel_gravedad=nivel_gravedad,
+            componente=componente,
+            descripcion=descripcion,
+            datos_contexto=datos_contexto or {},
+            checkpoint_asociado=checkpoint_asociado
+        )
+    
+    def _encolar_incidente(self, incidente: Incidente):
+        """Serializar un incidente y dejarlo en la cola del hilo escritor"""
+        linea = json.dumps({
+            'id': incidente.id,
+            'timestamp_us': incidente.timestamp_us,
+            'nivel_gravedad': incidente.nivel_gravedad.value,
+            'componente': incidente.componente,
+            'descripcion': incidente.descripcion,
+            'datos_contexto': incidente.datos_contexto,
+            'checkpoint_asociado': incidente.checkpoint_asociado,
+            'resuelto': incidente.resuelto
+        }, ensure_ascii=False, separators=_SEPARADORES_COMPACTOS)
+        self._cola_escritura.put(linea.encode('utf-8') + b"\n")
+    
+    def _agregar_incidentes(self, incidentes: List[Incidente]):
+        """Incorporar incidentes nuevos al diccionario y los índices"""
+        with self._lock:
+            for incidente in incidentes:
+                self.incidentes[incidente.id] = incidente
+                self._indexar(incidente)
+        
+        for incidente in incidentes:
+            self.logger.log(NivelSeveridad.INFO, 
+                          f"Incidente registrado: {incidente.id} ({incidente.nivel_gravedad.value}) - {incidente.descripcion}")
     
     def registrar_incidente(self, nivel_gravedad: NivelGravedad, componente: str,
                           descripcion: str, datos_contexto: Dict[str, Any] = None,
                           checkpoint_asociado: Optional[str] = None) -> str:
         """Registrar un nuevo incidente"""
         try:
-            incidente_id = f"inc_{int(time.time() * 1000000)}_{hashlib.md5(descripcion.encode()).hexdigest()[:8]}"
-            
-            incidente = Incidente(
-                id=incidente_id,
-                timestamp=datetime.now(),
-                nivel_gravedad=nivel_gravedad,
-                componente=componente,
-                descripcion=descripcion,
-                datos_contexto=datos_contexto or {},
-                checkpoint_asociado=checkpoint_asociado
-            )
+            incidente = self._crear_incidente(nivel_gravedad, componente, descripcion,
+                                              datos_contexto, checkpoint_asociado)
+            self._encolar_incidente(incidente)
+            self._agregar_incidentes([incidente])
             
-            # Guardar a disco
-            archivo_incidente = self.ruta_base / f"{incidente_id}.incident"
-            with open(archivo_incidente, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'id': incidente.id,
-                    'timestamp': incidente.timestamp.isoformat(),
-                    'nivel_gravedad': incidente.nivel_gravedad.value,
-                    'componente': incidente.componente,
-                    'descripcion': incidente.descripcion,
-                    'datos_contexto': incidente.datos_contexto,
-                    'checkpoint_asociado': incidente.checkpoint_asociado,
-                    'resuelto': incidente.resuelto
-                }, f, indent=2, ensure_ascii=False)
-            
-            self.incidentes[incidente_id] = incidente
-            self.logger.log(NivelSeveridad.INFO, 
-                          f"Incidente registrado: {incidente_id} ({nivel_gravedad.value}) - {descripcion}")
-            
-            return incidente_id
+            return incidente.id
             
         except Exception as e:
             self.logger.log(NivelSeveridad.ERROR, f"Error registrando incidente: {e}")
             raise
     
+    def registrar_incidentes_batch(self, registros: List[Dict[str, Any]]) -> List[str]:
+        """Registrar varios incidentes de una vez"""
+        try:
+            incidentes = [self._crear_incidente(**registro) for registro in registros]
+            for incidente in incidentes:
+                self._encolar_incidente(incidente)
+            
+            self._agregar_incidentes(incidentes)
+            return [incidente.id for incidente in incidentes]
+            
+        except Exception as e:
+            self.logger.log(NivelSeveridad.ERROR, f"Error registrando incidentes: {e}")
+            raise
+    
     def marcar_resuelto(self, incidente_id: str) -> bool:
         """Marcar un incidente como resuelto"""
         try:
             if incidente_id in self.incidentes:
                 incidente = self.incidentes[incidente_id]
                 incidente.resuelto = True
+                with self._lock:
+                    self._pendientes.pop(incidente_id, None)
                 
-                # Actualizar archivo
-                archivo_incidente = self.ruta_base / f"{incidente_id}.incident"
-                if archivo_incidente.exists():
-                    with open(archivo_incidente, 'r', encoding='utf-8') as f:
-                        datos = json.load(f)
-                    
-                    datos['resuelto'] = True
-                    with open(archivo_incidente, 'w', encoding='utf-8') as f:
-                        json.dump(datos, f, indent=2, ensure_ascii=False)
+                # Registrar el cambio sin reescribir el incidente completo
+                with self._lock_flags:
+                    _anexar_flag(self._flags_path, {'id': incidente_id, 'resuelto': True})
                 
                 self.logger.log(NivelSeveridad.INFO, f"Incidente resuelto: {incidente_id}")
                 return True
@@ -374,22 +1007,19 @@ class GestorIncidentes:
     
     def obtener_incidentes_pendientes(self) -> List[Incidente]:
         """Obtener incidentes no resueltos"""
-        return [i for i in self.incidentes.values() if not i.resuelto]
+        return [self.incidentes[i] for i in list(self._pendientes)]
     
     def obtener_incidentes_por_componente(self, componente: str) -> List[Incidente]:
         """Obtener incidentes de un componente específico"""
-        return [i for i in self.incidentes.values() if i.componente == componente]
+        ids = self._ids_por_componente.get(componente, {})
+        return [self.incidentes[i] for i in list(ids)]
     
     def obtener_estadisticas(self) -> Dict[str, int]:
         """Obtener estadísticas de incidentes"""
         total = len(self.incidentes)
-        resueltos = sum(1 for i in self.incidentes.values() if i.resuelto)
-        pendientes = total - resueltos
-        
-        por_nivel = {}
-        for incidente in self.incidentes.values():
-            nivel = incidente.nivel_gravedad.value
-            por_nivel[nivel] = por_nivel.get(nivel, 0) + 1
+        pendientes = len(self._pendientes)
+        resueltos = total - pendientes
+        por_nivel = dict(self._conteo_por_nivel)
         
         return {
             'total': total,
@@ -424,8 +1054,11 @@ class SistemaRecuperacionInteligente:
         # Estrategias de recuperación predefinidas
         self.estrategias = self._definir_estrategias_recuperacion()
         
-        # Callbacks para notificaciones
-        self.callbacks_recuperacion = []
+        # Última lectura de espacio libre: (instante monotónico, bytes libres)
+        self._cache_disco: Tuple[float, Optional[int]] = (0.0, None)
+        
+        # Callbacks para notificaciones (referencias débiles para métodos ligados)
+        self.callbacks_recuperacion: List[Callable[[], Optional[Callable]]] = []
         
         self.logger.log(NivelSeveridad.INFO, "Sistema de recuperación inicializado")
     
@@ -515,15 +1148,47 @@ class SistemaRecuperacionInteligente:
     
     def registrar_callback_recuperacion(self, callback: Callable[[ResultadoRecuperacion], None]):
         """Registrar callback para notificaciones de recuperación"""
-        self.callbacks_recuperacion.append(callback)
+        if hasattr(callback, '__self__') and hasattr(callback, '__func__'):
+            # Un método ligado no debe mantener vivo a su objeto
+            referencia = weakref.WeakMethod(callback)
+        else:
+            # Funciones y lambdas no tienen otro dueño: se guardan con referencia fuerte
+            referencia = lambda callback=callback: callback
+        self.callbacks_recuperacion.append(referencia)
+    
+    def _callbacks_vivos(self) -> List[Callable[[ResultadoRecuperacion], None]]:
+        """Obtener los callbacks cuyos objetos siguen vivos, descartando el resto"""
+        vivos = []
+        referencias_vivas = []
+        for referencia in self.callbacks_recuperacion:
+            callback = referencia()
+            if callback is not None:
+                vivos.append(callback)
+                referencias_vivas.append(referencia)
+        self.callbacks_recuperacion = referencias_vivas
+        return vivos
     
     def notificar_recuperacion(self, resultado: ResultadoRecuperacion):
         """Notificar resultado de recuperación a callbacks registrados"""
-        for callback in self.callbacks_recuperacion:
-            try:
-                callback(resultado)
-            except Exception as e:
-                self.logger.log(NivelSeveridad.ERROR, f"Error en callback de recuperación: {e}")
+        callbacks = self._callbacks_vivos()
+        if not callbacks:
+            return
+        
+        # Un suscriptor lento no debe retrasar a los demás ni bloquear la recuperación
+        executor = ThreadPoolExecutor(max_workers=min(8, len(callbacks)))
+        try:
+            futuros = [executor.submit(callback, resultado) for callback in callbacks]
+            for futuro in as_completed(futuros, timeout=_TIMEOUT_CALLBACKS):
+                try:
+                    futuro.result()
+                except Exception as e:
+                    self.logger.log(NivelSeveridad.ERROR, f"Error en callback de recuperación: {e}")
+        except FuturesTimeoutError:
+            pendientes = sum(1 for futuro in futuros if not futuro.done())
+            self.logger.log(NivelSeveridad.WARNING, 
+                          f"{pendientes} callbacks de recuperación superaron {_TIMEOUT_CALLBACKS}s")
+        finally:
+            executor.shutdown(wait=False)
     
     def crear_checkpoint_contextual(self, tipo: TipoCheckpoint, contexto: str,
                                   datos: Dict[str, Any]) -> str:
@@ -533,22 +1198,12 @@ class SistemaRecuperacionInteligente:
                 "contexto": contexto,
                 "version_sistema": "2.0",
                 "timestamp_creacion": datetime.now().isoformat(),
-                "hash_contexto": hashlib.md5(contexto.encode()).hexdigest()
+                "hash_contexto": hashlib.blake2b(contexto.encode(), digest_size=16).hexdigest()
             }
             
             # Convert string tipo to enum if needed
             if isinstance(tipo, str):
-                # Map string values to enum values
-                tipo_mapping = {
-                    "configuracion": TipoCheckpoint.CONFIGURACION,
-                    "estado_sistema": TipoCheckpoint.ESTADO_SISTEMA,
-                    "datos_proceso": TipoCheckpoint.DATOS_PROCESO,
-                    "resultado_operacion": TipoCheckpoint.RESULTADO_OPERACION,
-                    "punto_restauracion": TipoCheckpoint.PUNTO_RESTAURACION,
-                    "test_pipeline": TipoCheckpoint.DATOS_PROCESO,  # Default for test
-                    "prueba_integracion": TipoCheckpoint.DATOS_PROCESO  # Default for test
-                }
-                tipo_enum = tipo_mapping.get(tipo, TipoCheckpoint.DATOS_PROCESO)
+                tipo_enum = _TIPO_MAPPING.get(tipo, TipoCheckpoint.DATOS_PROCESO)
             else:
                 tipo_enum = tipo
             
@@ -563,45 +1218,66 @@ class SistemaRecuperacionInteligente:
             self.logger.log(NivelSeveridad.ERROR, f"Error creando checkpoint contextual: {e}")
             raise
     
+    def _sondear_gestor_estado(self) -> Optional[Dict[str, Any]]:
+        """Comprobar que el gestor de estado esté inicializado"""
+        if not hasattr(self.gestor_estado, 'sistema_inicializado') or not self.gestor_estado.sistema_inicializado:
+            return {
+                "nivel_gravedad": NivelGravedad.ERROR,
+                "componente": "gestor_estado",
+                "descripcion": "Gestor de estado no inicializado correctamente",
+                "datos_contexto": {"timestamp": datetime.now().isoformat()}
+            }
+        return None
+    
+    def _sondear_checkpoints(self) -> Optional[Dict[str, Any]]:
+        """Comprobar que haya checkpoints válidos disponibles"""
+        if len(self.gestor_checkpoints.valid_checkpoints) == 0:
+            return {
+                "nivel_gravedad": NivelGravedad.WARNING,
+                "componente": "checkpoints",
+                "descripcion": "No hay checkpoints válidos disponibles",
+                "datos_contexto": {"total_checkpoints": len(self.gestor_checkpoints.checkpoints)}
+            }
+        return None
+    
+    def _espacio_libre_bytes(self) -> int:
+        """Obtener el espacio libre en disco, reutilizando la última lectura durante un TTL"""
+        instante, libres = self._cache_disco
+        ahora = time.monotonic()
+        if libres is None or ahora - instante >= _TTL_ESPACIO_DISCO:
+            libres = shutil.disk_usage(self.ruta_base).free
+            self._cache_disco = (ahora, libres)
+        return libres
+    
+    def _sondear_disco(self) -> Optional[Dict[str, Any]]:
+        """Comprobar el espacio libre en disco"""
+        try:
+            espacio_libre = self._espacio_libre_bytes() / (1024**3)  # GB
+            if espacio_libre < 1.0:  # Menos de 1GB
+                return {
+                    "nivel_gravedad": NivelGravedad.WARNING,
+                    "componente": "almacenamiento",
+                    "descripcion": "Espacio en disco bajo",
+                    "datos_contexto": {"espacio_libre_gb": round(espacio_libre, 2)}
+                }
+        except Exception as e:
+            self.logger.log(NivelSeveridad.WARNING, f"Error verificando espacio en disco: {e}")
+        return None
+    
     def detectar_fallo_sistema(self) -> List[Incidente]:
         """Detectar fallos en el sistema"""
         incidentes_detectados = []
         
         try:
-            # Verificar estado del gestor de estado
-            if not hasattr(self.gestor_estado, 'sistema_inicializado') or not self.gestor_estado.sistema_inicializado:
-                incidente_id = self.gestor_incidentes.registrar_incidente(
-                    NivelGravedad.ERROR,
-                    "gestor_estado",
-                    "Gestor de estado no inicializado correctamente",
-                    {"timestamp": datetime.now().isoformat()}
-                )
-                incidentes_detectados.append(self.gestor_incidentes.incidentes[incidente_id])
-            
-            # Verificar checkpoints disponibles
-            checkpoints_validos = [c for c in self.gestor_checkpoints.checkpoints.values() if c.valido]
-            if len(checkpoints_validos) == 0:
-                incidente_id = self.gestor_incidentes.registrar_incidente(
-                    NivelGravedad.WARNING,
-                    "checkpoints",
-                    "No hay checkpoints válidos disponibles",
-                    {"total_checkpoints": len(self.gestor_checkpoints.checkpoints)}
-                )
-                incidentes_detectados.append(self.gestor_incidentes.incidentes[incidente_id])
-            
-            # Verificar espacio en disco
-            try:
-                espacio_libre = shutil.disk_usage(self.ruta_base).free / (1024**3)  # GB
-                if espacio_libre < 1.0:  # Menos de 1GB
-                    incidente_id = self.gestor_incidentes.registrar_incidente(
-                        NivelGravedad.WARNING,
-                        "almacenamiento",
-                        "Espacio en disco bajo",
-                        {"espacio_libre_gb": round(espacio_libre, 2)}
-                    )
-                    incidentes_detectados.append(self.gestor_incidentes.incidentes[incidente_id])
-            except Exception as e:
-                self.logger.log(NivelSeveridad.WARNING, f"Error verificando espacio en disco: {e}")
+            # Las sondas son independientes: se ejecutan a la vez
+            sondas = [self._sondear_gestor_estado, self._sondear_checkpoints, self._sondear_disco]
+            with ThreadPoolExecutor(max_workers=len(sondas)) as executor:
+                resultados = list(executor.map(lambda sonda: sonda(), sondas))
+            
+            registros = [r for r in resultados if r is not None]
+            if registros:
+                incidente_ids = self.gestor_incidentes.registrar_incidentes_batch(registros)
+                incidentes_detectados = [self.gestor_incidentes.incidentes[i] for i in incidente_ids]
             
         except Exception as e:
             self.logger.log(NivelSeveridad.ERROR, f"Error detectando fallos: {e}")
@@ -611,6 +1287,63 @@ class SistemaRecuperacionInteligente:
     def ejecutar_recuperacion(self, estrategia_nombre: str = None,
                             contexto_especifico: str = None) -> ResultadoRecuperacion:
         """Ejecutar proceso de recuperación"""
+        corrutina = self.ejecutar_recuperacion_async(estrategia_nombre, contexto_especifico)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(corrutina)
+        
+        # Ya hay un bucle activo en este hilo: asyncio.run no puede anidarse
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, corrutina).result()
+    
+    async def _ejecutar_paso(self, paso: str) -> Optional[Checkpoint]:
+        """Ejecutar un paso de recuperación y devolver el checkpoint restaurado, si lo hay"""
+        self.logger.log(NivelSeveridad.DEBUG, f"Ejecutando paso: {paso}")
+        
+        if paso == "detener_servicios_activos":
+            # Simular detención de servicios
+            await asyncio.sleep(0.1)
+            
+        elif paso == "validar_checkpoints_disponibles":
+            self.logger.log(NivelSeveridad.INFO, 
+                          f"Checkpoints válidos disponibles: {len(self.gestor_checkpoints.valid_checkpoints)}")
+            
+        elif paso == "restaurar_ultimo_checkpoint_valido":
+            ultimo_checkpoint = self._obtener_ultimo_checkpoint_valido()
+            if ultimo_checkpoint:
+                self.logger.log(NivelSeveridad.INFO, f"Restaurado checkpoint: {ultimo_checkpoint.id}")
+            return ultimo_checkpoint
+            
+        elif paso == "reiniciar_servicios_esenciales":
+            # Simular reinicio de servicios
+            await asyncio.sleep(0.2)
+            
+        elif paso == "validar_integridad_sistema":
+            # Simular validación
+            await asyncio.sleep(0.1)
+            
+        elif paso == "notificar_resultado":
+            # La notificación se hace al final
+            pass
+        
+        return None
+    
+    @staticmethod
+    def _agrupar_pasos(pasos: List[str]) -> List[List[str]]:
+        """Agrupar pasos consecutivos que pueden ejecutarse a la vez"""
+        etapas: List[List[str]] = []
+        for paso in pasos:
+            if (paso in _PASOS_CONCURRENTES and etapas and
+                    etapas[-1][0] in _PASOS_CONCURRENTES):
+                etapas[-1].append(paso)
+            else:
+                etapas.append([paso])
+        return etapas
+    
+    async def ejecutar_recuperacion_async(self, estrategia_nombre: str = None,
+                                          contexto_especifico: str = None) -> ResultadoRecuperacion:
+        """Ejecutar proceso de recuperación sin bloquear el bucle de eventos"""
         inicio_recuperacion = time.time()
         
         try:
@@ -638,35 +1371,16 @@ class SistemaRecuperacionInteligente:
             checkpoints_restaurados = []
             datos_recuperados = 0
             
-            for paso in estrategia.pasos_ejecucion:
-                self.logger.log(NivelSeveridad.DEBUG, f"Ejecutando paso: {paso}")
+            for etapa in self._agrupar_pasos(estrategia.pasos_ejecucion):
+                if len(etapa) == 1:
+                    restaurados = [await self._ejecutar_paso(etapa[0])]
+                else:
+                    restaurados = await asyncio.gather(*(self._ejecutar_paso(paso) for paso in etapa))
                 
-                if paso == "detener_servicios_activos":
-                    # Simular detención de servicios
-                    time.sleep(0.1)
-                    
-                elif paso == "validar_checkpoints_disponibles":
-                    checkpoints_validos = [c for c in self.gestor_checkpoints.checkpoints.values() if c.valido]
-                    self.logger.log(NivelSeveridad.INFO, f"Checkpoints válidos disponibles: {len(checkpoints_validos)}")
-                    
-                elif paso == "restaurar_ultimo_checkpoint_valido":
-                    ultimo_checkpoint = self._obtener_ultimo_checkpoint_valido()
-                    if ultimo_checkpoint:
-                        checkpoints_restaurados.append(ultimo_checkpoint.id)
-                        datos_recuperados += len(str(ultimo_checkpoint.datos))
-                        self.logger.log(NivelSeveridad.INFO, f"Restaurado checkpoint: {ultimo_checkpoint.id}")
-                    
-                elif paso == "reiniciar_servicios_esenciales":
-                    # Simular reinicio de servicios
-                    time.sleep(0.2)
-                    
-                elif paso == "validar_integridad_sistema":
-                    # Simular validación
-                    time.sleep(0.1)
-                    
-                elif paso == "notificar_resultado":
-                    # La notificación se hace al final
-                    pass
+                for checkpoint in restaurados:
+                    if checkpoint:
+                        checkpoints_restaurados.append(checkpoint.id)
+                        datos_recuperados += len(str(checkpoint.datos))
             
             tiempo_total = time.time() - inicio_recuperacion
             
@@ -732,26 +1446,15 @@ class SistemaRecuperacionInteligente:
     
     def _obtener_ultimo_checkpoint_valido(self) -> Optional[Checkpoint]:
         """Obtener el último checkpoint válido"""
-        checkpoints_validos = [c for c in self.gestor_checkpoints.checkpoints.values() if c.valido]
-        if checkpoints_validos:
-            # Ordenar por timestamp (más reciente primero)
-            checkpoints_validos.sort(key=lambda x: x.timestamp, reverse=True)
-            return checkpoints_validos[0]
-        return None
+        validos = self.gestor_checkpoints.valid_checkpoints
+        return validos[0] if validos else None
     
     def _validar_estado_post_recuperacion(self) -> bool:
         """Validar estado del sistema post-recuperación"""
         try:
-            # Verificar que el gestor de estado esté funcional
-            if not hasattr(self.gestor_estado, 'sistema_inicializado'):
-                return False
-            
-            # Verificar que haya checkpoints válidos
-            checkpoints_validos = [c for c in self.gestor_checkpoints.checkpoints.values() if c.valido]
-            if len(checkpoints_validos) == 0:
-                return False
-            
-            return True
+            # Verificar que el gestor de estado esté funcional y que haya checkpoints válidos
+            return (hasattr(self.gestor_estado, 'sistema_inicializado')
+                    and len(self.gestor_checkpoints.valid_checkpoints) > 0)
         except Exception as e:
             self.logger.log(NivelSeveridad.ERROR, f"Error en validación post-recuperación: {e}")
             return False
@@ -823,7 +1526,7 @@ class SistemaRecuperacionInteligente:
             "proceso_activo": self.proceso_recuperacion_activo,
             "ultima_recuperacion": self.ultima_recuperacion.isoformat() if self.ultima_recuperacion else None,
             "checkpoints_totales": len(self.gestor_checkpoints.checkpoints),
-            "checkpoints_validos": len([c for c in self.gestor_checkpoints.checkpoints.values() if c.valido]),
+            "checkpoints_validos": len(self.gestor_checkpoints.valid_checkpoints),
             "incidentes_pendientes": len(self.gestor_incidentes.obtener_incidentes_pendientes()),
             "estrategias_disponibles": list(self.estrategias.keys())
         }
@@ -836,7 +1539,7 @@ class SistemaRecuperacionInteligente:
             "incidentes": incidentes_stats,
             "checkpoints": {
                 "total": len(self.gestor_checkpoints.checkpoints),
-                "validos": len([c for c in self.gestor_checkpoints.checkpoints.values() if c.valido]),
+                "validos": len(self.gestor_checkpoints.valid_checkpoints),
                 "por_tipo": self._contar_checkpoints_por_tipo()
             },
             "estado_sistema": self.obtener_estado_sistema()
@@ -844,11 +1547,16 @@ class SistemaRecuperacionInteligente:
     
     def _contar_checkpoints_por_tipo(self) -> Dict[str, int]:
         """Contar checkpoints por tipo"""
-        conteo = {}
-        for checkpoint in self.gestor_checkpoints.checkpoints.values():
-            tipo = checkpoint.tipo.value
-            conteo[tipo] = conteo.get(tipo, 0) + 1
-        return conteo
+        return self.gestor_checkpoints.contar_por_tipo()
+    
+    def cerrar(self):
+        """Liberar los recursos abiertos por el sistema de recuperación"""
+        try:
+            self.gestor_checkpoints.cerrar()
+            self.gestor_incidentes.cerrar()
+            self.logger.log(NivelSeveridad.INFO, "Sistema de recuperación cerrado")
+        except Exception as e:
+            self.logger.log(NivelSeveridad.ERROR, f"Error cerrando sistema de recuperación: {e}")
     
     def limpiar_sistema(self, dias_checkpoints: int = 7):
         """Limpiar sistema eliminando datos antiguos"""
@@ -11,21 +11,151 @@ Sistema ultra-robusto de Text-to-Speech con:
 
 import os
 import time
+import asyncio
 import wave
 import json
+import struct
+import zlib
 import hashlib
 import threading
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 import tempfile
 
 from sistema_logging_monitoreo import obtener_sistema_logging, NivelSeveridad
 from cache_lru_multinivel import obtener_cache_multinivel, TipoDato
 
 
+# Cada cuántas síntesis se reordena el fallback según las estadísticas de cada motor
+_INTERVALO_REORDENACION = 20
+# Fallos seguidos tras los que un motor se deja de intentar temporalmente, y durante cuánto
+_FALLOS_PARA_BLOQUEO = 3
+_SEGUNDOS_BLOQUEO = 60.0
+
+# Textos recientes cuyo audio ya está resuelto (evita hash y consulta al cache)
+_MAX_TEXTOS_RESUELTOS = 256
+
+# Textos a partir de este tamaño se hashean en un hilo aparte (hashlib libera el GIL)
+_MIN_CARACTERES_HASH_PARALELO = 16 * 1024
+
+# Resultado de un intento de síntesis: (stat del archivo generado, mensaje de error)
+_IntentoSintesis = Tuple[Optional[os.stat_result], Optional[str]]
+# Errores esperables de un motor TTS; el resto se captura una sola vez en sintetizar()
+_ERRORES_SINTESIS = (ImportError, OSError, RuntimeError, ValueError)
+
+# Cabecera WAV canónica de 44 bytes: RIFF, fmt de 16 bytes y comienzo del chunk data
+_CABECERA_WAV = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+# Motores compartidos por todos los sintetizadores: crearlos es caro (enumeración de drivers)
+_MOTOR_PYTTSX3 = None
+_VOZ_SAPI = None
+_lock_motores = threading.Lock()
+# Ninguno de los dos motores es seguro entre hilos: cada síntesis se hace bajo su lock
+_lock_pyttsx3 = threading.Lock()
+_lock_sapi = threading.Lock()
+
+
+def _obtener_motor_pyttsx3():
+    """Motor pyttsx3 compartido, creado en el primer uso"""
+    global _MOTOR_PYTTSX3
+    with _lock_motores:
+        if _MOTOR_PYTTSX3 is None:
+            import pyttsx3
+            _MOTOR_PYTTSX3 = pyttsx3.init()
+        return _MOTOR_PYTTSX3
+
+
+def _obtener_voz_sapi():
+    """Voz SAPI compartida, creada en el primer uso"""
+    global _VOZ_SAPI
+    with _lock_motores:
+        if _VOZ_SAPI is None:
+            import win32com.client
+            _VOZ_SAPI = win32com.client.Dispatch("SAPI.SpVoice")
+        return _VOZ_SAPI
+
+
+def _hash_texto(texto: str) -> str:
+    """Hash corto del texto para claves de cache (64 bits bastan para un cache local)"""
+    return hashlib.blake2b(texto.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _stat_si_existe(ruta: Path) -> Optional[os.stat_result]:
+    """Un único stat del archivo, o None si no existe"""
+    try:
+        return os.stat(ruta)
+    except OSError:
+        return None
+
+
+def _stat_o_error(ruta: Path) -> _IntentoSintesis:
+    """Resultado de síntesis a partir del archivo generado, si existe"""
+    stat_archivo = _stat_si_existe(ruta)
+    if stat_archivo is None:
+        return None, f"No se generó el archivo {ruta.name}"
+    return stat_archivo, None
+
+
+def _crc_archivo(ruta: Path) -> int:
+    """CRC32 del contenido actual de un archivo (siempre se relee: detecta corrupción sin cambio de stat)"""
+    crc = 0
+    with open(ruta, 'rb') as f:
+        while bloque := f.read(1 << 20):
+            crc = zlib.crc32(bloque, crc)
+    return crc
+
+
+def _entrada_cache_audio(archivo: Path) -> Tuple[Path, int]:
+    """Valor a guardar en cache para un audio: ruta y CRC32 de su contenido"""
+    return archivo, _crc_archivo(archivo)
+
+
+def _leer_cabecera_wav(ruta: str) -> Optional[Tuple[float, int]]:
+    """Duración y sample rate desde una cabecera WAV canónica, o None si no lo es"""
+    try:
+        with open(ruta, 'rb') as f:
+            cabecera = f.read(_CABECERA_WAV.size)
+    except OSError:
+        return None
+    if len(cabecera) < _CABECERA_WAV.size:
+        return None
+    
+    (riff, _, wave_id, fmt_id, _, _, _, sample_rate, _, 
+     block_align, _, data_id, tamano_datos) = _CABECERA_WAV.unpack(cabecera)
+    if (riff, wave_id, fmt_id, data_id) != (b'RIFF', b'WAVE', b'fmt ', b'data') or block_align == 0:
+        # Cabeceras con chunks extra o malformadas quedan para el módulo wave
+        return None
+    
+    frames = tamano_datos // block_align
+    return (frames / sample_rate if sample_rate > 0 else 0), sample_rate
+
+
+@lru_cache(maxsize=512)
+def _leer_duracion_audio(ruta: str, inodo: int, mtime_ns: int, tamano: int) -> Tuple[float, int]:
+    """Duración y sample rate de un archivo, memorizados por identidad y versión del archivo"""
+    cabecera = _leer_cabecera_wav(ruta)
+    if cabecera is not None:
+        return cabecera
+    
+    # Intentar leer como WAV
+    try:
+        with wave.open(ruta, 'rb') as wav_file:
+            frames = wav_file.getnframes()
+            sample_rate = wav_file.getframerate()
+            duracion = frames / sample_rate if sample_rate > 0 else 0
+    except:
+        # Si no es WAV, estimar valores
+        duracion = max(1.0, tamano / 32000)  # Estimación básica
+        sample_rate = 22050
+    return duracion, sample_rate
+
+
 class TipoTTS(Enum):
     """Tipos de sistemas TTS disponibles"""
     PYTTSX3 = "pyttsx3"
@@ -45,6 +175,7 @@ class CalidadAudio(Enum):
 @dataclass
 class ConfiguracionTTS:
     """Configuración de un sistema TTS"""
+    __slots__ = ('tipo', 'disponible', 'velocidad', 'volumen', 'voz', 'idioma', 'calidad', 'prioridad')
     tipo: TipoTTS
     disponible: bool
     velocidad: float
@@ -58,6 +189,7 @@ class ConfiguracionTTS:
 @dataclass
 class MetricasAudio:
     """Métricas de calidad de audio"""
+    __slots__ = ('duracion_segundos', 'tamano_bytes', 'sample_rate', 'calidad_estimada')
     duracion_segundos: float
     tamano_bytes: int
     sample_rate: int
@@ -67,6 +199,8 @@ class MetricasAudio:
 @dataclass
 class ResultadoTTS:
     """Resultado de síntesis TTS"""
+    __slots__ = ('exito', 'archivo_audio', 'duracion', 'tiempo_sintesis', 'tts_utilizado', 
+                 'metricas_audio', 'error_mensaje')
     exito: bool
     archivo_audio: Optional[Path]
     duracion: float
@@ -94,9 +228,13 @@ class DetectorModelosTTS:
             (self._detectar_windows_sapi, TipoTTS.WINDOWS_SAPI)
         ]
         
-        for detector, tipo in detectores:
+        # Los detectores son independientes y pasan casi todo el tiempo importando módulos
+        with ThreadPoolExecutor(max_workers=len(detectores)) as executor:
+            futuros = [(executor.submit(detector), tipo) for detector, tipo in detectores]
+        
+        for futuro, tipo in futuros:
             try:
-                config = detector()
+                config = futuro.result()
                 if config and config.disponible:
                     modelos[tipo] = config
                     self.logger.log(NivelSeveridad.INFO, f"✅ {tipo.value} disponible")
@@ -188,24 +326,19 @@ class ValidadorCalidadAudio:
     def __init__(self):
         self.logger = obtener_sistema_logging().obtener_sistema_logger()
     
-    def validar_archivo_audio(self, archivo_audio: Path) -> MetricasAudio:
+    def validar_archivo_audio(self, archivo_audio: Path, 
+                              stat_archivo: Optional[os.stat_result] = None) -> MetricasAudio:
         """Validar archivo de audio"""
         try:
-            if not archivo_audio.exists():
-                raise FileNotFoundError(f"Archivo no encontrado: {archivo_audio}")
-            
-            tamano = archivo_audio.stat().st_size
+            if stat_archivo is None:
+                try:
+                    stat_archivo = os.stat(archivo_audio)
+                except FileNotFoundError:
+                    raise FileNotFoundError(f"Archivo no encontrado: {archivo_audio}")
             
-            # Intentar leer como WAV
-            try:
-                with wave.open(str(archivo_audio), 'rb') as wav_file:
-                    frames = wav_file.getnframes()
-                    sample_rate = wav_file.getframerate()
-                    duracion = frames / sample_rate if sample_rate > 0 else 0
-            except:
-                # Si no es WAV, estimar valores
-                duracion = max(1.0, tamano / 32000)  # Estimación básica
-                sample_rate = 22050
+            tamano = stat_archivo.st_size
+            duracion, sample_rate = _leer_duracion_audio(
+                os.fspath(archivo_audio), stat_archivo.st_ino, stat_archivo.st_mtime_ns, tamano)
             
             # Calcular calidad basada en tamaño y duración
             if tamano > 50000 and duracion > 1.0:
@@ -235,6 +368,22 @@ class ValidadorCalidadAudio:
 class SintetizadorTTS:
     """Sintetizador específico para cada tipo de TTS"""
     
+    # Event loop compartido para los motores asíncronos, creado en el primer uso
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _hilo_loop: Optional[threading.Thread] = None
+    _lock_loop = threading.Lock()
+    
+    @classmethod
+    def _obtener_loop(cls) -> asyncio.AbstractEventLoop:
+        """Obtener el event loop persistente, arrancando su hilo si hace falta"""
+        with cls._lock_loop:
+            if cls._hilo_loop is None or not cls._hilo_loop.is_alive():
+                cls._loop = asyncio.new_event_loop()
+                cls._hilo_loop = threading.Thread(target=cls._loop.run_forever, 
+                                                  name="TTSEventLoop", daemon=True)
+                cls._hilo_loop.start()
+            return cls._loop
+    
     def __init__(self, config: ConfiguracionTTS):
         self.config = config
         self.logger = obtener_sistema_logging().obtener_sistema_logger()
@@ -245,20 +394,18 @@ class SintetizadorTTS:
         """Inicializar instancia TTS específica"""
         try:
             if self.config.tipo == TipoTTS.PYTTSX3:
-                import pyttsx3
-                self.instancia_tts = pyttsx3.init()
+                self.instancia_tts = _obtener_motor_pyttsx3()
                 self.instancia_tts.setProperty('rate', self.config.velocidad)
                 self.instancia_tts.setProperty('volume', self.config.volumen)
                 
             elif self.config.tipo == TipoTTS.WINDOWS_SAPI:
-                import win32com.client
-                self.instancia_tts = win32com.client.Dispatch("SAPI.SpVoice")
+                self.instancia_tts = _obtener_voz_sapi()
                 
         except Exception as e:
             self.logger.log(NivelSeveridad.ERROR, f"Error inicializando {self.config.tipo.value}: {e}")
     
-    def sintetizar(self, texto: str, archivo_salida: Path) -> bool:
-        """Sintetizar texto a audio"""
+    def sintetizar(self, texto: str, archivo_salida: Path) -> _IntentoSintesis:
+        """Sintetizar texto a audio: (stat del archivo generado, mensaje de error)"""
         try:
             if self.config.tipo == TipoTTS.PYTTSX3:
                 return self._sintetizar_pyttsx3(texto, archivo_salida)
@@ -268,26 +415,57 @@ class SintetizadorTTS:
                 return self._sintetizar_edge_tts(texto, archivo_salida)
             elif self.config.tipo == TipoTTS.WINDOWS_SAPI:
                 return self._sintetizar_windows_sapi(texto, archivo_salida)
-            return False
+            return None, f"Tipo TTS no soportado: {self.config.tipo.value}"
                 
         except Exception as e:
+            # Errores propios de cada librería (gTTSError, errores COM, HTTP...)
             self.logger.log(NivelSeveridad.ERROR, f"Error sintetizando: {e}")
-            return False
+            return None, str(e)
     
-    def _sintetizar_pyttsx3(self, texto: str, archivo_salida: Path) -> bool:
-        """Sintetizar con pyttsx3"""
+    def sintetizar_lote(self, textos: List[str], archivos_salida: List[Path]) -> List[Optional[os.stat_result]]:
+        """Sintetizar varios textos preparando el motor una sola vez"""
         try:
-            if not self.instancia_tts:
-                return False
+            if self.config.tipo == TipoTTS.PYTTSX3 and self.instancia_tts:
+                # Encolar todos los archivos y procesarlos con un único runAndWait
+                with _lock_pyttsx3:
+                    for texto, archivo_salida in zip(textos, archivos_salida):
+                        self.instancia_tts.save_to_file(texto, str(archivo_salida))
+                    self.instancia_tts.runAndWait()
+                return [_stat_si_existe(archivo) for archivo in archivos_salida]
             
-            self.instancia_tts.save_to_file(texto, str(archivo_salida))
-            self.instancia_tts.runAndWait()
-            return archivo_salida.exists()
+            if self.config.tipo == TipoTTS.EDGE_TTS:
+                import edge_tts
+                
+                async def _generar_todos():
+                    await asyncio.gather(*(
+                        edge_tts.Communicate(texto, self.config.voz).save(str(archivo_salida))
+                        for texto, archivo_salida in zip(textos, archivos_salida)
+                    ), return_exceptions=True)
+                
+                asyncio.run_coroutine_threadsafe(_generar_todos(), self._obtener_loop()).result()
+                return [_stat_si_existe(archivo) for archivo in archivos_salida]
             
-        except Exception:
-            return False
+        except Exception as e:
+            self.logger.log(NivelSeveridad.ERROR, f"Error sintetizando lote: {e}")
+            return [None] * len(textos)
+        
+        return [self.sintetizar(texto, archivo)[0] for texto, archivo in zip(textos, archivos_salida)]
     
-    def _sintetizar_gtts(self, texto: str, archivo_salida: Path) -> bool:
+    def _sintetizar_pyttsx3(self, texto: str, archivo_salida: Path) -> _IntentoSintesis:
+        """Sintetizar con pyttsx3"""
+        if not self.instancia_tts:
+            return None, "pyttsx3 no inicializado"
+        
+        try:
+            with _lock_pyttsx3:
+                self.instancia_tts.save_to_file(texto, str(archivo_salida))
+                self.instancia_tts.runAndWait()
+        except _ERRORES_SINTESIS as e:
+            return None, str(e)
+        
+        return _stat_o_error(archivo_salida)
+    
+    def _sintetizar_gtts(self, texto: str, archivo_salida: Path) -> _IntentoSintesis:
         """Sintetizar con Google TTS"""
         try:
             from gtts import gTTS
@@ -299,50 +477,49 @@ class SintetizadorTTS:
             
             # Para convertir a WAV necesitaríamos ffmpeg
             # Por ahora mantener como MP3
-            if archivo_mp3.exists():
-                if archivo_salida.suffix.lower() == '.wav':
-                    # Intentar conversión básica
-                    import shutil
-                    shutil.move(str(archivo_mp3), str(archivo_salida.with_suffix('.mp3')))
-                return True
-            return False
-            
-        except Exception:
-            return False
-    
-    def _sintetizar_edge_tts(self, texto: str, archivo_salida: Path) -> bool:
+            if not archivo_mp3.exists():
+                return None, "gTTS no generó el archivo"
+            if archivo_salida.suffix.lower() == '.wav':
+                # Intentar conversión básica
+                import shutil
+                shutil.move(str(archivo_mp3), str(archivo_salida.with_suffix('.mp3')))
+        except _ERRORES_SINTESIS as e:
+            return None, str(e)
+        
+        return _stat_o_error(archivo_salida)
+    
+    def _sintetizar_edge_tts(self, texto: str, archivo_salida: Path) -> _IntentoSintesis:
         """Sintetizar con Edge TTS"""
         try:
             import edge_tts
-            import asyncio
             
             async def _generar():
                 communicate = edge_tts.Communicate(texto, self.config.voz)
                 await communicate.save(str(archivo_salida))
             
-            asyncio.run(_generar())
-            return archivo_salida.exists()
-            
-        except Exception:
-            return False
+            asyncio.run_coroutine_threadsafe(_generar(), self._obtener_loop()).result()
+        except _ERRORES_SINTESIS as e:
+            return None, str(e)
+        
+        return _stat_o_error(archivo_salida)
     
-    def _sintetizar_windows_sapi(self, texto: str, archivo_salida: Path) -> bool:
+    def _sintetizar_windows_sapi(self, texto: str, archivo_salida: Path) -> _IntentoSintesis:
         """Sintetizar con Windows SAPI"""
+        if not self.instancia_tts:
+            return None, "SAPI no inicializado"
+        
         try:
-            if not self.instancia_tts:
-                return False
-            
             import win32com.client
             file_stream = win32com.client.Dispatch("SAPI.SpFileStream")
-            file_stream.Open(str(archivo_salida), 3)
-            self.instancia_tts.AudioOutputStream = file_stream
-            self.instancia_tts.Speak(texto)
-            file_stream.Close()
-            
-            return archivo_salida.exists()
-            
-        except Exception:
-            return False
+            with _lock_sapi:
+                file_stream.Open(str(archivo_salida), 3)
+                self.instancia_tts.AudioOutputStream = file_stream
+                self.instancia_tts.Speak(texto)
+                file_stream.Close()
+        except _ERRORES_SINTESIS as e:
+            return None, str(e)
+        
+        return _stat_o_error(archivo_salida)
 
 
 class TTSHandlerUltraConfiable:
@@ -361,6 +538,18 @@ class TTSHandlerUltraConfiable:
         # Estado del sistema
         self.modelos_disponibles = {}
         self.sintetizadores = {}
+        # Orden de fallback precalculado: (tipo, configuración, sintetizador) por prioridad
+        self._orden_fallback: Tuple[Tuple[TipoTTS, ConfiguracionTTS, SintetizadorTTS], ...] = ()
+        # Estadísticas de ejecución por motor para reordenar el fallback y bloquear motores caídos
+        self._estadisticas_tts: Dict[TipoTTS, Dict[str, float]] = {}
+        self._sintesis_desde_reordenacion = 0
+        # Las síntesis pueden llegar desde varios hilos: los contadores se actualizan bajo lock
+        self._lock_estadisticas = threading.Lock()
+        # LRU (texto, calidad) -> (audio, CRC32) para peticiones repetidas del mismo texto
+        self._textos_resueltos: "OrderedDict[Tuple[str, int], Any]" = OrderedDict()
+        self._lock_resueltos = threading.Lock()
+        # Hilos para solapar el hash de textos largos con el resto de la preparación
+        self._pool_hash = ThreadPoolExecutor(max_workers=2, thread_name_prefix="TTSHash")
         self.estadisticas = {
             "sintesis_exitosas": 0,
             "fallbacks_utilizados": 0,
@@ -389,6 +578,16 @@ class TTSHandlerUltraConfiable:
                 sorted(self.modelos_disponibles.items(), 
                       key=lambda x: x[1].prioridad, reverse=True)
             )
+            self._orden_fallback = tuple(
+                (tipo_tts, config, self.sintetizadores[tipo_tts])
+                for tipo_tts, config in self.modelos_disponibles.items()
+                if tipo_tts in self.sintetizadores
+            )
+            self._estadisticas_tts = {
+                tipo_tts: {"intentos": 0, "exitos": 0, "tiempo_total": 0.0, 
+                           "racha_fallos": 0, "bloqueado_hasta": 0.0}
+                for tipo_tts, _, _ in self._orden_fallback
+            }
             
             self.logger.log(
                 NivelSeveridad.INFO, 
@@ -404,128 +603,340 @@ class TTSHandlerUltraConfiable:
         inicio_sintesis = time.time()
         
         try:
+            # Textos largos: el hash avanza en paralelo mientras se revisa el atajo en memoria
+            futuro_hash = (self._pool_hash.submit(_hash_texto, texto)
+                           if len(texto) >= _MIN_CARACTERES_HASH_PARALELO else None)
+            
+            # Texto repetido: reutilizar su audio sin recalcular el hash ni consultar el cache
+            audio_resuelto = self._buscar_texto_resuelto(texto, calidad_minima)
+            if audio_resuelto is not None:
+                resultado = self._resultado_desde_cache(audio_resuelto, calidad_minima, 
+                                                        archivo_salida, inicio_sintesis)
+                if resultado:
+                    return resultado
+                self._olvidar_texto_resuelto(texto, calidad_minima)
+            
             # Cache key
-            texto_hash = hashlib.md5(texto.encode('utf-8')).hexdigest()
+            texto_hash = futuro_hash.result() if futuro_hash else _hash_texto(texto)
             cache_key = f"tts_{texto_hash}_{calidad_minima.value}"
             
             # Verificar cache
             audio_cached = self.cache.get(cache_key)
-            if audio_cached and isinstance(audio_cached, Path) and audio_cached.exists():
-                self.estadisticas["cache_hits"] += 1
-                metricas = self.validador.validar_archivo_audio(audio_cached)
-                
-                if metricas.calidad_estimada.value >= calidad_minima.value:
-                    if archivo_salida:
-                        import shutil
-                        shutil.copy2(audio_cached, archivo_salida)
-                        archivo_final = archivo_salida
-                    else:
-                        archivo_final = audio_cached
-                    
-                    return ResultadoTTS(
-                        exito=True,
-                        archivo_audio=archivo_final,
-                        duracion=metricas.duracion_segundos,
-                        tiempo_sintesis=time.time() - inicio_sintesis,
-                        tts_utilizado=list(self.modelos_disponibles.keys())[0],
-                        metricas_audio=metricas,
-                        error_mensaje=None
-                    )
+            resultado = self._resultado_desde_cache(audio_cached, calidad_minima, 
+                                                    archivo_salida, inicio_sintesis)
+            if resultado:
+                self._recordar_texto_resuelto(texto, calidad_minima, audio_cached)
+                return resultado
             
             # Archivo de salida
             if archivo_salida is None:
                 archivo_salida = self.ruta_cache / f"tts_{texto_hash}.wav"
             
             # Intentar síntesis con fallbacks
-            for tipo_tts, config in self.modelos_disponibles.items():
-                if tipo_tts not in self.sintetizadores:
+            resultado = self._sintetizar_con_fallbacks(texto, archivo_salida, cache_key, 
+                                                       calidad_minima, inicio_sintesis)
+            if resultado:
+                return resultado
+            
+            # Todos los fallbacks fallaron
+            return self._resultado_fallido("Todos los sistemas TTS fallaron", inicio_sintesis)
+            
+        except Exception as e:
+            return self._resultado_fallido(f"Error crítico en síntesis TTS: {e}", inicio_sintesis)
+    
+    def sintetizar_lote(self, textos: List[str], 
+                        calidad_minima: CalidadAudio = CalidadAudio.MEDIA) -> List[ResultadoTTS]:
+        """Sintetizar varios textos compartiendo hashing, consulta de cache y motor"""
+        inicio_lote = time.time()
+        
+        try:
+            resultados: Dict[str, ResultadoTTS] = {}
+            distintos: List[str] = []
+            # Textos ya resueltos recientemente: igual que en sintetizar_texto, sin hash ni cache
+            for texto in dict.fromkeys(textos):
+                audio_resuelto = self._buscar_texto_resuelto(texto, calidad_minima)
+                resultado = (self._resultado_desde_cache(audio_resuelto, calidad_minima, None, inicio_lote)
+                             if audio_resuelto is not None else None)
+                if resultado:
+                    resultados[texto] = resultado
                     continue
+                if audio_resuelto is not None:
+                    self._olvidar_texto_resuelto(texto, calidad_minima)
+                distintos.append(texto)
+            
+            # Un hash por texto distinto; recorrer en orden de hash agrupa los accesos al cache
+            largos = [texto for texto in distintos if len(texto) >= _MIN_CARACTERES_HASH_PARALELO]
+            hashes = dict(zip(largos, self._pool_hash.map(_hash_texto, largos)))
+            hashes.update((texto, _hash_texto(texto)) for texto in distintos if texto not in hashes)
+            unicos = sorted(hashes, key=hashes.get)
+            claves = {texto: f"tts_{hashes[texto]}_{calidad_minima.value}" for texto in unicos}
+            en_cache = self.cache.get_many(list(claves.values()))
+            
+            pendientes: List[str] = []
+            for texto in unicos:
+                entrada = en_cache.get(claves[texto])
+                resultado = self._resultado_desde_cache(entrada, calidad_minima, None, inicio_lote)
+                if resultado:
+                    resultados[texto] = resultado
+                    self._recordar_texto_resuelto(texto, calidad_minima, entrada)
+                else:
+                    pendientes.append(texto)
+            
+            # Generar todos los pendientes con el primer motor no bloqueado en una sola pasada
+            ahora = time.monotonic()
+            orden = self._orden_fallback
+            preferido = next((entrada for entrada in orden
+                              if self._estadisticas_tts.get(entrada[0], {}).get("bloqueado_hasta", 0.0) <= ahora),
+                             orden[0] if orden else None)
+            tipo_preferido = preferido[0] if preferido else None
+            if pendientes and preferido is not None:
+                archivos = [self.ruta_cache / f"tts_{hashes[texto]}.wav" for texto in pendientes]
+                inicio_modelo = time.time()
+                stats = preferido[2].sintetizar_lote(pendientes, archivos)
+                tiempo_modelo = (time.time() - inicio_modelo) / len(pendientes)
                 
-                try:
-                    self.logger.log(NivelSeveridad.DEBUG, f"Intentando {tipo_tts.value}")
-                    
-                    sintetizador = self.sintetizadores[tipo_tts]
-                    inicio_modelo = time.time()
-                    
-                    # Intentar síntesis
-                    exito = sintetizador.sintetizar(texto, archivo_salida)
-                    tiempo_modelo = time.time() - inicio_modelo
-                    
-                    if exito and archivo_salida.exists():
-                        # Validar calidad
-                        metricas = self.validador.validar_archivo_audio(archivo_salida)
-                        
-                        if metricas.calidad_estimada.value >= calidad_minima.value:
-                            # Guardar en cache
-                            self.cache.put(cache_key, archivo_salida, TipoDato.AUDIO, tiempo_modelo)
-                            
-                            # Actualizar estadísticas
-                            self.estadisticas["sintesis_exitosas"] += 1
-                            self._actualizar_tiempo_promedio(time.time() - inicio_sintesis)
-                            
-                            self.logger.log(
-                                NivelSeveridad.INFO,
-                                f"✅ Síntesis exitosa con {tipo_tts.value}",
-                                duracion=metricas.duracion_segundos
-                            )
-                            
-                            return ResultadoTTS(
-                                exito=True,
-                                archivo_audio=archivo_salida,
-                                duracion=metricas.duracion_segundos,
-                                tiempo_sintesis=time.time() - inicio_sintesis,
-                                tts_utilizado=tipo_tts,
-                                metricas_audio=metricas,
-                                error_mensaje=None
-                            )
-                        else:
-                            # Calidad insuficiente, probar siguiente
-                            self.estadisticas["fallbacks_utilizados"] += 1
-                            self.logger.log(NivelSeveridad.WARNING, 
-                                          f"Calidad insuficiente con {tipo_tts.value}")
-                    
-                except Exception as e:
-                    self.estadisticas["fallbacks_utilizados"] += 1
-                    self.logger.log(NivelSeveridad.WARNING, f"Fallback {tipo_tts.value}: {e}")
+                # Cada texto cuenta como un intento del motor, igual que en la síntesis individual
+                for texto, archivo, stat_salida in zip(pendientes, archivos, stats):
+                    exito = False
+                    if stat_salida is not None:
+                        metricas = self.validador.validar_archivo_audio(archivo, stat_salida)
+                        exito = metricas.calidad_estimada.value >= calidad_minima.value
+                    self._registrar_intento(tipo_preferido, exito, tiempo_modelo)
+                    if not exito:
+                        self._incrementar_estadistica("fallbacks_utilizados")
+                        continue
+                    resultados[texto] = self._registrar_exito(
+                        claves[texto], archivo, tipo_preferido, metricas, tiempo_modelo, inicio_lote,
+                        texto, calidad_minima)
+            
+            # Lo que el motor preferido no resolvió sigue el camino normal con fallbacks
+            for texto in pendientes:
+                if texto in resultados:
                     continue
+                archivo = self.ruta_cache / f"tts_{hashes[texto]}.wav"
+                resultado = self._sintetizar_con_fallbacks(texto, archivo, claves[texto], calidad_minima, 
+                                                           time.time(), omitir=tipo_preferido)
+                resultados[texto] = resultado or self._resultado_fallido("Todos los sistemas TTS fallaron", 
+                                                                         inicio_lote)
             
-            # Todos los fallbacks fallaron
-            tiempo_total = time.time() - inicio_sintesis
-            error_msg = "Todos los sistemas TTS fallaron"
-            
-            self.logger.log(NivelSeveridad.ERROR, error_msg)
-            
-            return ResultadoTTS(
-                exito=False,
-                archivo_audio=None,
-                duracion=0.0,
-                tiempo_sintesis=tiempo_total,
-                tts_utilizado=list(self.modelos_disponibles.keys())[0] if self.modelos_disponibles else TipoTTS.PYTTSX3,
-                metricas_audio=None,
-                error_mensaje=error_msg
-            )
+            return [resultados[texto] for texto in textos]
             
         except Exception as e:
-            error_msg = f"Error crítico en síntesis TTS: {e}"
-            self.logger.log(NivelSeveridad.ERROR, error_msg)
-            
-            return ResultadoTTS(
-                exito=False,
-                archivo_audio=None,
-                duracion=0.0,
-                tiempo_sintesis=time.time() - inicio_sintesis,
-                tts_utilizado=list(self.modelos_disponibles.keys())[0] if self.modelos_disponibles else TipoTTS.PYTTSX3,
-                metricas_audio=None,
-                error_mensaje=error_msg
-            )
+            error = self._resultado_fallido(f"Error crítico en síntesis TTS por lotes: {e}", inicio_lote)
+            return [error] * len(textos)
+    
+    def _buscar_texto_resuelto(self, texto: str, calidad_minima: CalidadAudio) -> Optional[Any]:
+        """Audio ya resuelto para este texto y calidad, si se pidió recientemente"""
+        clave = (texto, calidad_minima.value)
+        with self._lock_resueltos:
+            archivo = self._textos_resueltos.get(clave)
+            if archivo is not None:
+                self._textos_resueltos.move_to_end(clave)
+            return archivo
+    
+    def _recordar_texto_resuelto(self, texto: str, calidad_minima: CalidadAudio, entrada: Any):
+        """Recordar el audio de un texto, descartando el menos reciente si se llena"""
+        with self._lock_resueltos:
+            self._textos_resueltos[(texto, calidad_minima.value)] = entrada
+            self._textos_resueltos.move_to_end((texto, calidad_minima.value))
+            if len(self._textos_resueltos) > _MAX_TEXTOS_RESUELTOS:
+                self._textos_resueltos.popitem(last=False)
+    
+    def _olvidar_texto_resuelto(self, texto: str, calidad_minima: CalidadAudio):
+        """Descartar un audio recordado que ya no es utilizable"""
+        with self._lock_resueltos:
+            self._textos_resueltos.pop((texto, calidad_minima.value), None)
+    
+    def _resultado_desde_cache(self, entrada_cache: Any, calidad_minima: CalidadAudio, 
+                               archivo_salida: Optional[Path], inicio_sintesis: float) -> Optional[ResultadoTTS]:
+        """Construir el resultado a partir de un audio en cache, si existe, está intacto y tiene calidad suficiente"""
+        # Entradas actuales: (ruta, CRC32); las antiguas guardaban solo la ruta
+        if isinstance(entrada_cache, tuple):
+            audio_cached, crc_esperado = entrada_cache
+        else:
+            audio_cached, crc_esperado = entrada_cache, None
+        
+        stat_cached = _stat_si_existe(audio_cached) if isinstance(audio_cached, Path) else None
+        if stat_cached is None:
+            return None
+        
+        if crc_esperado is not None and _crc_archivo(audio_cached) != crc_esperado:
+            # Archivo modificado o corrupto: se vuelve a sintetizar y la entrada se sobrescribe
+            self.logger.log(NivelSeveridad.WARNING, f"Audio en cache corrupto, se descarta: {audio_cached}")
+            return None
+        
+        self._incrementar_estadistica("cache_hits")
+        metricas = self.validador.validar_archivo_audio(audio_cached, stat_cached)
+        if metricas.calidad_estimada.value < calidad_minima.value:
+            return None
+        
+        if archivo_salida:
+            # Copia propia del llamador (sin metadatos; el kernel la hace con sendfile/copy_file_range):
+            # un enlace duro compartiría inodo con el cache, que se reescribe en el sitio al re-sintetizar
+            import shutil
+            shutil.copyfile(audio_cached, archivo_salida)
+            archivo_final = archivo_salida
+        else:
+            archivo_final = audio_cached
+        
+        return ResultadoTTS(
+            exito=True,
+            archivo_audio=archivo_final,
+            duracion=metricas.duracion_segundos,
+            tiempo_sintesis=time.time() - inicio_sintesis,
+            tts_utilizado=list(self.modelos_disponibles.keys())[0],
+            metricas_audio=metricas,
+            error_mensaje=None
+        )
+    
+    def _sintetizar_con_fallbacks(self, texto: str, archivo_salida: Path, cache_key: str, 
+                                  calidad_minima: CalidadAudio, inicio_sintesis: float, 
+                                  omitir: Optional[TipoTTS] = None) -> Optional[ResultadoTTS]:
+        """Probar los sintetizadores por prioridad hasta obtener calidad suficiente"""
+        with self._lock_estadisticas:
+            self._sintesis_desde_reordenacion += 1
+            reordenar = self._sintesis_desde_reordenacion >= _INTERVALO_REORDENACION
+            if reordenar:
+                # Solo el hilo que alcanza el intervalo reordena
+                self._sintesis_desde_reordenacion = 0
+        if reordenar:
+            self._reordenar_fallbacks()
+        
+        # Saltar motores bloqueados, salvo que lo estén todos
+        ahora = time.monotonic()
+        candidatos = [entrada for entrada in self._orden_fallback if entrada[0] != omitir]
+        disponibles = [entrada for entrada in candidatos 
+                       if self._estadisticas_tts.get(entrada[0], {}).get("bloqueado_hasta", 0.0) <= ahora]
+        
+        for tipo_tts, config, sintetizador in disponibles or candidatos:
+            self.logger.log(NivelSeveridad.DEBUG, f"Intentando {tipo_tts.value}")
+            inicio_modelo = time.time()
+            
+            # Intentar síntesis (sintetizar() no lanza: devuelve el error)
+            stat_salida, error = sintetizador.sintetizar(texto, archivo_salida)
+            tiempo_modelo = time.time() - inicio_modelo
+            
+            if stat_salida is None:
+                self._registrar_intento(tipo_tts, False, tiempo_modelo)
+                self._incrementar_estadistica("fallbacks_utilizados")
+                self.logger.log(NivelSeveridad.WARNING, f"Fallback {tipo_tts.value}: {error}")
+                continue
+            
+            # Validar calidad
+            metricas = self.validador.validar_archivo_audio(archivo_salida, stat_salida)
+            exito = metricas.calidad_estimada.value >= calidad_minima.value
+            self._registrar_intento(tipo_tts, exito, tiempo_modelo)
+            
+            if exito:
+                return self._registrar_exito(cache_key, archivo_salida, tipo_tts, 
+                                             metricas, tiempo_modelo, inicio_sintesis, texto, calidad_minima)
+            
+            # Calidad insuficiente, probar siguiente
+            self._incrementar_estadistica("fallbacks_utilizados")
+            self.logger.log(NivelSeveridad.WARNING, 
+                          f"Calidad insuficiente con {tipo_tts.value}")
+        
+        return None
+    
+    def _registrar_intento(self, tipo_tts: TipoTTS, exito: bool, tiempo: float):
+        """Actualizar las estadísticas de un motor tras un intento de síntesis"""
+        stats = self._estadisticas_tts.get(tipo_tts)
+        if stats is None:
+            return
+        
+        with self._lock_estadisticas:
+            stats["intentos"] += 1
+            stats["tiempo_total"] += tiempo
+            if exito:
+                stats["exitos"] += 1
+                stats["racha_fallos"] = 0
+                return
+            
+            stats["racha_fallos"] += 1
+            bloquear = stats["racha_fallos"] >= _FALLOS_PARA_BLOQUEO
+            if bloquear:
+                stats["bloqueado_hasta"] = time.monotonic() + _SEGUNDOS_BLOQUEO
+                stats["racha_fallos"] = 0
+        
+        if bloquear:
+            self.logger.log(NivelSeveridad.WARNING, 
+                          f"{tipo_tts.value} bloqueado {_SEGUNDOS_BLOQUEO:.0f}s tras {_FALLOS_PARA_BLOQUEO} fallos seguidos")
+            self._reordenar_fallbacks()
+    
+    def _reordenar_fallbacks(self):
+        """Ordenar el fallback por tasa de éxito por segundo, desempatando por prioridad"""
+        def puntuacion(entrada):
+            tipo_tts, config, _ = entrada
+            stats = self._estadisticas_tts.get(tipo_tts)
+            if not stats or not stats["intentos"]:
+                # Sin datos: neutro, solo cuenta la prioridad estática
+                return (0.0, -config.prioridad)
+            tasa_exito = stats["exitos"] / stats["intentos"]
+            latencia_media = max(stats["tiempo_total"] / stats["intentos"], 1e-3)
+            return (-tasa_exito / latencia_media, -config.prioridad)
+        
+        # Bajo el lock de las estadísticas y publicado como tupla nueva: quien recorre
+        # el orden anterior sigue con su copia intacta
+        with self._lock_estadisticas:
+            self._orden_fallback = tuple(sorted(self._orden_fallback, key=puntuacion))
+            self._sintesis_desde_reordenacion = 0
+    
+    def _registrar_exito(self, cache_key: str, archivo_salida: Path, tipo_tts: TipoTTS, 
+                         metricas: MetricasAudio, tiempo_modelo: float, inicio_sintesis: float,
+                         texto: str, calidad_minima: CalidadAudio) -> ResultadoTTS:
+        """Guardar en cache, actualizar estadísticas y construir el resultado de una síntesis"""
+        # Guardar en cache y en los textos resueltos, con un único CRC del archivo recién generado
+        entrada = _entrada_cache_audio(archivo_salida)
+        self.cache.put(cache_key, entrada, TipoDato.AUDIO, tiempo_modelo)
+        self._recordar_texto_resuelto(texto, calidad_minima, entrada)
+        
+        # Actualizar estadísticas
+        with self._lock_estadisticas:
+            self.estadisticas["sintesis_exitosas"] += 1
+            self._actualizar_tiempo_promedio(time.time() - inicio_sintesis)
+        
+        self.logger.log(
+            NivelSeveridad.INFO,
+            f"✅ Síntesis exitosa con {tipo_tts.value}",
+            duracion=metricas.duracion_segundos
+        )
+        
+        return ResultadoTTS(
+            exito=True,
+            archivo_audio=archivo_salida,
+            duracion=metricas.duracion_segundos,
+            tiempo_sintesis=time.time() - inicio_sintesis,
+            tts_utilizado=tipo_tts,
+            metricas_audio=metricas,
+            error_mensaje=None
+        )
+    
+    def _resultado_fallido(self, error_msg: str, inicio_sintesis: float) -> ResultadoTTS:
+        """Registrar el error y construir un resultado fallido"""
+        self.logger.log(NivelSeveridad.ERROR, error_msg)
+        
+        return ResultadoTTS(
+            exito=False,
+            archivo_audio=None,
+            duracion=0.0,
+            tiempo_sintesis=time.time() - inicio_sintesis,
+            tts_utilizado=list(self.modelos_disponibles.keys())[0] if self.modelos_disponibles else TipoTTS.PYTTSX3,
+            metricas_audio=None,
+            error_mensaje=error_msg
+        )
+    
+    def _incrementar_estadistica(self, clave: str):
+        """Incrementar un contador de estadísticas de forma segura entre hilos"""
+        with self._lock_estadisticas:
+            self.estadisticas[clave] += 1
     
     def _actualizar_tiempo_promedio(self, tiempo_sintesis: float):
-        """Actualizar tiempo promedio de síntesis"""
+        """Actualizar tiempo promedio de síntesis (requiere _lock_estadisticas)"""
         total = self.estadisticas["sintesis_exitosas"]
         if total > 0:
-            self.estadisticas["tiempo_promedio_sintesis"] = (
-                (self.estadisticas["tiempo_promedio_sintesis"] * (total - 1) + tiempo_sintesis) / total
-            )
+            # Media incremental (Welford): estable aunque el número de síntesis crezca mucho
+            promedio = self.estadisticas["tiempo_promedio_sintesis"]
+            self.estadisticas["tiempo_promedio_sintesis"] = promedio + (tiempo_sintesis - promedio) / total
     
     def obtener_modelos_disponibles(self) -> Dict[TipoTTS, ConfiguracionTTS]:
         """Obtener modelos TTS disponibles"""
@@ -533,7 +944,8 @@ class TTSHandlerUltraConfiable:
     
     def obtener_estadisticas(self) -> Dict[str, Any]:
         """Obtener estadísticas del sistema"""
-        return self.estadisticas.copy()
+        with self._lock_estadisticas:
+            return self.estadisticas.copy()
     
     def probar_sistema(self, texto_prueba: str = "Hola, este es un test del sistema TTS.") -> Dict[str, Any]:
         """Probar todos los sistemas TTS"""
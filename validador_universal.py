@@ -13,17 +13,147 @@ Sistema ultra-robusto de validación universal con:
 import time
 import json
 import hashlib
+import math
 import threading
-from typing import Dict, List, Optional, Tuple, Any, Callable, Union
-from dataclasses import dataclass, asdict
+import operator
+from itertools import islice
+from array import array
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, Callable
+from dataclasses import dataclass, fields
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
 import re
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from sistema_logging_monitoreo import obtener_sistema_logging, NivelSeveridad
 from cache_lru_multinivel import obtener_cache_multinivel, TipoDato
 
+# Campos de MetricasValidacion que se promedian en las tendencias, y los que se comparan por cuartos
+_CAMPOS_PROMEDIO = ("tiempo_ejecucion", "precision", "recall", "f1_score", 
+                    "reglas_evaluadas", "reglas_pasadas", "errores", "advertencias")
+_CAMPOS_TENDENCIA = ("precision", "recall", "f1_score", "errores", "advertencias")
+_extraer_campos_promedio = operator.attrgetter(*_CAMPOS_PROMEDIO)
+
+# Capacidad del histórico circular de métricas
+_CAPACIDAD_HISTORICO_METRICAS = 1000
+# Tipo de cada columna del histórico: ratios y conteos pequeños caben en float32; el tiempo conserva float64
+_TIPOS_COLUMNA_HISTORICO = {campo: 'd' if campo == "tiempo_ejecucion" else 'f' for campo in _CAMPOS_PROMEDIO}
+
+# Palabras clave de severidad en los mensajes de las reglas, clasificadas con un único escaneo
+_SEVERIDAD_POR_PALABRA = {"advertencia": "advertencia", "warning": "advertencia", "error": "error"}
+_PATRON_SEVERIDAD = re.compile("|".join(map(re.escape, _SEVERIDAD_POR_PALABRA)), re.IGNORECASE)
+
+# Máximo de resultados de reglas memorizados por validador semántico
+_MAX_RESULTADOS_REGLA = 1024
+
+
+def _medias_por_columna(columnas: dict[str, array], inicio: int, fin: int) -> dict[str, float]:
+    """Media de cada campo sobre el tramo [inicio, fin) de sus columnas"""
+    return {campo: sum(columna[inicio:fin]) / (fin - inicio) for campo, columna in columnas.items()}
+
+
+def _clave_metricas(resultados_validacion: dict[str, tuple[bool, str]], 
+                    advertencias: int, errores: int) -> str:
+    """Clave de cache de métricas: ids de regla con su resultado, sin los mensajes completos"""
+    hasher = hashlib.blake2b(digest_size=8)
+    for regla_id in sorted(resultados_validacion):
+        hasher.update(regla_id.encode('utf-8'))
+        hasher.update(b"\x01" if resultados_validacion[regla_id][0] else b"\x00")
+    # Los mensajes solo influyen en las métricas a través de estos dos conteos
+    hasher.update(f"|{advertencias}|{errores}".encode())
+    return f"metricas_{hasher.hexdigest()}"
+
+
+def _ultimos(historico: deque, cantidad: int) -> list:
+    """Últimos elementos de un histórico acotado (todos si la cantidad no es positiva)"""
+    if cantidad <= 0:
+        return list(historico)
+    return list(islice(historico, max(len(historico) - cantidad, 0), None))
+
+
+_PRIMITIVOS_JSON = (str, int, float, bool, type(None))
+
+
+def _etiquetar_tipos(valor: Any) -> Any:
+    """Estructura JSON equivalente en la que tuplas, conjuntos y claves no str conservan su tipo.
+
+    Devuelve el mismo objeto cuando no hay nada que etiquetar, así el caso común no copia nada.
+    """
+    if isinstance(valor, float) and not math.isfinite(valor):
+        # orjson escribe NaN e infinitos como null: se etiquetan para no confundirlos con None
+        return {"\x00float": repr(valor)}
+    if isinstance(valor, _PRIMITIVOS_JSON):
+        return valor
+    if type(valor) is list:
+        etiquetados = [_etiquetar_tipos(elemento) for elemento in valor]
+        if all(a is b for a, b in zip(etiquetados, valor)):
+            return valor
+        return etiquetados
+    if isinstance(valor, dict):
+        if all(type(clave) is str for clave in valor):
+            etiquetados = {clave: _etiquetar_tipos(v) for clave, v in valor.items()}
+            if all(etiquetados[clave] is v for clave, v in valor.items()):
+                return valor
+            return etiquetados
+        # {1: x} y {"1": x} no deben coincidir: los pares se guardan con la clave etiquetada
+        pares = sorted(([_etiquetar_tipos(clave), _etiquetar_tipos(v)] for clave, v in valor.items()),
+                       key=lambda par: repr(par[0]))
+        return {"\x00dict": pares}
+    if isinstance(valor, tuple):
+        return {"\x00tuple": [_etiquetar_tipos(elemento) for elemento in valor]}
+    if isinstance(valor, (set, frozenset)):
+        return {"\x00set": sorted((_etiquetar_tipos(elemento) for elemento in valor), key=repr)}
+    if isinstance(valor, list):
+        return {f"\x00{type(valor).__name__}": [_etiquetar_tipos(elemento) for elemento in valor]}
+    return {f"\x00{type(valor).__name__}": repr(valor)}
+
+
+def _serializar_datos(datos: Any) -> bytes:
+    """Serialización canónica y con tipos etiquetados, hecha una sola vez para hash y tamaño"""
+    etiquetados = _etiquetar_tipos(datos)
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(etiquetados, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            # Enteros de más de 64 bits: los serializa json
+            pass
+    return json.dumps(etiquetados, sort_keys=True, ensure_ascii=False, 
+                      separators=(',', ':')).encode('utf-8')
+
+
+def _hash_bytes(serializado: bytes) -> str:
+    """Hash corto de unos datos ya serializados"""
+    return hashlib.blake2b(serializado, digest_size=8).hexdigest()
+
+
+def _hash_datos(datos: Any) -> str:
+    """Hash corto y estable de los datos, independiente del orden de inserción de las claves"""
+    return _hash_bytes(_serializar_datos(datos))
+
+
+def _asdict_plano(instancia: Any) -> dict[str, Any]:
+    """Equivalente a asdict para dataclasses de campos primitivos, sin copia profunda"""
+    return {campo.name: getattr(instancia, campo.name) for campo in fields(instancia)}
+
+
+def _clave_regla(regla: "ReglaValidacion", datos: dict[str, Any]) -> tuple:
+    """Clave de memoización de una regla: solo la porción de datos que evalúa y sus parámetros"""
+    if regla.campo_datos not in datos:
+        porcion = None
+    else:
+        valor = datos[regla.campo_datos]
+        # El tipo forma parte de la clave: las reglas distinguen listas de otras secuencias
+        porcion = (type(valor).__name__, _hash_datos(valor))
+    return regla.id, porcion, tuple(sorted(regla.parametros.items()))
+
 
 class TipoValidacion(Enum):
     """Tipos de validación disponibles"""
@@ -61,9 +191,10 @@ class ReglaValidacion:
     tipo: TipoValidacion
     nivel: NivelValidacion
     funcion_validacion: Callable
-    parametros: Dict[str, Any]
+    parametros: dict[str, Any]
     mensaje_error: str
     severidad: NivelSeveridad
+    campo_datos: Optional[str] = None  # clave de datos de la que depende; habilita la memoización
 
 
 @dataclass
@@ -87,19 +218,79 @@ class ResultadoValidacionCompleto:
     exito: bool
     resultado: ResultadoValidacion
     metricas: MetricasValidacion
-    detalles: Dict[str, Any]
-    timestamp: datetime
-    recursos_utilizados: Dict[str, Any]
+    detalles: dict[str, Any]
+    timestamp: int  # nanosegundos desde epoch
+    recursos_utilizados: dict[str, Any]
     error_mensaje: Optional[str]
 
+    def timestamp_dt(self) -> datetime:
+        """Obtener timestamp como datetime"""
+        return datetime.fromtimestamp(self.timestamp / 1e9)
+
+
+class _EstadisticasValidacion:
+    """Contadores de validación con acceso por atributo"""
+    __slots__ = ("validaciones_realizadas", "validaciones_exitosas",
+                 "tiempo_promedio_validacion", "cache_hits")
+
+    def __init__(self):
+        self.validaciones_realizadas = 0
+        self.validaciones_exitosas = 0
+        self.tiempo_promedio_validacion = 0.0
+        self.cache_hits = 0
+
+    def como_dict(self) -> dict[str, Any]:
+        """Convertir contadores a diccionario"""
+        return {campo: getattr(self, campo) for campo in self.__slots__}
+
+
+class _HistoricoMetricas:
+    """Histórico circular de métricas en columnas contiguas, preasignadas, una por campo"""
+    __slots__ = ("capacidad", "_columnas", "_cabeza", "_cantidad")
+
+    def __init__(self, capacidad: int):
+        self.capacidad = capacidad
+        self._columnas = {}
+        for campo, tipo in _TIPOS_COLUMNA_HISTORICO.items():
+            self._columnas[campo] = array(tipo, bytes(array(tipo).itemsize * capacidad))
+        self._cabeza = 0
+        self._cantidad = 0
+
+    def __len__(self) -> int:
+        return self._cantidad
+
+    def agregar(self, metricas: MetricasValidacion):
+        """Escribir las métricas en la posición de la cabeza, sobrescribiendo la más antigua"""
+        for columna, valor in zip(self._columnas.values(), _extraer_campos_promedio(metricas)):
+            columna[self._cabeza] = valor
+        self._cabeza = (self._cabeza + 1) % self.capacidad
+        if self._cantidad < self.capacidad:
+            self._cantidad += 1
+
+    def ultimas(self, cantidad: int) -> dict[str, array]:
+        """Columnas con las últimas métricas en orden cronológico (todas si la cantidad no es positiva)"""
+        if cantidad <= 0 or cantidad > self._cantidad:
+            cantidad = self._cantidad
+        inicio = (self._cabeza - cantidad) % self.capacidad
+        fin = inicio + cantidad
+        if fin <= self.capacidad:
+            return {campo: columna[inicio:fin] for campo, columna in self._columnas.items()}
+        fin -= self.capacidad
+        return {campo: columna[inicio:] + columna[:fin] for campo, columna in self._columnas.items()}
+
 
 class ValidadorSemantico:
     """Validador semántico avanzado"""
     
     def __init__(self):
         self.logger = obtener_sistema_logging().obtener_sistema_logger()
-        self.reglas_semanticas: Dict[str, ReglaValidacion] = {}
+        self.reglas_semanticas: dict[str, ReglaValidacion] = {}
+        self._resultados_reglas: "OrderedDict[tuple, tuple[bool, str]]" = OrderedDict()
+        self._lock_resultados = threading.Lock()
         self._inicializar_reglas_semanticas()
+        # Las reglas son independientes entre sí: se evalúan en paralelo
+        self._pool = ThreadPoolExecutor(max_workers=min(8, len(self.reglas_semanticas)),
+                                        thread_name_prefix="reglas_semanticas")
     
     def _inicializar_reglas_semanticas(self):
         """Inicializar reglas semánticas predeterminadas"""
@@ -113,7 +304,8 @@ class ValidadorSemantico:
             funcion_validacion=self._validar_coherencia_entidades,
             parametros={"umbral_similitud": 0.8},
             mensaje_error="Incoherencia detectada entre entidades relacionadas",
-            severidad=NivelSeveridad.WARNING
+            severidad=NivelSeveridad.WARNING,
+            campo_datos="entidades"
         )
         
         # Regla para validar contexto narrativo
@@ -126,7 +318,8 @@ class ValidadorSemantico:
             funcion_validacion=self._validar_contexto_narrativo,
             parametros={"max_desviacion": 0.3},
             mensaje_error="Desviación significativa en contexto narrativo",
-            severidad=NivelSeveridad.WARNING
+            severidad=NivelSeveridad.WARNING,
+            campo_datos="contexto"
         )
         
         # Regla para validar consistencia temporal
@@ -139,14 +332,15 @@ class ValidadorSemantico:
             funcion_validacion=self._validar_consistencia_temporal,
             parametros={"max_salto_temporal": 3600},  # segundos
             mensaje_error="Inconsistencia temporal detectada",
-            severidad=NivelSeveridad.ERROR
+            severidad=NivelSeveridad.ERROR,
+            campo_datos="timestamps"
         )
         
         self.reglas_semanticas[regla_entidades.id] = regla_entidades
         self.reglas_semanticas[regla_contexto.id] = regla_contexto
         self.reglas_semanticas[regla_temporal.id] = regla_temporal
     
-    def _validar_coherencia_entidades(self, datos: Dict[str, Any], parametros: Dict[str, Any]) -> Tuple[bool, str]:
+    def _validar_coherencia_entidades(self, datos: dict[str, Any], parametros: dict[str, Any]) -> tuple[bool, str]:
         """Validar coherencia semántica entre entidades"""
         try:
             # Implementación simplificada de validación de coherencia
@@ -167,7 +361,7 @@ class ValidadorSemantico:
         except Exception as e:
             return False, f"Error en validación de coherencia: {e}"
     
-    def _validar_contexto_narrativo(self, datos: Dict[str, Any], parametros: Dict[str, Any]) -> Tuple[bool, str]:
+    def _validar_contexto_narrativo(self, datos: dict[str, Any], parametros: dict[str, Any]) -> tuple[bool, str]:
         """Validar contexto narrativo"""
         try:
             max_desviacion = parametros.get("max_desviacion", 0.3)
@@ -185,7 +379,7 @@ class ValidadorSemantico:
         except Exception as e:
             return False, f"Error en validación de contexto: {e}"
     
-    def _validar_consistencia_temporal(self, datos: Dict[str, Any], parametros: Dict[str, Any]) -> Tuple[bool, str]:
+    def _validar_consistencia_temporal(self, datos: dict[str, Any], parametros: dict[str, Any]) -> tuple[bool, str]:
         """Validar consistencia temporal"""
         try:
             max_salto = parametros.get("max_salto_temporal", 3600)
@@ -193,10 +387,9 @@ class ValidadorSemantico:
             # Simular validación temporal
             if "timestamps" in datos and isinstance(datos["timestamps"], list):
                 if len(datos["timestamps"]) > 1:
-                    # Verificar saltos temporales
-                    saltos = [abs(datos["timestamps"][i] - datos["timestamps"][i-1]) 
-                             for i in range(1, len(datos["timestamps"]))]
-                    max_salto_detectado = max(saltos) if saltos else 0
+                    # Verificar saltos temporales (map encadenado: el bucle corre en C, sin lista intermedia)
+                    timestamps = datos["timestamps"]
+                    max_salto_detectado = max(map(abs, map(operator.sub, islice(timestamps, 1, None), timestamps)))
                     
                     if max_salto_detectado <= max_salto:
                         return True, f"Consistencia temporal correcta (max salto: {max_salto_detectado}s)"
@@ -207,19 +400,40 @@ class ValidadorSemantico:
         except Exception as e:
             return False, f"Error en validación temporal: {e}"
     
-    def validar_semanticamente(self, datos: Dict[str, Any]) -> Dict[str, Tuple[bool, str]]:
+    def validar_semanticamente(self, datos: dict[str, Any]) -> dict[str, tuple[bool, str]]:
         """Validar datos semánticamente usando todas las reglas"""
-        resultados = {}
-        
-        for regla_id, regla in self.reglas_semanticas.items():
-            try:
-                resultado = regla.funcion_validacion(datos, regla.parametros)
-                resultados[regla_id] = resultado
-            except Exception as e:
-                resultados[regla_id] = (False, f"Error ejecutando regla {regla_id}: {e}")
-                self.logger.log(NivelSeveridad.ERROR, f"Error en regla {regla_id}: {e}")
-        
-        return resultados
+        # Se recorre el diccionario en cada llamada: las reglas añadidas o quitadas después cuentan
+        futuros = {regla_id: self._pool.submit(self._evaluar_regla, regla, datos)
+                   for regla_id, regla in list(self.reglas_semanticas.items())}
+        return {regla_id: futuro.result() for regla_id, futuro in futuros.items()}
+    
+    def _evaluar_regla(self, regla: ReglaValidacion, datos: dict[str, Any]) -> tuple[bool, str]:
+        """Evaluar una regla convirtiendo cualquier excepción en resultado fallido"""
+        try:
+            return self._ejecutar_regla(regla, datos)
+        except Exception as e:
+            self.logger.log(NivelSeveridad.ERROR, f"Error en regla {regla.id}: {e}")
+            return False, f"Error ejecutando regla {regla.id}: {e}"
+    
+    def _ejecutar_regla(self, regla: ReglaValidacion, datos: dict[str, Any]) -> tuple[bool, str]:
+        """Ejecutar una regla, reutilizando el resultado si su porción de datos ya se evaluó"""
+        if regla.campo_datos is None:
+            return regla.funcion_validacion(datos, regla.parametros)
+        
+        clave = _clave_regla(regla, datos)
+        with self._lock_resultados:
+            resultado = self._resultados_reglas.get(clave)
+            if resultado is not None:
+                self._resultados_reglas.move_to_end(clave)
+                return resultado
+        
+        resultado = regla.funcion_validacion(datos, regla.parametros)
+        with self._lock_resultados:
+            self._resultados_reglas[clave] = resultado
+            self._resultados_reglas.move_to_end(clave)
+            if len(self._resultados_reglas) > _MAX_RESULTADOS_REGLA:
+                self._resultados_reglas.popitem(last=False)
+        return resultado
 
 
 class SistemaTestingAutomatizado:
@@ -227,9 +441,13 @@ class SistemaTestingAutomatizado:
     
     def __init__(self):
         self.logger = obtener_sistema_logging().obtener_sistema_logger()
-        self.test_suites: Dict[str, Callable] = {}
-        self.resultados_historicos: List[Dict[str, Any]] = []
+        self.test_suites: dict[str, Callable] = {}
+        # Histórico acotado: deque descarta el más antiguo en O(1) al llenarse
+        self.resultados_historicos: deque = deque(maxlen=100)
         self._inicializar_test_suites()
+        # Las suites son independientes y pasan casi todo su tiempo esperando: se ejecutan en paralelo
+        self._pool = ThreadPoolExecutor(max_workers=min(8, len(self.test_suites)),
+                                        thread_name_prefix="test_suites")
     
     def _inicializar_test_suites(self):
         """Inicializar suites de prueba predeterminadas"""
@@ -237,7 +455,7 @@ class SistemaTestingAutomatizado:
         self.test_suites["validacion_semantica"] = self._test_validacion_semantica
         self.test_suites["rendimiento"] = self._test_rendimiento
     
-    def _test_validacion_basica(self) -> Dict[str, Any]:
+    def _test_validacion_basica(self) -> dict[str, Any]:
         """Test básico de validación"""
         inicio = time.time()
         
@@ -259,7 +477,7 @@ class SistemaTestingAutomatizado:
             "resultado": "Test básico pasado"
         }
     
-    def _test_validacion_semantica(self) -> Dict[str, Any]:
+    def _test_validacion_semantica(self) -> dict[str, Any]:
         """Test de validación semántica"""
         inicio = time.time()
         
@@ -281,7 +499,7 @@ class SistemaTestingAutomatizado:
             "resultado": "Validación semántica completada"
         }
     
-    def _test_rendimiento(self) -> Dict[str, Any]:
+    def _test_rendimiento(self) -> dict[str, Any]:
         """Test de rendimiento"""
         inicio = time.time()
         
@@ -303,13 +521,15 @@ class SistemaTestingAutomatizado:
             "rendimiento": "aceptable" if tiempo_por_item < 0.01 else "lento"
         }
     
-    def ejecutar_todos_tests(self) -> Dict[str, Dict[str, Any]]:
+    def ejecutar_todos_tests(self) -> dict[str, dict[str, Any]]:
         """Ejecutar todas las suites de prueba"""
         resultados = {}
+        futuros = [(nombre_suite, self._pool.submit(suite_func)) 
+                   for nombre_suite, suite_func in self.test_suites.items()]
         
-        for nombre_suite, suite_func in self.test_suites.items():
+        for nombre_suite, futuro in futuros:
             try:
-                resultado = suite_func()
+                resultado = futuro.result()
                 resultados[nombre_suite] = resultado
                 self.logger.log(NivelSeveridad.INFO, f"Test suite '{nombre_suite}' ejecutado: {resultado.get('exito', False)}")
             except Exception as e:
@@ -326,20 +546,16 @@ class SistemaTestingAutomatizado:
             "resultados": resultados
         })
         
-        # Mantener solo los últimos 100 resultados
-        if len(self.resultados_historicos) > 100:
-            self.resultados_historicos.pop(0)
-        
         return resultados
     
-    def obtener_estadisticas_tests(self) -> Dict[str, Any]:
+    def obtener_estadisticas_tests(self) -> dict[str, Any]:
         """Obtener estadísticas de los tests ejecutados"""
         if not self.resultados_historicos:
             return {"mensaje": "No hay resultados históricos"}
         
         # Calcular estadísticas
         total_ejecuciones = len(self.resultados_historicos)
-        ultimos_resultados = self.resultados_historicos[-10:]  # Últimos 10 resultados
+        ultimos_resultados = _ultimos(self.resultados_historicos, 10)  # Últimos 10 resultados
         
         # Calcular tasas de éxito
         exitos_por_suite = {}
@@ -380,28 +596,33 @@ class SistemaMetricasCalidad:
     
     def __init__(self):
         self.logger = obtener_sistema_logging().obtener_sistema_logger()
-        self.metricas_historicas: List[MetricasValidacion] = []
+        # Histórico acotado a las últimas métricas, almacenado por columnas
+        self.metricas_historicas = _HistoricoMetricas(_CAPACIDAD_HISTORICO_METRICAS)
         self.cache = obtener_cache_multinivel()
     
-    def calcular_metricas(self, resultados_validacion: Dict[str, Tuple[bool, str]], 
+    def calcular_metricas(self, resultados_validacion: dict[str, tuple[bool, str]], 
                          tiempo_ejecucion: float) -> MetricasValidacion:
         """Calcular métricas de calidad a partir de resultados de validación"""
         try:
-            # Contar resultados
+            # Contar resultados, advertencias y errores en una sola pasada
             total_reglas = len(resultados_validacion)
-            reglas_pasadas = sum(1 for resultado in resultados_validacion.values() if resultado[0])
+            reglas_pasadas = advertencias = errores = 0
+            for paso, mensaje in resultados_validacion.values():
+                if paso:
+                    reglas_pasadas += 1
+                severidades = {_SEVERIDAD_POR_PALABRA[palabra.lower()]
+                               for palabra in _PATRON_SEVERIDAD.findall(mensaje)}
+                if "advertencia" in severidades:
+                    advertencias += 1
+                if "error" in severidades:
+                    errores += 1
             reglas_fallidas = total_reglas - reglas_pasadas
             
-            # Contar advertencias y errores (simulación)
-            advertencias = sum(1 for resultado in resultados_validacion.values() 
-                             if "advertencia" in resultado[1].lower())
-            errores = sum(1 for resultado in resultados_validacion.values() 
-                        if "error" in resultado[1].lower())
-            
             # Calcular métricas derivadas
             precision = reglas_pasadas / total_reglas if total_reglas > 0 else 0
             recall = precision  # En este contexto simplificado
-            f1_score = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
+            # recall es la propia precisión, así que su media armónica también lo es (incluso si son 0)
+            f1_score = precision
             cobertura = total_reglas / max(total_reglas, 1)  # Siempre 1 en este caso
             
             metricas = MetricasValidacion(
@@ -418,14 +639,10 @@ class SistemaMetricasCalidad:
             )
             
             # Guardar en histórico
-            self.metricas_historicas.append(metricas)
-            
-            # Mantener solo las últimas 1000 métricas
-            if len(self.metricas_historicas) > 1000:
-                self.metricas_historicas.pop(0)
+            self.metricas_historicas.agregar(metricas)
             
             # Guardar en cache
-            cache_key = f"metricas_{hash(str(resultados_validacion))}"
+            cache_key = _clave_metricas(resultados_validacion, advertencias, errores)
             self.cache.put(cache_key, metricas, TipoDato.JSON, tiempo_ejecucion)
             
             return metricas
@@ -446,42 +663,30 @@ class SistemaMetricasCalidad:
                 cobertura=0.0
             )
     
-    def obtener_tendencias(self, ventana: int = 100) -> Dict[str, Any]:
+    def obtener_tendencias(self, ventana: int = 100) -> dict[str, Any]:
         """Obtener tendencias de calidad recientes"""
         if not self.metricas_historicas:
             return {"mensaje": "No hay métricas históricas"}
         
-        # Tomar las últimas métricas según la ventana
-        metricas_recientes = self.metricas_historicas[-ventana:]
+        # Tomar las últimas métricas según la ventana, ya separadas por columnas
+        columnas = self.metricas_historicas.ultimas(ventana)
+        total_metricas = len(columnas["precision"])
         
-        if not metricas_recientes:
+        if not total_metricas:
             return {"mensaje": "No hay métricas recientes"}
         
-        # Calcular promedios
-        promedios = {
-            "tiempo_ejecucion": sum(m.tiempo_ejecucion for m in metricas_recientes) / len(metricas_recientes),
-            "precision": sum(m.precision for m in metricas_recientes) / len(metricas_recientes),
-            "recall": sum(m.recall for m in metricas_recientes) / len(metricas_recientes),
-            "f1_score": sum(m.f1_score for m in metricas_recientes) / len(metricas_recientes),
-            "reglas_evaluadas": sum(m.reglas_evaluadas for m in metricas_recientes) / len(metricas_recientes),
-            "reglas_pasadas": sum(m.reglas_pasadas for m in metricas_recientes) / len(metricas_recientes),
-            "errores": sum(m.errores for m in metricas_recientes) / len(metricas_recientes),
-            "advertencias": sum(m.advertencias for m in metricas_recientes) / len(metricas_recientes)
-        }
+        promedios = _medias_por_columna(columnas, 0, total_metricas)
         
         # Calcular tendencias (último cuarto vs primer cuarto)
-        if len(metricas_recientes) >= 4:
-            cuarto_tamano = len(metricas_recientes) // 4
-            primer_cuarto = metricas_recientes[:cuarto_tamano]
-            ultimo_cuarto = metricas_recientes[-cuarto_tamano:]
+        if total_metricas >= 4:
+            cuarto_tamano = total_metricas // 4
+            medias_primer = _medias_por_columna(columnas, 0, cuarto_tamano)
+            medias_ultimo = _medias_por_columna(columnas, total_metricas - cuarto_tamano, total_metricas)
             
             tendencias = {}
-            for metrica_nombre in ["precision", "recall", "f1_score", "errores", "advertencias"]:
-                valores_primer = [getattr(m, metrica_nombre) for m in primer_cuarto]
-                valores_ultimo = [getattr(m, metrica_nombre) for m in ultimo_cuarto]
-                
-                promedio_primer = sum(valores_primer) / len(valores_primer) if valores_primer else 0
-                promedio_ultimo = sum(valores_ultimo) / len(valores_ultimo) if valores_ultimo else 0
+            for metrica_nombre in _CAMPOS_TENDENCIA:
+                promedio_primer = medias_primer[metrica_nombre]
+                promedio_ultimo = medias_ultimo[metrica_nombre]
                 
                 # Calcular cambio porcentual
                 if promedio_primer > 0:
@@ -499,13 +704,13 @@ class SistemaMetricasCalidad:
             return {
                 "promedios": promedios,
                 "tendencias": tendencias,
-                "total_metricas": len(metricas_recientes)
+                "total_metricas": total_metricas
             }
         
         return {
             "promedios": promedios,
             "mensaje": "Insuficientes datos para calcular tendencias",
-            "total_metricas": len(metricas_recientes)
+            "total_metricas": total_metricas
         }
 
 
@@ -524,30 +729,27 @@ class ValidadorUniversal:
         self.cache = obtener_cache_multinivel(self.ruta_cache.parent)
         
         # Estado del sistema
-        self.estadisticas = {
-            "validaciones_realizadas": 0,
-            "validaciones_exitosas": 0,
-            "tiempo_promedio_validacion": 0.0,
-            "cache_hits": 0
-        }
+        self._estadisticas = _EstadisticasValidacion()
         
         self.logger.log(NivelSeveridad.INFO, "🚀 ValidadorUniversal inicializado")
     
-    def validar_datos(self, datos: Dict[str, Any], 
-                    tipos_validacion: List[TipoValidacion] = None,
+    def validar_datos(self, datos: dict[str, Any], 
+                    tipos_validacion: list[TipoValidacion] = None,
                     nivel: NivelValidacion = NivelValidacion.INTERMEDIO) -> ResultadoValidacionCompleto:
         """Validar datos usando múltiples tipos de validación"""
         inicio_validacion = time.time()
+        datos_serializados = b""
         
         try:
-            # Generar hash para cache
-            datos_hash = hashlib.md5(str(datos).encode()).hexdigest()
+            # Serializar una sola vez: el mismo buffer da el hash de cache y el tamaño de los datos
+            datos_serializados = _serializar_datos(datos)
+            datos_hash = _hash_bytes(datos_serializados)
             cache_key = f"validacion_{datos_hash}_{nivel.value}"
             
-            # Verificar cache
-            resultado_cached = self.cache.get(cache_key)
-            if resultado_cached and isinstance(resultado_cached, ResultadoValidacionCompleto):
-                self.estadisticas["cache_hits"] += 1
+            # Verificar cache (bajo este prefijo solo se guardan ResultadoValidacionCompleto)
+            resultado_cached = self.cache.peek(cache_key)
+            if resultado_cached is not None:
+                self._estadisticas.cache_hits += 1
                 self.logger.log(NivelSeveridad.DEBUG, f"Resultado de validación desde cache: {cache_key}")
                 return resultado_cached
             
@@ -582,7 +784,7 @@ class ValidadorUniversal:
             # Preparar detalles
             detalles = {
                 "resultados_individuales": resultados_validacion,
-                "metricas_detalles": asdict(metricas)
+                "metricas_detalles": _asdict_plano(metricas)
             }
             
             # Crear resultado completo
@@ -591,8 +793,8 @@ class ValidadorUniversal:
                 resultado=resultado_general,
                 metricas=metricas,
                 detalles=detalles,
-                timestamp=datetime.now(),
-                recursos_utilizados={"datos_tamano": len(str(datos))},
+                timestamp=time.time_ns(),
+                recursos_utilizados={"datos_tamano": len(datos_serializados)},
                 error_mensaje=None
             )
             
@@ -600,9 +802,9 @@ class ValidadorUniversal:
             self.cache.put(cache_key, resultado, TipoDato.JSON, tiempo_total)
             
             # Actualizar estadísticas
-            self.estadisticas["validaciones_realizadas"] += 1
+            self._estadisticas.validaciones_realizadas += 1
             if exito_general:
-                self.estadisticas["validaciones_exitosas"] += 1
+                self._estadisticas.validaciones_exitosas += 1
             self._actualizar_tiempo_promedio(tiempo_total)
             
             self.logger.log(NivelSeveridad.INFO, 
@@ -634,34 +836,34 @@ class ValidadorUniversal:
                 resultado=ResultadoValidacion.ERROR,
                 metricas=metricas_error,
                 detalles={"error": str(e)},
-                timestamp=datetime.now(),
-                recursos_utilizados={"datos_tamano": len(str(datos)) if 'datos' in locals() else 0},
+                timestamp=time.time_ns(),
+                recursos_utilizados={"datos_tamano": len(datos_serializados)},
                 error_mensaje=error_msg
             )
     
     def _actualizar_tiempo_promedio(self, tiempo_validacion: float):
         """Actualizar tiempo promedio de validación"""
-        total = self.estadisticas["validaciones_realizadas"]
+        estadisticas = self._estadisticas
+        total = estadisticas.validaciones_realizadas
         if total > 0:
-            self.estadisticas["tiempo_promedio_validacion"] = (
-                (self.estadisticas["tiempo_promedio_validacion"] * (total - 1) + tiempo_validacion) / total
-            )
+            promedio = estadisticas.tiempo_promedio_validacion
+            estadisticas.tiempo_promedio_validacion = promedio + (tiempo_validacion - promedio) / total
     
-    def ejecutar_tests_automaticos(self) -> Dict[str, Dict[str, Any]]:
+    def ejecutar_tests_automaticos(self) -> dict[str, dict[str, Any]]:
         """Ejecutar suite de tests automatizados"""
         return self.sistema_testing.ejecutar_todos_tests()
     
-    def obtener_estadisticas(self) -> Dict[str, Any]:
+    def obtener_estadisticas(self) -> dict[str, Any]:
         """Obtener estadísticas del sistema"""
-        estadisticas_base = self.estadisticas.copy()
+        estadisticas_base = self._estadisticas.como_dict()
         estadisticas_base["tests"] = self.sistema_testing.obtener_estadisticas_tests()
         return estadisticas_base
     
-    def obtener_tendencias_calidad(self, ventana: int = 100) -> Dict[str, Any]:
+    def obtener_tendencias_calidad(self, ventana: int = 100) -> dict[str, Any]:
         """Obtener tendencias de calidad"""
         return self.sistema_metricas.obtener_tendencias(ventana)
     
-    def probar_sistema(self) -> Dict[str, Any]:
+    def probar_sistema(self) -> dict[str, Any]:
         """Prueba integral del sistema"""
         resultados = {
             "sistema_inicializado": True,
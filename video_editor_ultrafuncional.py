@@ -15,19 +15,187 @@ import os
 import time
 import json
 import hashlib
+import mmap
 import subprocess
 import threading
-from typing import Dict, List, Optional, Tuple, Any, Union
+import itertools
+import functools
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Any, Union, Callable
+from collections import OrderedDict
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
 from enum import Enum
 import tempfile
 import shutil
+import atexit
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import av
+    PYAV_AVAILABLE = True
+except ImportError:
+    PYAV_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from sistema_logging_monitoreo import obtener_sistema_logging, NivelSeveridad
 from cache_lru_multinivel import obtener_cache_multinivel, TipoDato
 
+# Resultado de la verificación de dependencias, compartido por todas las instancias del proceso
+_DEPS_CACHE: Optional[Dict[str, bool]] = None
+_DEPS_LOCK = threading.Lock()
+
+def _cache_key(*partes: Any) -> str:
+    """Hash corto de las partes de una clave de cache (64 bits bastan para un cache local)"""
+    return hashlib.blake2b("\x1f".join(map(str, partes)).encode('utf-8'), digest_size=8).hexdigest()
+
+
+# FFmpeg sin banner ni log de progreso: en stderr solo quedan los errores
+_FFMPEG_QUIET = ('-hide_banner', '-loglevel', 'error')
+
+# tmpfs de Linux: los placeholders intermedios se escriben en memoria y no en disco
+_DIRECTORIO_MEMORIA = Path('/dev/shm')
+
+
+# Espacio libre que debe quedar en el tmpfs para escribir allí un placeholder más
+# (el /dev/shm por defecto de Docker es de solo 64 MB)
+_RESERVA_LIBRE_MEMORIA = 128 * 1024 * 1024
+# Tamaño máximo del conjunto de placeholders de un generador; al superarlo se borran los menos usados
+_MAX_BYTES_PLACEHOLDERS = 512 * 1024 * 1024
+
+
+def _memoria_con_espacio(directorio: Path) -> bool:
+    """Si el tmpfs que contiene el directorio aún tiene la reserva libre"""
+    try:
+        return shutil.disk_usage(directorio).free >= _RESERVA_LIBRE_MEMORIA
+    except OSError:
+        return False
+
+
+def _directorio_intermedios() -> Optional[Path]:
+    """tmpfs para archivos intermedios si existe, es escribible y tiene espacio (None si no)"""
+    if (_DIRECTORIO_MEMORIA.is_dir() and os.access(_DIRECTORIO_MEMORIA, os.W_OK | os.X_OK)
+            and _memoria_con_espacio(_DIRECTORIO_MEMORIA)):
+        return _DIRECTORIO_MEMORIA
+    return None
+
+
+@functools.lru_cache(maxsize=512)
+def _probe(path_str: str, size: int, mtime_ns: int) -> bytes:
+    """Salida JSON de ffprobe (formato y streams); tamaño y mtime_ns invalidan la entrada si el archivo cambia"""
+    return subprocess.check_output(
+        ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams', path_str],
+        stderr=subprocess.DEVNULL, timeout=30
+    )
+
+
+def _probe_json(video_path: Path) -> Dict[str, Any]:
+    """Información de ffprobe de un video, sondeando solo si el archivo cambió desde el último sondeo"""
+    estado = video_path.stat()
+    raw = _probe(str(video_path), estado.st_size, estado.st_mtime_ns)
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+# Muestreo de frames para la validación profunda: un frame cada 2 s, como máximo 64 frames
+_SEGUNDOS_ENTRE_MUESTRAS = 2
+_MAX_FRAMES_MUESTREADOS = 64
+# Varianza de luminancia media por debajo de la cual el video se considera un fondo plano
+_UMBRAL_VARIANZA_PLANA = 4.0
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _frame_stats(frames):
+        """Media y varianza de luminancia de cada frame (frames: n × alto × ancho, uint8)"""
+        n, alto, ancho = frames.shape
+        medias = np.empty(n)
+        varianzas = np.empty(n)
+        pixeles = alto * ancho
+        for i in prange(n):
+            suma = 0.0
+            suma_cuadrados = 0.0
+            for y in range(alto):
+                for x in range(ancho):
+                    valor = float(frames[i, y, x])
+                    suma += valor
+                    suma_cuadrados += valor * valor
+            media = suma / pixeles
+            medias[i] = media
+            varianzas[i] = suma_cuadrados / pixeles - media * media
+        return medias, varianzas
+elif NUMPY_AVAILABLE:
+    def _frame_stats(frames):
+        """Media y varianza de luminancia de cada frame (frames: n × alto × ancho, uint8)"""
+        planos = frames.reshape(frames.shape[0], -1).astype(np.float64)
+        return planos.mean(axis=1), planos.var(axis=1)
+
+
+def _videos_faltantes(videos: List[Path]) -> List[Path]:
+    """Videos que no existen, conservando el orden; con un directorio común basta un único scandir"""
+    directorios = {os.path.dirname(os.path.abspath(os.fspath(video))) for video in videos}
+    if len(videos) > 1 and len(directorios) == 1:
+        try:
+            with os.scandir(directorios.pop()) as entradas:
+                nombres = {entrada.name for entrada in entradas}
+            return [video for video in videos if os.path.basename(os.fspath(video)) not in nombres]
+        except OSError:
+            pass
+    return [video for video in videos if not video.exists()]
+
+
+def _exigir_existentes(videos: List[Path]):
+    """Fallar si falta algún video de entrada: omitirlo daría un resultado con segmentos perdidos"""
+    faltantes = _videos_faltantes(videos)
+    if faltantes:
+        raise FileNotFoundError(f"Videos de entrada no encontrados: {', '.join(map(str, faltantes))}")
+
+
+# Encoders H.264 por hardware en orden de preferencia; libx264 es el último recurso
+_ENCODERS_H264_HARDWARE = ("h264_nvenc", "h264_qsv", "h264_vaapi", "h264_videotoolbox")
+_ENCODER_H264_SOFTWARE = "libx264"
+# VAAPI necesita dispositivo explícito y subir los frames a la GPU al final del grafo
+_DISPOSITIVO_VAAPI = "/dev/dri/renderD128"
+
+
+def _args_entrada_encoder(encoder: str) -> List[str]:
+    """Argumentos globales previos a las entradas que requiere el encoder"""
+    if encoder == "h264_vaapi":
+        return ['-vaapi_device', _DISPOSITIVO_VAAPI]
+    return []
+
+
+def _sufijo_filtro_encoder(encoder: str) -> str:
+    """Filtros a añadir al final del grafo para entregar frames al encoder"""
+    if encoder == "h264_vaapi":
+        return "format=nv12,hwupload"
+    return "format=yuv420p"
+
+
+# Control de calidad propio de cada encoder por hardware (libx264 usa preset e hilos del procesador)
+_ARGS_CALIDAD_ENCODER = {
+    "h264_nvenc": ['-preset', 'p4', '-rc', 'vbr', '-cq', '23'],
+    "h264_qsv": ['-global_quality', '23'],
+    "h264_vaapi": [],
+    "h264_videotoolbox": ['-allow_sw', '1'],
+}
+
 
 class TipoVideo(Enum):
     """Tipos de video disponibles"""
@@ -81,6 +249,7 @@ class MetricasVideo:
     codec_audio: str
     checksum: str
     calidad_estimada: CalidadVideo
+    estadisticas_frames: Optional[Dict[str, float]] = None
 
 
 @dataclass
@@ -102,7 +271,16 @@ class VerificadorDependenciasVideo:
         self.dependencias_verificadas = {}
     
     def verificar_todas_dependencias(self) -> Dict[str, bool]:
-        """Verificar todas las dependencias de video"""
+        """Verificar todas las dependencias de video (una sola vez por proceso)"""
+        global _DEPS_CACHE
+        with _DEPS_LOCK:
+            if _DEPS_CACHE is None:
+                _DEPS_CACHE = self._verificar_dependencias_sin_cache()
+            self.dependencias_verificadas.update(_DEPS_CACHE)
+            return dict(_DEPS_CACHE)
+    
+    def _verificar_dependencias_sin_cache(self) -> Dict[str, bool]:
+        """Ejecutar la verificación de cada dependencia"""
         self.logger.log(NivelSeveridad.INFO, "🔍 Iniciando verificación de dependencias de video...")
         
         dependencias = {
@@ -118,7 +296,6 @@ class VerificadorDependenciasVideo:
             try:
                 disponible = verificador()
                 resultados[nombre] = disponible
-                self.dependencias_verificadas[nombre] = disponible
                 if disponible:
                     self.logger.log(NivelSeveridad.INFO, f"✅ {nombre} disponible")
                 else:
@@ -131,6 +308,9 @@ class VerificadorDependenciasVideo:
     
     def _verificar_ffmpeg(self) -> bool:
         """Verificar disponibilidad de FFmpeg"""
+        # shutil.which solo consulta el sistema de archivos: evita lanzar un proceso
+        if shutil.which('ffmpeg'):
+            return True
         try:
             result = subprocess.run(['ffmpeg', '-version'], 
                                   capture_output=True, text=True, timeout=10)
@@ -140,6 +320,8 @@ class VerificadorDependenciasVideo:
     
     def _verificar_ffprobe(self) -> bool:
         """Verificar disponibilidad de FFprobe"""
+        if shutil.which('ffprobe'):
+            return True
         try:
             result = subprocess.run(['ffprobe', '-version'], 
                                   capture_output=True, text=True, timeout=10)
@@ -194,170 +376,403 @@ class VerificadorDependenciasVideo:
         return versiones
 
 
+# Salidas por invocación de FFmpeg al renderizar placeholders de texto en lote: cada salida es
+# un encoder libx264 a 1080p dentro del mismo proceso
+_MAX_SALIDAS_LOTE_TEXTO = 8
+
+
+def _nucleos_disponibles() -> List[int]:
+    """Núcleos en los que puede ejecutarse el proceso (respeta cpusets de contenedores)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class _RepartoNucleos:
+    """Reparto de los núcleos disponibles entre los FFmpeg de un mismo lote"""
+    
+    def __init__(self, concurrencia: int = 1):
+        self.nucleos = _nucleos_disponibles()
+        self.concurrencia = max(1, concurrencia)
+        self.hilos = max(1, len(self.nucleos) // self.concurrencia)
+        self._turno = itertools.count()
+    
+    def siguientes_nucleos(self) -> Optional[set]:
+        """Núcleos para el siguiente FFmpeg, en turnos rotativos (None si no hay que fijar afinidad)"""
+        if self.concurrencia <= 1 or not hasattr(os, 'sched_setaffinity'):
+            return None
+        inicio = (next(self._turno) % self.concurrencia) * self.hilos
+        return {self.nucleos[(inicio + k) % len(self.nucleos)] for k in range(self.hilos)}
+
+
 class GeneradorPlaceholders:
     """Generador inteligente de placeholders de video"""
     
-    def __init__(self):
+    # Partes constantes de los comandos de placeholders de texto: por llamada solo se añade lo variable
+    _BASE_CMD_TEXT = ('ffmpeg', *_FFMPEG_QUIET, '-y')
+    _ARGS_CODIFICACION_TEXTO = ('-preset', 'ultrafast', '-tune', 'zerolatency', '-c:v', 'libx264')
+    # drawtext lee el texto de un archivo: sin escapes de comillas, dos puntos ni barras en el texto
+    _FILTRO_TEXTO = ("drawtext=textfile='{}':expansion=none:"
+                     "fontcolor=white:fontsize=48:x=(w-tw)/2:y=(h-th)/2")
+    
+    def __init__(self, concurrencia: int = 1):
         self.logger = obtener_sistema_logging().obtener_sistema_logger()
         self.cache = obtener_cache_multinivel()
+        # Reparto de las llamadas sueltas; los lotes pasan el suyo propio
+        self._reparto = _RepartoNucleos(concurrencia)
+        # Directorios propios con nombres derivados del hash: dos peticiones iguales comparten archivo.
+        # En Linux se usa /dev/shm mientras tenga espacio, así la concatenación relee desde memoria;
+        # el directorio en disco recibe lo que no cabe y los fallbacks
+        prefijo = f'vn_ph_{os.getpid()}_'
+        self._tmpdir = Path(tempfile.mkdtemp(prefix=prefijo))
+        atexit.register(shutil.rmtree, self._tmpdir, ignore_errors=True)
+        base_memoria = _directorio_intermedios()
+        self._tmpdir_memoria = Path(tempfile.mkdtemp(prefix=prefijo, dir=base_memoria)) if base_memoria else None
+        if self._tmpdir_memoria:
+            atexit.register(shutil.rmtree, self._tmpdir_memoria, ignore_errors=True)
+        # Placeholders publicados, del menos al más recientemente usado, con su tamaño
+        self._placeholders: "OrderedDict[Path, int]" = OrderedDict()
+        self._bytes_placeholders = 0
+        self._lock_placeholders = threading.Lock()
+        # Lotes en curso: mientras haya alguno no se borra nada, sus placeholders aún no se han combinado
+        self._lotes_activos = 0
+    
+    def repartir_nucleos(self, concurrencia: int) -> _RepartoNucleos:
+        """Reparto de núcleos para un lote de placeholders que se generarán a la vez"""
+        return _RepartoNucleos(concurrencia)
+    
+    def _ejecutar_ffmpeg(self, cmd: List[str], timeout: float, 
+                         reparto: _RepartoNucleos) -> subprocess.CompletedProcess:
+        """Ejecutar FFmpeg fijando su afinidad de CPU desde el proceso padre"""
+        # preexec_fn no es seguro con hilos: la afinidad se aplica al pid ya lanzado
+        nucleos = reparto.siguientes_nucleos()
+        with subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True) as proceso:
+            if nucleos:
+                try:
+                    os.sched_setaffinity(proceso.pid, nucleos)
+                except OSError:
+                    pass
+            try:
+                _, stderr = proceso.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                proceso.kill()
+                proceso.communicate()
+                raise
+        return subprocess.CompletedProcess(cmd, proceso.returncode, None, stderr)
+    
+    @staticmethod
+    def _escribir_texto_temporal(texto: str) -> Path:
+        """Escribir el texto del placeholder en un archivo temporal para drawtext"""
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8') as archivo:
+            archivo.write(texto)
+            return Path(archivo.name)
+    
+    @staticmethod
+    def _ruta_parcial(ruta: Path) -> Path:
+        """Ruta donde renderiza cada hilo antes de publicar el archivo final con os.replace"""
+        return ruta.with_name(f"{ruta.stem}.{threading.get_ident()}.part{ruta.suffix}")
+    
+    def _buscar_placeholder(self, nombre: str) -> Optional[Path]:
+        """Placeholder ya renderizado por este generador, en memoria o en disco"""
+        for directorio in (self._tmpdir_memoria, self._tmpdir):
+            if directorio is None:
+                continue
+            ruta = directorio / nombre
+            if ruta.exists():
+                with self._lock_placeholders:
+                    if ruta in self._placeholders:
+                        self._placeholders.move_to_end(ruta)
+                return ruta
+        return None
+    
+    def _destino_placeholder(self, nombre: str) -> Path:
+        """Ruta donde renderizar un placeholder nuevo: tmpfs mientras quede la reserva, si no disco"""
+        if self._tmpdir_memoria and _memoria_con_espacio(self._tmpdir_memoria):
+            return self._tmpdir_memoria / nombre
+        return self._tmpdir / nombre
+    
+    def _publicar_placeholder(self, ruta_parcial: Path, destino: Path):
+        """Publicar un placeholder renderizado y borrar los menos usados si se supera el tope"""
+        os.replace(ruta_parcial, destino)
+        tamano = destino.stat().st_size
+        with self._lock_placeholders:
+            self._bytes_placeholders += tamano - self._placeholders.pop(destino, 0)
+            self._placeholders[destino] = tamano
+            if not self._lotes_activos:
+                self._desalojar_placeholders()
+    
+    def _desalojar_placeholders(self):
+        """Borrar los placeholders menos usados hasta volver al tope (requiere _lock_placeholders)"""
+        while self._bytes_placeholders > _MAX_BYTES_PLACEHOLDERS and len(self._placeholders) > 1:
+            ruta, tamano_ruta = self._placeholders.popitem(last=False)
+            self._bytes_placeholders -= tamano_ruta
+            ruta.unlink(missing_ok=True)
+    
+    @contextlib.contextmanager
+    def lote(self):
+        """Lote de placeholders que se combinarán después: el desalojo espera a que terminen todos los lotes"""
+        with self._lock_placeholders:
+            self._lotes_activos += 1
+        try:
+            yield
+        finally:
+            with self._lock_placeholders:
+                self._lotes_activos -= 1
+                if not self._lotes_activos:
+                    self._desalojar_placeholders()
+    
+    def _renderizar_placeholder(self, nombre: str, construir_cmd: Callable[[Path], List[str]],
+                                timeout: float, reparto: _RepartoNucleos) -> Path:
+        """Renderizar un placeholder en su destino; si el tmpfs se llena a mitad, se repite en disco"""
+        destino = self._destino_placeholder(nombre)
+        while True:
+            ruta_parcial = self._ruta_parcial(destino)
+            result = self._ejecutar_ffmpeg(construir_cmd(ruta_parcial), timeout, reparto)
+            if result.returncode == 0 and ruta_parcial.exists():
+                self._publicar_placeholder(ruta_parcial, destino)
+                return destino
+            ruta_parcial.unlink(missing_ok=True)
+            sin_espacio = "No space left" in (result.stderr or "")
+            if destino.parent == self._tmpdir or not sin_espacio:
+                raise Exception(result.stderr)
+            self.logger.log(NivelSeveridad.WARNING, f"tmpfs lleno, renderizando {nombre} en disco")
+            destino = self._tmpdir / nombre
+    
+    def _args_salida_texto(self, ruta_texto: Path, duracion: float, temp_path: Path, hilos: int) -> List[str]:
+        """Argumentos FFmpeg de una salida de placeholder de texto"""
+        # Los ':' de la ruta (unidades de Windows) se escapan para el parser de opciones del filtro
+        ruta_filtro = ruta_texto.as_posix().replace(':', '\\:')
+        return ['-vf', self._FILTRO_TEXTO.format(ruta_filtro), 
+                '-threads', str(hilos), *self._ARGS_CODIFICACION_TEXTO,
+                '-t', str(duracion), str(temp_path)]
     
     def generar_placeholder_texto(self, texto: str, duracion: float = 5.0, 
-                                estilo: str = "webtoon") -> Path:
+                                estilo: str = "webtoon", reparto: Optional[_RepartoNucleos] = None) -> Path:
         """Generar placeholder de texto animado"""
+        reparto = reparto or self._reparto
         try:
             # Generar hash para cache
-            texto_hash = hashlib.md5(f"{texto}_{duracion}_{estilo}".encode()).hexdigest()
-            cache_key = f"placeholder_texto_{texto_hash}"
+            texto_hash = _cache_key(texto, duracion, estilo)
+            nombre = f"texto_{texto_hash}.mp4"
+            
+            # Ya renderizado por este generador: ni siquiera hace falta consultar el cache
+            existente = self._buscar_placeholder(nombre)
+            if existente:
+                return existente
             
             # Verificar cache
+            cache_key = f"placeholder_texto_{texto_hash}"
             placeholder_cached = self.cache.get(cache_key)
             if placeholder_cached and isinstance(placeholder_cached, Path) and placeholder_cached.exists():
                 self.logger.log(NivelSeveridad.DEBUG, f"Placeholder de texto desde cache: {cache_key}")
                 return placeholder_cached
             
-            # Crear placeholder temporal
-            with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_file:
-                temp_path = Path(temp_file.name)
-            
             # Usar FFmpeg para generar video de texto básico
-            cmd = [
-                'ffmpeg',
-                '-y',  # Sobrescribir si existe
-                '-f', 'lavfi',
-                '-i', f'color=c=black:s=1920x1080:d={duracion}',
-                '-vf', f'drawtext=text=\'{texto}\':fontcolor=white:fontsize=48:x=(w-tw)/2:y=(h-th)/2',
-                '-c:v', 'libx264',
-                '-t', str(duracion),
-                str(temp_path)
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0 and temp_path.exists():
-                # Guardar en cache
-                self.cache.put(cache_key, temp_path, TipoDato.VIDEO, 0.1)
-                self.logger.log(NivelSeveridad.INFO, f"Placeholder de texto generado: {temp_path.name}")
-                return temp_path
-            else:
-                # Limpiar archivo temporal en caso de error
-                if temp_path.exists():
-                    temp_path.unlink()
-                raise Exception(f"Error generando placeholder: {result.stderr}")
+            ruta_texto = self._escribir_texto_temporal(texto)
+            try:
+                temp_path = self._renderizar_placeholder(
+                    nombre,
+                    lambda ruta_parcial: [*self._BASE_CMD_TEXT, '-f', 'lavfi',
+                                          '-i', f'color=c=black:s=1920x1080:d={duracion}',
+                                          *self._args_salida_texto(ruta_texto, duracion, ruta_parcial,
+                                                                   reparto.hilos)],
+                    30, reparto)
+            except Exception as e:
+                raise Exception(f"Error generando placeholder: {e}")
+            finally:
+                ruta_texto.unlink(missing_ok=True)
+            
+            # Guardar en cache
+            self.cache.put(cache_key, temp_path, TipoDato.VIDEO, 0.1)
+            self.logger.log(NivelSeveridad.INFO, f"Placeholder de texto generado: {temp_path.name}")
+            return temp_path
                 
         except Exception as e:
             self.logger.log(NivelSeveridad.ERROR, f"Error generando placeholder de texto: {e}")
             # Generar placeholder de fallback
-            return self._generar_placeholder_fallback(duracion)
+            return self._generar_placeholder_fallback(duracion, reparto)
+    
+    def generar_placeholders_texto(self, textos: List[Tuple[str, float]], estilo: str = "webtoon",
+                                   reparto: Optional[_RepartoNucleos] = None) -> List[Path]:
+        """Generar varios placeholders de texto, renderizando los no cacheados en lotes de varias salidas por FFmpeg"""
+        reparto = reparto or self._reparto
+        placeholders: List[Optional[Path]] = [None] * len(textos)
+        pendientes = []
+        for i, (texto, duracion) in enumerate(textos):
+            texto_hash = _cache_key(texto, duracion, estilo)
+            nombre = f"texto_{texto_hash}.mp4"
+            existente = self._buscar_placeholder(nombre)
+            if existente:
+                placeholders[i] = existente
+                continue
+            
+            cache_key = f"placeholder_texto_{texto_hash}"
+            placeholder_cached = self.cache.get(cache_key)
+            if placeholder_cached and isinstance(placeholder_cached, Path) and placeholder_cached.exists():
+                placeholders[i] = placeholder_cached
+            else:
+                pendientes.append((i, texto, duracion, cache_key, self._destino_placeholder(nombre)))
+        
+        for inicio in range(0, len(pendientes), _MAX_SALIDAS_LOTE_TEXTO):
+            grupo = pendientes[inicio:inicio + _MAX_SALIDAS_LOTE_TEXTO]
+            if len(grupo) > 1:
+                self._renderizar_lote_texto(grupo, placeholders, reparto)
+        
+        # Lo que no salió del lote sigue la ruta individual, con su fallback
+        for i, texto, duracion, _, _ in pendientes:
+            if placeholders[i] is None:
+                placeholders[i] = self.generar_placeholder_texto(texto, duracion, estilo, reparto)
+        return placeholders
     
-    def generar_placeholder_imagen(self, imagen_path: Path, duracion: float = 3.0) -> Path:
+    def _renderizar_lote_texto(self, pendientes: List[Tuple[int, str, float, str, Path]], 
+                               placeholders: List[Optional[Path]], reparto: _RepartoNucleos):
+        """Renderizar un lote de placeholders de texto como salidas de una única invocación de FFmpeg"""
+        rutas_parciales = [self._ruta_parcial(temp_path) for *_, temp_path in pendientes]
+        rutas_texto = [self._escribir_texto_temporal(texto) for _, texto, *_ in pendientes]
+        # Los encoders del lote se reparten los hilos que corresponden a un único FFmpeg
+        hilos = max(1, reparto.hilos // len(pendientes))
+        
+        # Una entrada lavfi por placeholder, cada una mapeada a su propia salida
+        cmd = list(self._BASE_CMD_TEXT)
+        for _, _, duracion, *_ in pendientes:
+            cmd += ['-f', 'lavfi', '-i', f'color=c=black:s=1920x1080:d={duracion}']
+        for indice, ((_, _, duracion, *_), ruta_texto, ruta_parcial) in enumerate(
+                zip(pendientes, rutas_texto, rutas_parciales)):
+            cmd += ['-map', f'{indice}:v', *self._args_salida_texto(ruta_texto, duracion, ruta_parcial, hilos)]
+        
+        try:
+            result = self._ejecutar_ffmpeg(cmd, 30 * len(pendientes), reparto)
+            exito = result.returncode == 0
+            if not exito:
+                self.logger.log(NivelSeveridad.WARNING, f"Error en lote de placeholders de texto: {result.stderr}")
+        except Exception as e:
+            self.logger.log(NivelSeveridad.WARNING, f"Error en lote de placeholders de texto: {e}")
+            exito = False
+        finally:
+            for ruta_texto in rutas_texto:
+                ruta_texto.unlink(missing_ok=True)
+        
+        for (i, _, _, cache_key, temp_path), ruta_parcial in zip(pendientes, rutas_parciales):
+            if exito and ruta_parcial.exists():
+                self._publicar_placeholder(ruta_parcial, temp_path)
+                self.cache.put(cache_key, temp_path, TipoDato.VIDEO, 0.1)
+                placeholders[i] = temp_path
+            else:
+                ruta_parcial.unlink(missing_ok=True)
+        
+        if exito:
+            self.logger.log(NivelSeveridad.INFO, f"Lote de {len(pendientes)} placeholders de texto generado")
+    
+    def generar_placeholder_imagen(self, imagen_path: Path, duracion: float = 3.0,
+                                   reparto: Optional[_RepartoNucleos] = None) -> Path:
         """Generar placeholder de imagen"""
+        reparto = reparto or self._reparto
         try:
             if not imagen_path.exists():
                 raise FileNotFoundError(f"Imagen no encontrada: {imagen_path}")
             
             # Generar hash para cache
-            imagen_hash = hashlib.md5(f"{imagen_path}_{duracion}".encode()).hexdigest()
-            cache_key = f"placeholder_imagen_{imagen_hash}"
+            imagen_hash = _cache_key(imagen_path, duracion)
+            nombre = f"imagen_{imagen_hash}.mp4"
+            existente = self._buscar_placeholder(nombre)
+            if existente:
+                return existente
             
             # Verificar cache
+            cache_key = f"placeholder_imagen_{imagen_hash}"
             placeholder_cached = self.cache.get(cache_key)
             if placeholder_cached and isinstance(placeholder_cached, Path) and placeholder_cached.exists():
                 return placeholder_cached
             
-            # Crear placeholder temporal
-            with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_file:
-                temp_path = Path(temp_file.name)
-            
             # Usar FFmpeg para generar video desde imagen
-            cmd = [
-                'ffmpeg',
-                '-y',
-                '-loop', '1',
-                '-i', str(imagen_path),
-                '-c:v', 'libx264',
-                '-t', str(duracion),
-                '-pix_fmt', 'yuv420p',
-                str(temp_path)
-            ]
+            def construir_cmd(ruta_parcial: Path) -> List[str]:
+                return [
+                    'ffmpeg',
+                    *_FFMPEG_QUIET,
+                    '-y',
+                    '-loop', '1',
+                    '-i', str(imagen_path),
+                    '-threads', str(reparto.hilos), '-preset', 'ultrafast', '-tune', 'stillimage',
+                    '-c:v', 'libx264',
+                    '-t', str(duracion),
+                    '-pix_fmt', 'yuv420p',
+                    str(ruta_parcial)
+                ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            try:
+                temp_path = self._renderizar_placeholder(nombre, construir_cmd, 30, reparto)
+            except Exception as e:
+                raise Exception(f"Error generando placeholder de imagen: {e}")
             
-            if result.returncode == 0 and temp_path.exists():
-                # Guardar en cache
-                self.cache.put(cache_key, temp_path, TipoDato.VIDEO, 0.1)
-                self.logger.log(NivelSeveridad.INFO, f"Placeholder de imagen generado: {temp_path.name}")
-                return temp_path
-            else:
-                if temp_path.exists():
-                    temp_path.unlink()
-                raise Exception(f"Error generando placeholder de imagen: {result.stderr}")
+            # Guardar en cache
+            self.cache.put(cache_key, temp_path, TipoDato.VIDEO, 0.1)
+            self.logger.log(NivelSeveridad.INFO, f"Placeholder de imagen generado: {temp_path.name}")
+            return temp_path
                 
         except Exception as e:
             self.logger.log(NivelSeveridad.ERROR, f"Error generando placeholder de imagen: {e}")
-            return self._generar_placeholder_fallback(duracion)
+            return self._generar_placeholder_fallback(duracion, reparto)
     
-    def _generar_placeholder_fallback(self, duracion: float) -> Path:
+    def _generar_placeholder_fallback(self, duracion: float, 
+                                      reparto: Optional[_RepartoNucleos] = None) -> Path:
         """Generar placeholder de fallback básico"""
+        reparto = reparto or self._reparto
+        fallback_hash = _cache_key("fallback", duracion)
         try:
-            with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_file:
-                temp_path = Path(temp_file.name)
+            nombre = f"fallback_{fallback_hash}.mp4"
+            existente = self._buscar_placeholder(nombre)
+            if existente:
+                return existente
             
             # Generar video de color sólido como fallback
-            cmd = [
-                'ffmpeg',
-                '-y',
-                '-f', 'lavfi',
-                '-i', f'color=c=blue:s=1920x1080:d={duracion}',
-                '-c:v', 'libx264',
-                '-t', str(duracion),
-                '-pix_fmt', 'yuv420p',
-                str(temp_path)
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0 and temp_path.exists():
-                return temp_path
-            else:
-                if temp_path.exists():
-                    temp_path.unlink()
-                raise Exception("Error generando placeholder fallback")
+            def construir_cmd(ruta_parcial: Path) -> List[str]:
+                return [
+                    'ffmpeg',
+                    *_FFMPEG_QUIET,
+                    '-y',
+                    '-f', 'lavfi',
+                    '-i', f'color=c=blue:s=1920x1080:d={duracion}',
+                    '-threads', str(reparto.hilos), '-preset', 'ultrafast', '-tune', 'stillimage',
+                    '-c:v', 'libx264',
+                    '-t', str(duracion),
+                    '-pix_fmt', 'yuv420p',
+                    str(ruta_parcial)
+                ]
+            
+            return self._renderizar_placeholder(nombre, construir_cmd, 30, reparto)
                 
         except Exception as e:
             self.logger.log(NivelSeveridad.ERROR, f"Error generando placeholder fallback: {e}")
             # Crear archivo vacío como último recurso
-            with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_file:
-                return Path(temp_file.name)
+            ruta_vacia = self._tmpdir / f"vacio_{fallback_hash}.mp4"
+            ruta_vacia.touch()
+            return ruta_vacia
 
 
 class ValidadorVideo:
     """Validador riguroso de calidad de video"""
     
+    # Umbrales de resolución de mayor a menor: 4K, 1080p y 720p
+    _QUALITY_TABLE = (
+        (3840, 2160, CalidadVideo.ULTRA),
+        (1920, 1080, CalidadVideo.ALTA),
+        (1280, 720, CalidadVideo.MEDIA),
+    )
+    
     def __init__(self):
         self.logger = obtener_sistema_logging().obtener_sistema_logger()
     
-    def validar_video(self, video_path: Path) -> MetricasVideo:
-        """Validar video y calcular métricas"""
+    def validar_video(self, video_path: Path, validacion_profunda: bool = False) -> MetricasVideo:
+        """Validar video y calcular métricas (con validacion_profunda también se muestrean frames)"""
         try:
             if not video_path.exists():
                 raise FileNotFoundError(f"Video no encontrado: {video_path}")
             
-            # Usar ffprobe para obtener información del video
-            cmd = [
-                'ffprobe',
-                '-v', 'quiet',
-                '-print_format', 'json',
-                '-show_format',
-                '-show_streams',
-                str(video_path)
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-            
-            if result.returncode != 0:
-                raise Exception(f"Error obteniendo información del video: {result.stderr}")
-            
-            info = json.loads(result.stdout)
+            # Usar ffprobe para obtener información del video (cacheado por ruta, tamaño y mtime)
+            try:
+                info = _probe_json(video_path)
+            except subprocess.CalledProcessError as e:
+                raise Exception(f"Error obteniendo información del video: ffprobe terminó con código {e.returncode}")
             
             # Extraer información relevante
             format_info = info.get('format', {})
@@ -403,6 +818,13 @@ class ValidadorVideo:
             # Estimar calidad
             calidad = self._estimar_calidad(ancho, alto, fps, duracion)
             
+            estadisticas_frames = None
+            if validacion_profunda and video_stream:
+                estadisticas_frames = self._estimar_calidad_frames(video_path, fps)
+                # Un video sin contenido visual no tiene la calidad que sugiere su resolución
+                if estadisticas_frames and estadisticas_frames["varianza_media"] < _UMBRAL_VARIANZA_PLANA:
+                    calidad = CalidadVideo.BAJA
+            
             metricas = MetricasVideo(
                 tamano_bytes=tamano,
                 duracion_segundos=duracion,
@@ -412,7 +834,8 @@ class ValidadorVideo:
                 codec_video=codec_video,
                 codec_audio=codec_audio,
                 checksum=checksum,
-                calidad_estimada=calidad
+                calidad_estimada=calidad,
+                estadisticas_frames=estadisticas_frames
             )
             
             self.logger.log(NivelSeveridad.DEBUG, 
@@ -435,37 +858,104 @@ class ValidadorVideo:
                 calidad_estimada=CalidadVideo.BAJA
             )
     
+    def validar_videos(self, videos_paths: List[Path], 
+                       validacion_profunda: bool = False) -> Dict[Path, MetricasVideo]:
+        """Validar varios videos en paralelo: cada ffprobe es un proceso independiente"""
+        if not videos_paths:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(len(videos_paths), os.cpu_count() or 1)) as pool:
+            metricas = pool.map(lambda video: self.validar_video(video, validacion_profunda), videos_paths)
+            return dict(zip(videos_paths, metricas))
+    
+    def _estimar_calidad_frames(self, video_path: Path, fps: float) -> Optional[Dict[str, float]]:
+        """Estadísticas de luminancia sobre un muestreo disperso de frames (requiere PyAV y NumPy)"""
+        if not (PYAV_AVAILABLE and NUMPY_AVAILABLE):
+            self.logger.log(NivelSeveridad.DEBUG, "Validación profunda no disponible: faltan PyAV o NumPy")
+            return None
+        
+        try:
+            paso = max(1, int(round(fps * _SEGUNDOS_ENTRE_MUESTRAS)))
+            buffer = None
+            muestreados = 0
+            with av.open(str(video_path)) as contenedor:
+                for indice, frame in enumerate(contenedor.decode(video=0)):
+                    if indice % paso:
+                        continue
+                    luminancia = frame.to_ndarray(format='gray')
+                    if buffer is None:
+                        # Buffer reservado una sola vez con el tamaño del primer frame
+                        buffer = np.empty((_MAX_FRAMES_MUESTREADOS, *luminancia.shape), dtype=np.uint8)
+                    buffer[muestreados] = luminancia
+                    muestreados += 1
+                    if muestreados == _MAX_FRAMES_MUESTREADOS:
+                        break
+            
+            if not muestreados:
+                return None
+            medias, varianzas = _frame_stats(buffer[:muestreados])
+            return {
+                "frames_muestreados": muestreados,
+                "brillo_medio": float(medias.mean()),
+                "varianza_media": float(varianzas.mean())
+            }
+        except Exception as e:
+            self.logger.log(NivelSeveridad.WARNING, f"Error muestreando frames de {video_path.name}: {e}")
+            return None
+    
     def _calcular_checksum(self, archivo: Path) -> str:
         """Calcular checksum SHA-256 del archivo"""
-        hash_sha256 = hashlib.sha256()
         try:
             with open(archivo, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_sha256.update(chunk)
-            return hash_sha256.hexdigest()
+                # file_digest (3.11+) recorre el archivo en C, sin una llamada Python por bloque
+                if hasattr(hashlib, "file_digest"):
+                    return hashlib.file_digest(f, "sha256").hexdigest()
+                
+                hash_sha256 = hashlib.sha256()
+                if os.fstat(f.fileno()).st_size > 0:
+                    # Un único buffer mapeado: OpenSSL procesa el archivo entero de una vez
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                        hash_sha256.update(mapa)
+                return hash_sha256.hexdigest()
         except Exception as e:
             self.logger.log(NivelSeveridad.ERROR, f"Error calculando checksum: {e}")
             return ""
     
-    def _estimar_calidad(self, ancho: int, alto: int, fps: float, duracion: float) -> CalidadVideo:
+    @staticmethod
+    def _estimar_calidad(ancho: int, alto: int, fps: float, duracion: float) -> CalidadVideo:
         """Estimar calidad del video basado en sus características"""
-        # Criterios de calidad
-        if ancho >= 3840 and alto >= 2160:  # 4K
-            return CalidadVideo.ULTRA
-        elif ancho >= 1920 and alto >= 1080:  # 1080p
-            return CalidadVideo.ALTA
-        elif ancho >= 1280 and alto >= 720:  # 720p
-            return CalidadVideo.MEDIA
-        else:
-            return CalidadVideo.BAJA
+        for ancho_minimo, alto_minimo, calidad in ValidadorVideo._QUALITY_TABLE:
+            if ancho >= ancho_minimo and alto >= alto_minimo:
+                return calidad
+        return CalidadVideo.BAJA
 
 
 class ProcesadorVideoFFmpeg:
     """Procesador de video usando FFmpeg"""
     
-    def __init__(self):
+    # Resolución y bitrate de salida por calidad; cualquier otra calidad se codifica a 480p
+    _PARAMETROS_CALIDAD = {
+        CalidadVideo.ULTRA: ("3840x2160", "20M"),
+        CalidadVideo.ALTA: ("1920x1080", "10M"),
+        CalidadVideo.MEDIA: ("1280x720", "5M"),
+    }
+    _PARAMETROS_CALIDAD_BAJA = ("854x480", "2M")
+    # Calidad constante de NVENC (-cq) por calidad; el bitrate de la tabla anterior actúa como objetivo
+    _CQ_NVENC = {
+        CalidadVideo.ULTRA: 19,
+        CalidadVideo.ALTA: 21,
+        CalidadVideo.MEDIA: 23,
+    }
+    _CQ_NVENC_BAJA = 26
+    
+    def __init__(self, preset: str = "veryfast", 
+                 verificador: Optional[VerificadorDependenciasVideo] = None):
         self.logger = obtener_sistema_logging().obtener_sistema_logger()
-        self.verificador = VerificadorDependenciasVideo()
+        self.verificador = verificador or VerificadorDependenciasVideo()
+        # Preset de libx264 para codificaciones reales (los placeholders usan siempre ultrafast)
+        self.preset = preset
+        # Encoder H.264 a usar al re-codificar, detectado en el primer uso
+        self._hw_encoder: Optional[str] = None
+        self._lock_encoder = threading.Lock()
         
         # Verificar dependencias al inicializar
         self.dependencias_disponibles = self.verificador.verificar_todas_dependencias()
@@ -480,17 +970,21 @@ class ProcesadorVideoFFmpeg:
             if len(videos) != len(transiciones) + 1:
                 raise ValueError("Número incorrecto de transiciones")
             
-            # Crear archivo de lista para FFmpeg
+            # Con codecs, resoluciones o timebases distintos la copia de streams produce un video corrupto
+            _exigir_existentes(videos)
+            if len(self._probe_codec_params_varios(videos)) > 1:
+                return self._concatenar_recodificando(videos, archivo_salida)
+            
+            # Crear archivo de lista para FFmpeg, escrito de una vez
+            lineas = [f"file '{os.path.abspath(os.fspath(video))}'\n" for video in videos]
             with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as list_file:
                 list_path = Path(list_file.name)
-                
-                for video in videos:
-                    if video.exists():
-                        list_file.write(f"file '{video.absolute()}'\n")
+                list_file.write("".join(lineas))
             
             # Comando FFmpeg para concatenar videos
             cmd = [
                 'ffmpeg',
+                *_FFMPEG_QUIET,
                 '-y',
                 '-f', 'concat',
                 '-safe', '0',
@@ -499,7 +993,8 @@ class ProcesadorVideoFFmpeg:
                 str(archivo_salida)
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                                    timeout=300)
             
             # Limpiar archivo temporal
             if list_path.exists():
@@ -516,6 +1011,173 @@ class ProcesadorVideoFFmpeg:
             self.logger.log(NivelSeveridad.ERROR, f"Error combinando videos: {e}")
             return False
     
+    def _probe_codec_params(self, video: Path) -> Optional[Tuple]:
+        """Parámetros del primer stream de video que deben coincidir para concatenar sin recodificar"""
+        try:
+            # Mismo sondeo cacheado que ValidadorVideo: un archivo sin cambios no se vuelve a sondear
+            streams = _probe_json(video).get('streams', [])
+            for stream in streams:
+                if stream.get('codec_type') == 'video':
+                    return (stream.get('codec_name'), stream.get('width'), stream.get('height'),
+                            stream.get('pix_fmt'), stream.get('time_base'))
+        except Exception as e:
+            self.logger.log(NivelSeveridad.WARNING, f"No se pudo sondear {video.name}: {e}")
+        return None
+    
+    def _probe_audio(self, video: Path) -> Tuple[bool, float]:
+        """Si el video tiene stream de audio y su duración, según el sondeo cacheado"""
+        try:
+            info = _probe_json(video)
+            tiene_audio = any(stream.get('codec_type') == 'audio' for stream in info.get('streams', []))
+            return tiene_audio, float(info.get('format', {}).get('duration', 0))
+        except Exception as e:
+            self.logger.log(NivelSeveridad.WARNING, f"No se pudo sondear el audio de {video.name}: {e}")
+            return False, 0.0
+    
+    def _probe_codec_params_varios(self, videos: List[Path]) -> set:
+        """Conjunto de parámetros de codec distintos, sondeando los videos en paralelo"""
+        if len(videos) <= 1:
+            return {self._probe_codec_params(video) for video in videos}
+        with ThreadPoolExecutor(max_workers=min(len(videos), os.cpu_count() or 1)) as pool:
+            return set(pool.map(self._probe_codec_params, videos))
+    
+    def _obtener_encoder_h264(self) -> str:
+        """Encoder H.264 preferido: el primer encoder por hardware que funcione, o libx264"""
+        with self._lock_encoder:
+            if self._hw_encoder is None:
+                self._hw_encoder = self._detectar_encoder_h264()
+                self.logger.log(NivelSeveridad.INFO, f"Encoder H.264 seleccionado: {self._hw_encoder}")
+            return self._hw_encoder
+    
+    def _detectar_encoder_h264(self) -> str:
+        """Detectar el encoder H.264 por hardware utilizable en esta máquina"""
+        try:
+            result = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                  capture_output=True, text=True, timeout=10)
+            compilados = {linea.split()[1] for linea in result.stdout.splitlines() 
+                          if len(linea.split()) > 1}
+        except Exception:
+            return _ENCODER_H264_SOFTWARE
+        
+        for encoder in _ENCODERS_H264_HARDWARE:
+            if encoder not in compilados:
+                continue
+            # Estar compilado no implica tener el hardware: se prueba a codificar un frame
+            cmd = [
+                'ffmpeg', *_FFMPEG_QUIET,
+                *_args_entrada_encoder(encoder),
+                '-f', 'lavfi', '-i', 'color=c=black:s=256x256:d=0.1',
+                '-frames:v', '1',
+                '-vf', _sufijo_filtro_encoder(encoder),
+                '-c:v', encoder,
+                '-f', 'null', '-'
+            ]
+            try:
+                if subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                  timeout=20).returncode == 0:
+                    return encoder
+            except Exception:
+                continue
+        return _ENCODER_H264_SOFTWARE
+    
+    def _args_codificacion(self, encoder: str, calidad: Optional[CalidadVideo] = None) -> List[str]:
+        """Argumentos de salida para codificar con el encoder H.264 dado"""
+        if encoder == _ENCODER_H264_SOFTWARE:
+            return ['-c:v', encoder, '-threads', str(os.cpu_count() or 0), '-preset', self.preset]
+        if encoder == "h264_nvenc" and calidad is not None:
+            cq = self._CQ_NVENC.get(calidad, self._CQ_NVENC_BAJA)
+            return ['-c:v', encoder, '-preset', 'p4', '-rc', 'vbr', '-cq', str(cq)]
+        return ['-c:v', encoder, *_ARGS_CALIDAD_ENCODER.get(encoder, [])]
+    
+    @staticmethod
+    def _args_hwaccel(encoder: str, frames_en_gpu: bool = False) -> List[str]:
+        """Decodificación por hardware acorde al encoder (con frames_en_gpu, NVDEC entrega a NVENC sin copiar a CPU)"""
+        if encoder == _ENCODER_H264_SOFTWARE:
+            return []
+        if encoder == "h264_nvenc":
+            if frames_en_gpu:
+                return ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda']
+            return ['-hwaccel', 'cuda']
+        return ['-hwaccel', 'auto']
+    
+    @classmethod
+    def _parametros_calidad(cls, calidad: CalidadVideo) -> Tuple[str, str]:
+        """Resolución y bitrate de salida para una calidad"""
+        return cls._PARAMETROS_CALIDAD.get(calidad, cls._PARAMETROS_CALIDAD_BAJA)
+    
+    def _concatenar_recodificando(self, videos: List[Path], archivo_salida: Path) -> bool:
+        """Concatenar videos heterogéneos con el filtro concat, recodificando con el mejor encoder"""
+        return self.render_pipeline(videos, [], archivo_salida)
+    
+    def render_pipeline(self, videos: List[Path], efectos: List[str], archivo_salida: Path,
+                        calidad: Optional[CalidadVideo] = None) -> bool:
+        """Concatenar, aplicar efectos y escalar en un único grafo: una sola decodificación y codificación"""
+        try:
+            if not self.dependencias_disponibles.get('ffmpeg', False):
+                raise Exception("FFmpeg no disponible")
+            
+            if not videos:
+                raise ValueError("No hay videos de entrada")
+            _exigir_existentes(videos)
+            
+            if calidad is not None:
+                resolucion, bitrate = self._parametros_calidad(calidad)
+                ancho, alto = map(int, resolucion.split('x'))
+            else:
+                parametros = self._probe_codec_params(videos[0])
+                ancho, alto = (parametros[1], parametros[2]) if parametros and parametros[1] else (1920, 1080)
+                bitrate = None
+            encoder = self._obtener_encoder_h264()
+            
+            # El filtro concat exige el mismo tamaño y SAR en todas las entradas; se normaliza
+            # directamente a la resolución final, así el escalado no es una pasada aparte
+            normalizados = ";".join(
+                f"[{i}:v:0]scale={ancho}:{alto}:force_original_aspect_ratio=decrease,"
+                f"pad={ancho}:{alto}:(ow-iw)/2:(oh-ih)/2,setsar=1[v{i}]"
+                for i in range(len(videos))
+            )
+            cadena = [*efectos, _sufijo_filtro_encoder(encoder)]
+            
+            audios = [self._probe_audio(video) for video in videos]
+            if any(tiene_audio for tiene_audio, _ in audios):
+                # concat con audio necesita un pad de audio por entrada: silencio de la misma
+                # duración para las que no tienen, y todas al mismo formato
+                pistas = ";".join(
+                    f"[{i}:a:0]aresample=48000,aformat=channel_layouts=stereo[a{i}]" if tiene_audio
+                    else f"anullsrc=r=48000:cl=stereo,atrim=duration={duracion}[a{i}]"
+                    for i, (tiene_audio, duracion) in enumerate(audios)
+                )
+                etiquetas = "".join(f"[v{i}][a{i}]" for i in range(len(videos)))
+                filtro = (f"{normalizados};{pistas};"
+                          f"{etiquetas}concat=n={len(videos)}:v=1:a=1[vc][a];[vc]{','.join(cadena)}[v]")
+                args_audio = ['-map', '[a]', '-c:a', 'aac']
+            else:
+                etiquetas = "".join(f"[v{i}]" for i in range(len(videos)))
+                filtro = f"{normalizados};{etiquetas}{','.join([f'concat=n={len(videos)}:v=1:a=0', *cadena])}[v]"
+                args_audio = []
+            
+            cmd = ['ffmpeg', *_FFMPEG_QUIET, '-y', *_args_entrada_encoder(encoder)]
+            for video in videos:
+                cmd += ['-i', str(video)]
+            cmd += ['-filter_complex', filtro, '-map', '[v]', *args_audio]
+            if bitrate:
+                cmd += ['-b:v', bitrate]
+            cmd += [*self._args_codificacion(encoder), str(archivo_salida)]
+            
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                                    timeout=300)
+            
+            if result.returncode == 0 and archivo_salida.exists():
+                self.logger.log(NivelSeveridad.INFO, 
+                              f"Video renderizado en una pasada con {encoder}: {archivo_salida.name}")
+                return True
+            self.logger.log(NivelSeveridad.ERROR, f"Error renderizando video: {result.stderr}")
+            return False
+            
+        except Exception as e:
+            self.logger.log(NivelSeveridad.ERROR, f"Error renderizando video: {e}")
+            return False
+    
     def aplicar_efectos(self, video_entrada: Path, efectos: List[str], 
                        video_salida: Path) -> bool:
         """Aplicar efectos al video"""
@@ -526,19 +1188,25 @@ class ProcesadorVideoFFmpeg:
             if not video_entrada.exists():
                 raise FileNotFoundError(f"Video de entrada no encontrado: {video_entrada}")
             
-            # Construir filtro de efectos
-            filtro = ','.join(efectos) if efectos else 'null'
+            encoder = self._obtener_encoder_h264()
+            # Los efectos son filtros de CPU: se decodifica por hardware pero los frames bajan a memoria
+            filtro = ','.join([*efectos, _sufijo_filtro_encoder(encoder)])
             
             cmd = [
                 'ffmpeg',
+                *_FFMPEG_QUIET,
                 '-y',
+                *_args_entrada_encoder(encoder),
+                *self._args_hwaccel(encoder),
                 '-i', str(video_entrada),
                 '-vf', filtro,
+                *self._args_codificacion(encoder),
                 '-c:a', 'copy',
                 str(video_salida)
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                                    timeout=300)
             
             if result.returncode == 0 and video_salida.exists():
                 self.logger.log(NivelSeveridad.INFO, f"Efectos aplicados: {video_salida.name}")
@@ -562,35 +1230,93 @@ class ProcesadorVideoFFmpeg:
                 raise FileNotFoundError(f"Video de entrada no encontrado: {video_entrada}")
             
             # Configurar parámetros según calidad
-            if calidad == CalidadVideo.ULTRA:
-                resolucion = "3840x2160"
-                bitrate = "20M"
-            elif calidad == CalidadVideo.ALTA:
-                resolucion = "1920x1080"
-                bitrate = "10M"
-            elif calidad == CalidadVideo.MEDIA:
-                resolucion = "1280x720"
-                bitrate = "5M"
+            resolucion, bitrate = self._parametros_calidad(calidad)
+            
+            escala = resolucion.replace('x', ':')
+            encoder = self._obtener_encoder_h264()
+            
+            def comando(args_hwaccel: List[str], filtro: str) -> List[str]:
+                return [
+                    'ffmpeg',
+                    *_FFMPEG_QUIET,
+                    '-y',
+                    *_args_entrada_encoder(encoder),
+                    *args_hwaccel,
+                    '-i', str(video_entrada),
+                    '-vf', filtro,
+                    '-b:v', bitrate,
+                    *self._args_codificacion(encoder, calidad),
+                    '-c:a', 'aac',
+                    str(archivo_salida)
+                ]
+            
+            # Con encoder por hardware también se decodifica por hardware
+            filtro_cpu = f"scale={escala},{_sufijo_filtro_encoder(encoder)}"
+            cmd = comando(self._args_hwaccel(encoder), filtro_cpu)
+            if encoder == "h264_nvenc":
+                # NVDEC → scale_cuda → NVENC: los frames NV12 no salen de la GPU
+                cmd_gpu = comando(self._args_hwaccel(encoder, frames_en_gpu=True), f"scale_cuda={escala}")
+                result = subprocess.run(cmd_gpu, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                                        timeout=300)
+                if result.returncode == 0 and archivo_salida.exists():
+                    self.logger.log(NivelSeveridad.INFO, f"Video convertido en GPU: {archivo_salida.name}")
+                    return True
+                # Códec o formato de píxel que NVDEC no decodifica: se repite con escalado en CPU
+                self.logger.log(NivelSeveridad.DEBUG, f"Conversión en GPU no disponible: {result.stderr}")
+            
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                                    timeout=300)
+            
+            if result.returncode == 0 and archivo_salida.exists():
+                self.logger.log(NivelSeveridad.INFO, f"Video convertido: {archivo_salida.name}")
+                return True
             else:
-                resolucion = "854x480"
-                bitrate = "2M"
+                self.logger.log(NivelSeveridad.ERROR, f"Error convirtiendo video: {result.stderr}")
+                return False
+                
+        except Exception as e:
+            self.logger.log(NivelSeveridad.ERROR, f"Error convirtiendo video: {e}")
+            return False
+    
+    def convertir_formato_multi(self, video_entrada: Path, 
+                                destinos: List[Tuple[CalidadVideo, Path]]) -> bool:
+        """Convertir a varias calidades en una sola ejecución: la entrada se decodifica una vez"""
+        try:
+            if not self.dependencias_disponibles.get('ffmpeg', False):
+                raise Exception("FFmpeg no disponible")
+            
+            if not video_entrada.exists():
+                raise FileNotFoundError(f"Video de entrada no encontrado: {video_entrada}")
+            
+            encoder = self._obtener_encoder_h264()
+            
+            # split reparte los frames decodificados entre una rama de escalado por salida
+            ramas = "".join(f"[s{i}]" for i in range(len(destinos)))
+            filtros = [f"[0:v]split={len(destinos)}{ramas}"]
+            for i, (calidad, _) in enumerate(destinos):
+                resolucion, _ = self._parametros_calidad(calidad)
+                filtros.append(f"[s{i}]scale={resolucion.replace('x', ':')},{_sufijo_filtro_encoder(encoder)}[v{i}]")
             
             cmd = [
                 'ffmpeg',
+                *_FFMPEG_QUIET,
                 '-y',
+                *_args_entrada_encoder(encoder),
+                *self._args_hwaccel(encoder),
                 '-i', str(video_entrada),
-                '-s', resolucion,
-                '-b:v', bitrate,
-                '-c:v', 'libx264',
-                '-c:a', 'aac',
-                '-pix_fmt', 'yuv420p',
-                str(archivo_salida)
+                '-filter_complex', ";".join(filtros)
             ]
+            for i, (calidad, archivo_salida) in enumerate(destinos):
+                _, bitrate = self._parametros_calidad(calidad)
+                cmd += ['-map', f'[v{i}]', '-map', '0:a?', '-b:v', bitrate,
+                        *self._args_codificacion(encoder, calidad), '-c:a', 'aac', str(archivo_salida)]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                                    timeout=300 * len(destinos))
             
-            if result.returncode == 0 and archivo_salida.exists():
-                self.logger.log(NivelSeveridad.INFO, f"Video convertido: {archivo_salida.name}")
+            if result.returncode == 0 and all(archivo.exists() for _, archivo in destinos):
+                self.logger.log(NivelSeveridad.INFO, 
+                              f"Video convertido a {len(destinos)} calidades: {video_entrada.name}")
                 return True
             else:
                 self.logger.log(NivelSeveridad.ERROR, f"Error convirtiendo video: {result.stderr}")
@@ -604,16 +1330,24 @@ class ProcesadorVideoFFmpeg:
 class VideoEditorUltraFuncional:
     """Sistema principal ultra-funcional de edición de video"""
     
-    def __init__(self, ruta_cache: Path = None):
+    def __init__(self, ruta_cache: Path = None, presupuesto_cache_mb: float = 4096):
         self.logger = obtener_sistema_logging().obtener_sistema_logger()
         self.ruta_cache = ruta_cache or Path("./cache_video")
         self.ruta_cache.mkdir(parents=True, exist_ok=True)
         
+        # Copias de video propias del cache bajo un presupuesto de bytes, con desalojo LRBU
+        self.ruta_videos_cache = self.ruta_cache / "videos"
+        self.ruta_videos_cache.mkdir(parents=True, exist_ok=True)
+        self.presupuesto_cache_bytes = int(presupuesto_cache_mb * 1024 * 1024)
+        self._archivo_entry_meta = self.ruta_cache / "entradas_video.json"
+        self._lock_entry_meta = threading.Lock()
+        self._entry_meta: Dict[str, Dict[str, Any]] = self._cargar_entry_meta()
+        
         # Componentes del sistema
         self.verificador = VerificadorDependenciasVideo()
         self.generador = GeneradorPlaceholders()
         self.validador = ValidadorVideo()
-        self.procesador = ProcesadorVideoFFmpeg()
+        self.procesador = ProcesadorVideoFFmpeg(verificador=self.verificador)
         self.cache = obtener_cache_multinivel(self.ruta_cache.parent)
         
         # Estado del sistema
@@ -633,8 +1367,8 @@ class VideoEditorUltraFuncional:
         try:
             self.logger.log(NivelSeveridad.INFO, "🚀 Inicializando VideoEditor ultra-funcional...")
             
-            # Verificar dependencias
-            self.dependencias_disponibles = self.verificador.verificar_todas_dependencias()
+            # Dependencias ya verificadas por el procesador con el verificador compartido
+            self.dependencias_disponibles = dict(self.procesador.dependencias_disponibles)
             
             # Verificar que al menos FFmpeg esté disponible
             if not self.dependencias_disponibles.get('ffmpeg', False):
@@ -648,8 +1382,10 @@ class VideoEditorUltraFuncional:
             self.logger.log(NivelSeveridad.ERROR, f"Error inicializando VideoEditor: {e}")
     
     def crear_video_desde_imagenes(self, imagenes: List[Path], duraciones: List[float],
-                                  archivo_salida: Path, transiciones: Optional[List[TipoTransicion]] = None) -> ResultadoVideo:
-        """Crear video desde una lista de imágenes"""
+                                  archivo_salida: Path, transiciones: Optional[List[TipoTransicion]] = None,
+                                  efectos: Optional[List[str]] = None,
+                                  calidad: Optional[CalidadVideo] = None) -> ResultadoVideo:
+        """Crear video desde una lista de imágenes (con efectos y calidad opcionales en la misma pasada)"""
         inicio_procesamiento = time.time()
         
         try:
@@ -660,25 +1396,50 @@ class VideoEditorUltraFuncional:
                 raise ValueError("Número de imágenes y duraciones no coincide")
             
             # Generar placeholders para cada imagen
-            placeholders = []
-            for i, imagen in enumerate(imagenes):
-                if imagen.exists():
-                    placeholder = self.generador.generar_placeholder_imagen(imagen, duraciones[i])
-                    placeholders.append(placeholder)
+            placeholders = [None] * len(imagenes)
+            existentes = [i for i, imagen in enumerate(imagenes) if imagen.exists()]
+            faltantes = [i for i, imagen in enumerate(imagenes) if not imagen.exists()]
+            
+            # Cada placeholder de imagen y cada grupo de textos es un proceso FFmpeg: se generan en paralelo
+            grupos_faltantes = [faltantes[inicio:inicio + _MAX_SALIDAS_LOTE_TEXTO]
+                                for inicio in range(0, len(faltantes), _MAX_SALIDAS_LOTE_TEXTO)]
+            tareas = len(existentes) + len(grupos_faltantes)
+            trabajadores = min(tareas, len(_nucleos_disponibles()))
+            # Sin sobresuscripción: cada FFmpeg del lote recibe su parte de los núcleos,
+            # sin afectar a otras llamadas que usen el mismo generador
+            # Los placeholders del lote no se desalojan hasta combinarlos
+            with self.generador.lote():
+                reparto = self.generador.repartir_nucleos(trabajadores)
+                with ThreadPoolExecutor(max_workers=trabajadores) as pool:
+                    # Placeholders de texto como fallback, un proceso FFmpeg por grupo
+                    futuros_textos = [
+                        (grupo, pool.submit(self.generador.generar_placeholders_texto,
+                                            [(f"Imagen no encontrada: {imagenes[i].name}", duraciones[i]) for i in grupo],
+                                            "webtoon", reparto))
+                        for grupo in grupos_faltantes
+                    ]
+                
+                    generados = pool.map(
+                        lambda i: self.generador.generar_placeholder_imagen(imagenes[i], duraciones[i], reparto),
+                        existentes)
+                    for i, placeholder in zip(existentes, generados):
+                        placeholders[i] = placeholder
+                
+                    for grupo, futuro in futuros_textos:
+                        for i, placeholder in zip(grupo, futuro.result()):
+                            placeholders[i] = placeholder
+            
+                # Con efectos o calidad de salida: concatenar, filtrar y escalar en un único grafo FFmpeg
+                if efectos or calidad is not None:
+                    exito = self.procesador.render_pipeline(placeholders, efectos or [], archivo_salida, calidad)
+                # Combinar videos con transiciones
+                elif transiciones and len(transiciones) == len(placeholders) - 1:
+                    # Aplicar transiciones personalizadas
+                    exito = self.procesador.combinar_videos(placeholders, transiciones, archivo_salida)
                 else:
-                    # Generar placeholder de texto como fallback
-                    placeholder = self.generador.generar_placeholder_texto(
-                        f"Imagen no encontrada: {imagen.name}", duraciones[i])
-                    placeholders.append(placeholder)
-            
-            # Combinar videos con transiciones
-            if transiciones and len(transiciones) == len(placeholders) - 1:
-                # Aplicar transiciones personalizadas
-                exito = self.procesador.combinar_videos(placeholders, transiciones, archivo_salida)
-            else:
-                # Usar transiciones por defecto
-                transiciones_default = [TipoTransicion.DESVANECER] * (len(placeholders) - 1)
-                exito = self.procesador.combinar_videos(placeholders, transiciones_default, archivo_salida)
+                    # Usar transiciones por defecto
+                    transiciones_default = [TipoTransicion.DESVANECER] * (len(placeholders) - 1)
+                    exito = self.procesador.combinar_videos(placeholders, transiciones_default, archivo_salida)
             
             # Limpiar placeholders temporales
             for placeholder in placeholders:
@@ -746,12 +1507,13 @@ class VideoEditorUltraFuncional:
                 raise FileNotFoundError(f"Video de entrada no encontrado: {video_entrada}")
             
             # Verificar cache
-            video_hash = hashlib.md5(f"{video_entrada}_{sorted(efectos)}".encode()).hexdigest()
+            video_hash = _cache_key(video_entrada, sorted(efectos))
             cache_key = f"video_efectos_{video_hash}"
             
             video_cached = self.cache.get(cache_key)
             if video_cached and isinstance(video_cached, Path) and video_cached.exists():
                 self.estadisticas["cache_hits"] += 1
+                self._registrar_hit_cache(cache_key)
                 # Copiar desde cache
                 shutil.copy2(video_cached, archivo_salida)
                 
@@ -778,7 +1540,7 @@ class VideoEditorUltraFuncional:
                 metricas = self.validador.validar_video(archivo_salida)
                 
                 # Guardar en cache
-                self.cache.put(cache_key, archivo_salida, TipoDato.VIDEO, tiempo_total)
+                self._guardar_en_cache(cache_key, archivo_salida, tiempo_total)
                 
                 # Actualizar estadísticas
                 self.estadisticas["videos_procesados"] += 1
@@ -831,12 +1593,13 @@ class VideoEditorUltraFuncional:
                 raise FileNotFoundError(f"Video de entrada no encontrado: {video_entrada}")
             
             # Verificar cache
-            video_hash = hashlib.md5(f"{video_entrada}_{formato_salida.value}_{calidad.value}".encode()).hexdigest()
+            video_hash = _cache_key(video_entrada, formato_salida.value, calidad.value)
             cache_key = f"video_conversion_{video_hash}"
             
             video_cached = self.cache.get(cache_key)
             if video_cached and isinstance(video_cached, Path) and video_cached.exists():
                 self.estadisticas["cache_hits"] += 1
+                self._registrar_hit_cache(cache_key)
                 # Copiar desde cache
                 shutil.copy2(video_cached, archivo_salida)
                 
@@ -863,7 +1626,7 @@ class VideoEditorUltraFuncional:
                 metricas = self.validador.validar_video(archivo_salida)
                 
                 # Guardar en cache
-                self.cache.put(cache_key, archivo_salida, TipoDato.VIDEO, tiempo_total)
+                self._guardar_en_cache(cache_key, archivo_salida, tiempo_total)
                 
                 # Actualizar estadísticas
                 self.estadisticas["videos_procesados"] += 1
@@ -907,6 +1670,139 @@ class VideoEditorUltraFuncional:
                 error_mensaje=error_msg
             )
     
+    def convertir_video_multi(self, video_entrada: Path, formato_salida: TipoVideo,
+                              destinos: List[Tuple[CalidadVideo, Path]]) -> List[ResultadoVideo]:
+        """Convertir un video a varias calidades, codificando las no cacheadas en una sola pasada"""
+        if len(destinos) == 1:
+            calidad, archivo_salida = destinos[0]
+            return [self.convertir_video(video_entrada, formato_salida, calidad, archivo_salida)]
+        
+        inicio_procesamiento = time.time()
+        exitos: Dict[Path, bool] = {}
+        pendientes = []
+        
+        try:
+            if not video_entrada.exists():
+                raise FileNotFoundError(f"Video de entrada no encontrado: {video_entrada}")
+            
+            for calidad, archivo_salida in destinos:
+                cache_key = f"video_conversion_{_cache_key(video_entrada, formato_salida.value, calidad.value)}"
+                video_cached = self.cache.get(cache_key)
+                if video_cached and isinstance(video_cached, Path) and video_cached.exists():
+                    self.estadisticas["cache_hits"] += 1
+                    self._registrar_hit_cache(cache_key)
+                    shutil.copy2(video_cached, archivo_salida)
+                    exitos[archivo_salida] = True
+                else:
+                    pendientes.append((calidad, archivo_salida, cache_key))
+            
+            if len(pendientes) == 1:
+                calidad, archivo_salida, _ = pendientes[0]
+                exito_pendientes = self.procesador.convertir_formato(video_entrada, formato_salida,
+                                                                     calidad, archivo_salida)
+            elif pendientes:
+                exito_pendientes = self.procesador.convertir_formato_multi(
+                    video_entrada, [(calidad, archivo) for calidad, archivo, _ in pendientes])
+            else:
+                exito_pendientes = True
+            
+            tiempo_total = time.time() - inicio_procesamiento
+            for _, archivo_salida, cache_key in pendientes:
+                exitos[archivo_salida] = exito_pendientes and archivo_salida.exists()
+                if exitos[archivo_salida]:
+                    self._guardar_en_cache(cache_key, archivo_salida, tiempo_total / len(pendientes))
+            
+            # Validar todas las salidas en paralelo
+            metricas = self.validador.validar_videos([archivo for archivo, exito in exitos.items() if exito])
+            if pendientes and exito_pendientes:
+                self.estadisticas["videos_procesados"] += 1
+                self._actualizar_tiempo_promedio(tiempo_total)
+            
+        except Exception as e:
+            tiempo_total = time.time() - inicio_procesamiento
+            self.logger.log(NivelSeveridad.ERROR, f"Error convirtiendo video: {e}")
+            metricas = {}
+        
+        resultados = []
+        for calidad, archivo_salida in destinos:
+            exito = exitos.get(archivo_salida, False)
+            resultados.append(ResultadoVideo(
+                exito=exito,
+                archivo_video=archivo_salida if exito else None,
+                metricas=metricas.get(archivo_salida),
+                tiempo_procesamiento=tiempo_total,
+                recursos_utilizados={"formato": formato_salida.value, "calidad": calidad.value},
+                error_mensaje=None if exito else "Error convirtiendo video"
+            ))
+        return resultados
+    
+    @staticmethod
+    def _prioridad_lrbu(meta: Dict[str, float], ahora: float) -> float:
+        """Prioridad LRBU: frecuencia × cómputo ahorrado / (tamaño × antigüedad del último acceso)"""
+        return (meta["freq"] * meta["compute_s"]) / (max(meta["size"], 1) * max(1.0, ahora - meta["last_hit"]))
+    
+    def _cargar_entry_meta(self) -> Dict[str, Dict[str, Any]]:
+        """Cargar metadatos LRBU de ejecuciones anteriores, descartando copias que ya no existen"""
+        try:
+            with open(self._archivo_entry_meta, 'r', encoding='utf-8') as f:
+                entradas = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {clave: meta for clave, meta in entradas.items() if Path(meta["archivo"]).exists()}
+    
+    def _guardar_entry_meta(self):
+        """Persistir metadatos LRBU (requiere _lock_entry_meta)"""
+        try:
+            ruta_parcial = self._archivo_entry_meta.with_suffix(".json.part")
+            with open(ruta_parcial, 'w', encoding='utf-8') as f:
+                json.dump(self._entry_meta, f)
+            os.replace(ruta_parcial, self._archivo_entry_meta)
+        except OSError as e:
+            self.logger.log(NivelSeveridad.ERROR, f"Error guardando metadatos del cache de video: {e}")
+    
+    def _guardar_en_cache(self, cache_key: str, archivo: Path, tiempo_computo: float):
+        """Guardar una copia del video en el cache y desalojar por LRBU si se supera el presupuesto"""
+        # El archivo de salida pertenece a quien lo pidió: el cache guarda y borra su propia copia
+        copia = self.ruta_videos_cache / f"{cache_key}{archivo.suffix}"
+        ruta_parcial = copia.with_name(copia.name + ".part")
+        shutil.copy2(archivo, ruta_parcial)
+        os.replace(ruta_parcial, copia)
+        self.cache.put(cache_key, copia, TipoDato.VIDEO, tiempo_computo)
+        
+        with self._lock_entry_meta:
+            self._entry_meta[cache_key] = {
+                "archivo": str(copia),
+                "size": copia.stat().st_size,
+                "freq": 1,
+                "last_hit": time.time(),
+                "compute_s": tiempo_computo
+            }
+            
+            # La entrada recién insertada nunca es candidata: se desalojan las de menor prioridad
+            desalojadas = []
+            total = sum(meta["size"] for meta in self._entry_meta.values())
+            ahora = time.time()
+            while total > self.presupuesto_cache_bytes and len(self._entry_meta) > 1:
+                victima = min((clave for clave in self._entry_meta if clave != cache_key),
+                              key=lambda clave: self._prioridad_lrbu(self._entry_meta[clave], ahora))
+                meta = self._entry_meta.pop(victima)
+                total -= meta["size"]
+                desalojadas.append((victima, Path(meta["archivo"])))
+            self._guardar_entry_meta()
+        
+        for clave, copia_desalojada in desalojadas:
+            self.cache.eliminar(clave)
+            copia_desalojada.unlink(missing_ok=True)
+    
+    def _registrar_hit_cache(self, cache_key: str):
+        """Actualizar frecuencia y último acceso de una entrada cacheada"""
+        with self._lock_entry_meta:
+            meta = self._entry_meta.get(cache_key)
+            if meta is not None:
+                meta["freq"] += 1
+                meta["last_hit"] = time.time()
+                self._guardar_entry_meta()
+    
     def _actualizar_tiempo_promedio(self, tiempo_procesamiento: float):
         """Actualizar tiempo promedio de procesamiento"""
         total = self.estadisticas["videos_procesados"]